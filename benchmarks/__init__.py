@@ -0,0 +1 @@
+"""Performance benchmarks for eyes (run with python -m benchmarks.run)."""
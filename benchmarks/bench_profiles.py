@@ -0,0 +1,87 @@
+"""Multi-profile daemon benchmark over a simulated day
+
+Runs 1 to 1,000 profiles in one ProfileDaemon against a simulated clock
+with an instant fake backend and reports CPU time, memory per profile,
+scheduler wakeups and thread count:
+
+    python -m benchmarks.bench_profiles [--hours 24] [--json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import threading
+import time
+import tracemalloc
+
+from eyes.core.clock import SimulatedClock
+from eyes.core.profiles import Profile, ProfileDaemon
+
+from .fakes import NullBackend
+
+COUNTS = (1, 10, 100, 1000)
+INTERVALS = (20, 30, 45, 60)
+
+
+def run(count, hours=24):
+    """Drive count profiles through hours of simulated time; returns the measurements"""
+    clock = SimulatedClock()
+    profiles = [
+        Profile(f"profile-{i}", interval_minutes=INTERVALS[i % len(INTERVALS)])
+        for i in range(count)
+    ]
+    quiet = io.StringIO()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(quiet):
+        daemon = ProfileDaemon(profiles, lambda backend: [NullBackend()], clock=clock)
+        for reminder in daemon.reminders.values():
+            reminder._schedule_interval()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def drain():
+        # Let action results (auto-acknowledge) land before time moves on
+        for dispatcher in daemon.dispatchers.values():
+            dispatcher.join(5)
+
+    cpu_start = time.process_time()
+    with contextlib.redirect_stdout(quiet):
+        clock.run(daemon.scheduler, hours * 3600, after_step=drain)
+    cpu = time.process_time() - cpu_start
+    threads = threading.active_count()
+    delivered = sum(d.stats["delivered"] for d in daemon.dispatchers.values())
+    for dispatcher in daemon.dispatchers.values():
+        dispatcher.stop(timeout=1)
+    return {
+        "profiles": count,
+        "simulated_hours": hours,
+        "cpu_ms": round(cpu * 1000, 2),
+        "cpu_us_per_notification": round(cpu * 1e6 / delivered, 2) if delivered else None,
+        "memory_kb": round(memory / 1024, 1),
+        "memory_bytes_per_profile": round(memory / count),
+        "wakeups": daemon.scheduler.wakeups,
+        "notifications": delivered,
+        "threads": threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = [run(count, args.hours) for count in COUNTS]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'profiles':>8} {'cpu ms':>9} {'us/notif':>9} {'mem KiB':>9} "
+          f"{'B/profile':>9} {'wakeups':>8} {'notifs':>8} {'threads':>7}")
+    for r in results:
+        print(f"{r['profiles']:>8} {r['cpu_ms']:>9} {r['cpu_us_per_notification']:>9} "
+              f"{r['memory_kb']:>9} {r['memory_bytes_per_profile']:>9} {r['wakeups']:>8} "
+              f"{r['notifications']:>8} {r['threads']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Headless stand-ins shared by the benchmarks"""
+import bisect
+import random
+import threading
+
+from eyes.core.backends import Backend
+from eyes.core.dispatch import Dispatcher
+from eyes.core.idle import IdleProbe
+from eyes.core.reminder import AdvancedReminder
+
+
+class NullBackend(Backend):
+    """Backend that drops notifications, optionally signalling each delivery"""
+
+    name = "null"
+
+    def load(self):
+        self.delivered = threading.Event()
+
+    def notify(self, title, message, timeout=None):
+        self.delivered.set()
+
+
+class HeadlessReminder(AdvancedReminder):
+    """Advanced reminder wired to a dispatcher like the platform reminders"""
+
+    def __init__(self, interval_minutes=20, snooze_minutes=5, **kwargs):
+        super().__init__(interval_minutes, snooze_minutes, handle_signals=False, **kwargs)
+        self.backend = NullBackend()
+        self.dispatcher = Dispatcher([self.backend])
+
+    def show_notification(self, title, message, timeout=None):
+        self.dispatcher.submit(title, message, timeout)
+
+    def show_reminder_with_actions(self, title, message, actions):
+        self.dispatcher.submit(
+            title, message, actions=actions, on_result=self._on_action_result
+        )
+
+
+def workday_input(hours=8.5, seed=1):
+    """Input event times for a simulated workday: typing, reading, meetings and lunch"""
+    rng = random.Random(seed)
+    end = hours * 3600
+    # Away from the desk: a meeting mid-morning, lunch, an afternoon meeting
+    absences = [
+        (1.5 * 3600, 2.25 * 3600), (4 * 3600, 4.8 * 3600), (6 * 3600, 6.5 * 3600),
+    ]
+    times, t = [], 0.0
+    while t < end:
+        away = next(((start, stop) for start, stop in absences if start <= t < stop), None)
+        if away is not None:
+            t = away[1]
+            continue
+        times.append(t)
+        # Mostly steady typing and mousing, sometimes a few minutes of reading
+        t += rng.uniform(20, 240) if rng.random() < 0.02 else rng.uniform(0.2, 5)
+    return times
+
+
+class ScriptedInput(IdleProbe):
+    """Idle probe replaying input event times against a simulated clock"""
+
+    name = "scripted"
+
+    def __init__(self, clock, times):
+        self.clock = clock
+        self.times = times
+        super().__init__()
+
+    def idle_seconds(self):
+        now = self.clock()
+        index = bisect.bisect_right(self.times, now)
+        return now - self.times[index - 1] if index else now
@@ -0,0 +1,325 @@
+"""Benchmark suite: startup, dispatch latency, timer jitter, threads, RSS, schedules, idle
+
+Runs headless with a fake notification backend, writes the results as
+JSON and compares them against benchmarks/baseline.json:
+
+    python -m benchmarks.run                    # run, compare, exit 1 on regression
+    python -m benchmarks.run --update-baseline  # accept the current numbers
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from eyes.core.calendar import Calendar
+from eyes.core.clock import SimulatedClock
+from eyes.core.idle import IdleMonitor
+from eyes.core.metrics import rss_bytes
+
+from .fakes import HeadlessReminder, ScriptedInput, workday_input
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+RESULTS_PATH = os.path.join(HERE, "results.json")
+
+# metric: (allowed ratio over baseline, absolute slack) -- a result regresses
+# only if it exceeds both, so tiny numbers don't flap on noisy machines.
+# Lower is better for every metric.
+TOLERANCES = {
+    "cli_version_ms": (1.5, 15.0),
+    "cli_ctl_ms": (1.5, 15.0),
+    "dispatch_p50_us": (2.0, 200.0),
+    "dispatch_p99_us": (2.0, 1000.0),
+    "jitter_mean_ms": (2.0, 2.0),
+    # A single descheduled wakeup sets the max, so it only catches gross regressions
+    "jitter_max_ms": (3.0, 50.0),
+    "threads_peak": (1.0, 1),
+    "sim_rss_growth_kb": (1.5, 512),
+    "sim_wakeups": (1.1, 10),
+    "calendar_lookup_us": (2.0, 5.0),
+    "calendar_1k_lookup_us": (2.0, 5.0),
+    "calendar_year_ms": (2.0, 50.0),
+    "idle_samples": (1.1, 20),
+    "idle_cpu_ms": (2.0, 20.0),
+    "idle_shown_away": (1.0, 0),
+}
+
+
+def _quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def bench_cli_cold_start(runs=10):
+    """Median wall time of fresh interpreters on the two fast CLI paths"""
+    env = dict(os.environ, PYTHONPATH=ROOT, EYES_SOCKET=os.path.join(HERE, "no-daemon.sock"))
+    results = {}
+    for key, argv in (("cli_version_ms", ["--version"]), ("cli_ctl_ms", ["ctl", "status"])):
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(
+                [sys.executable, "-m", "eyes.cli"] + argv,
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False,
+            )
+            samples.append((time.perf_counter() - start) * 1000)
+        results[key] = round(statistics.median(samples), 2)
+    return results
+
+
+def bench_dispatch(count=500):
+    """Latency from show_notification() to the backend receiving the call"""
+    with _quiet():
+        reminder = HeadlessReminder()
+    backend = reminder.backend
+    samples = []
+    try:
+        for _ in range(count):
+            backend.delivered.clear()
+            start = time.perf_counter()
+            reminder.show_notification("Title", "Message")
+            if not backend.delivered.wait(2):
+                raise RuntimeError("fake backend never received the notification")
+            samples.append((time.perf_counter() - start) * 1e6)
+    finally:
+        reminder.dispatcher.stop(timeout=1)
+    samples.sort()
+    return {
+        "dispatch_p50_us": round(samples[len(samples) // 2], 1),
+        "dispatch_p99_us": round(samples[int(len(samples) * 0.99)], 1),
+    }
+
+
+def bench_jitter(firings=40, interval=0.025):
+    """Real-time interval firings on the scheduler thread"""
+    threads_before = threading.active_count()
+    with _quiet():
+        reminder = HeadlessReminder(interval_minutes=interval / 60)
+    fired = threading.Event()
+    peak = [threads_before]
+
+    def on_interval():
+        peak[0] = max(peak[0], threading.active_count())
+        reminder.show_reminder()
+        reminder.is_reminder_active = False  # don't suppress the next firing
+        if reminder.timer.jitter.count >= firings:
+            fired.set()
+
+    reminder._on_interval = on_interval
+    reminder.scheduler.start()
+    try:
+        reminder._schedule_interval()
+        if not fired.wait(firings * interval * 4 + 5):
+            raise RuntimeError("interval timer stopped firing")
+    finally:
+        reminder.scheduler.stop(timeout=1)
+        reminder.dispatcher.stop(timeout=1)
+    jitter = reminder.timer.jitter.as_dict()
+    return {
+        "jitter_mean_ms": jitter["mean_ms"],
+        "jitter_max_ms": jitter["max_ms"],
+        "threads_peak": peak[0] - threads_before,
+    }
+
+
+def bench_simulated_day(hours=24, interval_minutes=1):
+    """RSS growth and wakeups over a simulated day of one-minute reminders"""
+    clock = SimulatedClock()
+    with _quiet():
+        reminder = HeadlessReminder(interval_minutes, clock=clock)
+    rss_before = rss_bytes()
+    end = hours * 3600
+    with _quiet():
+        reminder._schedule_interval()
+        while True:
+            deadline = reminder.scheduler.next_deadline()
+            if deadline is None or deadline > end:
+                break
+            clock.now = deadline
+            reminder.scheduler.run_pending()
+            reminder.dispatcher.join(2)
+            if clock.now % 600 < interval_minutes * 60:
+                reminder.force_show()  # an occasional SIGUSR1-style forced show
+    reminder.dispatcher.stop(timeout=1)
+    return {
+        "sim_rss_growth_kb": round(max(rss_bytes() - rss_before, 0) / 1024, 1),
+        "sim_wakeups": reminder.scheduler.wakeups,
+        "sim_notifications": reminder.dispatcher.stats["delivered"],
+    }
+
+
+def bench_calendar(lookups=20000, interval_minutes=20):
+    """Next-fire lookups on work-hours and 1000-window schedules over a year"""
+    year = 365 * 24 * 3600
+    start = 1_700_000_000.0
+    period = interval_minutes * 60
+    work = Calendar(["mon-fri 09:00-17:30"], ["12:00-13:00"], "Europe/Berlin")
+    # Five minutes in every ten, every day: 1008 windows
+    busy = Calendar([
+        f"{hour:02d}:{minute:02d}-{hour:02d}:{minute + 5:02d}"
+        for hour in range(24) for minute in range(0, 60, 10)
+    ])
+    rng = random.Random(1)
+    moments = [start + rng.random() * year for _ in range(lookups)]
+    results = {}
+    for key, calendar in (("calendar_lookup_us", work), ("calendar_1k_lookup_us", busy)):
+        began = time.perf_counter()
+        for t in moments:
+            calendar.fit(t, period)
+        results[key] = round((time.perf_counter() - began) / lookups * 1e6, 2)
+    # Every reminder of a year of work hours, one lookup per reminder
+    began = time.perf_counter()
+    t, fires = start, 0
+    while t < start + year:
+        t = work.fit(t + period, period)
+        fires += 1
+    results["calendar_year_ms"] = round((time.perf_counter() - began) * 1000, 1)
+    results["calendar_year_fires"] = fires
+    return results
+
+
+def _workday(clock, reminder, monitor, end):
+    """Run a simulated workday; returns the times reminders were shown"""
+    shown = []
+    show = reminder.show_reminder_with_actions
+
+    def record(*args):
+        shown.append(clock())
+        show(*args)
+
+    reminder.show_reminder_with_actions = record
+    with _quiet():
+        reminder._schedule_interval()
+        if monitor is not None:
+            reminder.idle = monitor
+            reminder._start_idle()
+        clock.run(reminder.scheduler, end, after_step=lambda: reminder.dispatcher.join(2))
+        if monitor is not None:
+            monitor.stop()
+    reminder.dispatcher.stop(timeout=1)
+    return shown
+
+
+def bench_idle(hours=8.5, threshold=300.0, interval_minutes=20):
+    """Idle sampler cost and reminders shown to an empty desk over a simulated workday"""
+    times = workday_input(hours)
+    end = hours * 3600
+
+    def shown_away(shown):
+        clock = SimulatedClock()
+        probe = ScriptedInput(clock, times)
+        away = 0
+        for clock.now in shown:
+            away += probe.idle_seconds() >= threshold
+        return away
+
+    clock = SimulatedClock()
+    with _quiet():
+        reminder = HeadlessReminder(interval_minutes, clock=clock)
+    monitor = IdleMonitor(ScriptedInput(clock, times), threshold=threshold)
+    sample = monitor._sample
+    cpu = [0]
+
+    def timed_sample():
+        began = time.process_time_ns()
+        sample()
+        cpu[0] += time.process_time_ns() - began
+
+    monitor._sample = timed_sample
+    shown = _workday(clock, reminder, monitor, end)
+
+    # The same day without idle detection, for comparison
+    clock = SimulatedClock()
+    with _quiet():
+        reminder = HeadlessReminder(interval_minutes, clock=clock)
+    shown_without = _workday(clock, reminder, None, end)
+    return {
+        "idle_samples": monitor.samples,
+        "idle_cpu_ms": round(cpu[0] / 1e6, 2),
+        # CPU time per second of the workday, in parts per million
+        "idle_cpu_ppm": round(cpu[0] / 1e9 / end * 1e6, 3),
+        "idle_pauses": monitor.pauses,
+        "idle_shown": len(shown),
+        "idle_shown_away": shown_away(shown),
+        "idle_shown_away_without": shown_away(shown_without),
+    }
+
+
+BENCHMARKS = (
+    bench_cli_cold_start, bench_dispatch, bench_jitter, bench_simulated_day, bench_calendar,
+    bench_idle,
+)
+
+
+def run_all():
+    results = {}
+    for bench in BENCHMARKS:
+        results.update(bench())
+    return results
+
+
+def compare(results, baseline):
+    """Return a list of (metric, current, baseline, limit) for regressed metrics"""
+    regressions = []
+    for metric, (ratio, slack) in TOLERANCES.items():
+        if metric not in results or metric not in baseline:
+            continue
+        limit = max(baseline[metric] * ratio, baseline[metric] + slack)
+        if results[metric] > limit:
+            regressions.append((metric, results[metric], baseline[metric], limit))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=RESULTS_PATH, help="Where to write results JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare with")
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Write the results as the new baseline"
+    )
+    args = parser.parse_args()
+
+    results = run_all()
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+    for metric, value in results.items():
+        print(f"{metric:<22} {value}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    except (OSError, ValueError, KeyError):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+    regressions = compare(results, baseline)
+    for metric, current, base, limit in regressions:
+        print(f"REGRESSION {metric}: {current} (baseline {base}, limit {limit:g})")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
-import argparse
 import sys
 import time
 
-from .reminders import create_reminder
+# Keep module-level imports to the standard library: --help, --version and
+# ctl must not pay for platform or notification backend imports.
 
 
-def main():
-    """Main function with command line argument support"""
-    
+def parse_args(argv=None):
+    """Parse the command line (argparse is only held onto during setup)"""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Eyes - Configurable eye break reminder following the 20-20-20 rule"
     )
@@ -15,14 +16,12 @@ def main():
         "-i",
         "--interval",
         type=int,
-        default=20,
         help="Reminder interval in minutes (default: 20)",
     )
     parser.add_argument(
         "-s",
         "--snooze",
         type=int,
-        default=5,
         help="Snooze duration in minutes (default: 5)",
     )
     parser.add_argument(
@@ -33,34 +32,604 @@ def main():
     parser.add_argument(
         "--test", action="store_true", help="Test mode - show notification immediately"
     )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "asyncio"],
+        default="threads",
+        help="Timer engine to drive reminders with (default: threads)",
+    )
+    parser.add_argument(
+        "--on-resume",
+        choices=["fire", "restart", "skip"],
+        help="After a suspend: remind now, restart the interval, or skip missed "
+             "reminders (default: fire)",
+    )
+    parser.add_argument(
+        "--hours",
+        action="append",
+        metavar="WINDOW",
+        help="Only remind during this window, e.g. \"mon-fri 09:00-17:30\" "
+             "(repeatable; replaces the config file's schedule)",
+    )
+    parser.add_argument(
+        "--timezone",
+        metavar="ZONE",
+        help="Time zone for --hours, e.g. Europe/London (default: local time)",
+    )
+    parser.add_argument(
+        "--backend",
+        help="Pin the notification backend (plyer, pync, win10toast, winotify, dbus)",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="FILE",
+        help="Settings file, reloaded whenever it changes; flags given here win at startup "
+             "(default: ~/.config/eyes/config.toml if it exists)",
+    )
+    parser.add_argument(
+        "--profiles",
+        nargs="?",
+        const="",
+        metavar="FILE",
+        help="Run every reminder profile in a TOML file from one process "
+             "(default file: ~/.config/eyes/profiles.toml)",
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Don't record reminders, breaks and snoozes to the history database",
+    )
+    parser.add_argument(
+        "--state-file",
+        metavar="PATH",
+        help="Where the schedule is saved so restarts resume it "
+             "(default: ~/.local/state/eyes/state.json)",
+    )
+    parser.add_argument(
+        "--no-state",
+        action="store_true",
+        help="Start a fresh interval on every launch instead of resuming the saved schedule",
+    )
+    parser.add_argument(
+        "--idle-after",
+        type=float,
+        default=5.0,
+        metavar="MINUTES",
+        help="Pause the countdown after this long without keyboard or mouse input (default: 5)",
+    )
+    parser.add_argument(
+        "--no-idle",
+        action="store_true",
+        help="Keep counting down and reminding while nobody is at the machine",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write Prometheus metrics to PATH (e.g. for node_exporter's textfile collector)",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="How often to rewrite --metrics-file (default: 60)",
+    )
+    parser.add_argument(
+        "--no-backend-cache",
+        action="store_true",
+        help="Don't cache notification backend probes on disk between runs",
+    )
+    parser.add_argument(
+        "--log-file",
+        metavar="PATH",
+        help="Also write the daemon log to PATH as JSON lines",
+    )
+    parser.add_argument(
+        "--log-rotate",
+        default="1M",
+        metavar="WHEN",
+        help="Rotate the log file at a size (e.g. 10M, 512K) or hourly/daily (default: 1M)",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["debug", "info", "warning", "error"],
+        default="info",
+        help="Least severe messages to log (default: info)",
+    )
+    parser.add_argument(
+        "--sink",
+        action="append",
+        metavar="SPEC",
+        help="Publish reminder events as JSON lines to stdout, fifo:PATH or socket[:PATH] "
+             "(repeatable; the socket defaults to one next to the control socket)",
+    )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        type=int,
+        const=10000,
+        metavar="SPANS",
+        help="Record reminder lifecycle spans in a ring of SPANS (default: 10000); "
+             "dump them with `eyes ctl trace` or SIGUSR2",
+    )
+    parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="Minimal-footprint daemon: load only the selected notification backend "
+             "and release setup-only modules once running",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Report an import-time breakdown of each startup path and exit",
+    )
+    # Set by `eyes supervise` on its children: the pipe to report readiness on
+    parser.add_argument("--standby", type=int, metavar="FD", help=argparse.SUPPRESS)
     parser.add_argument("--version", action="version", version="eyes 1.0.0")
 
-    args = parser.parse_args()
+    subparsers = parser.add_subparsers(dest="command")
+    ctl_parser = subparsers.add_parser(
+        "ctl", help="Control the running daemon over its control socket"
+    )
+    ctl_parser.add_argument(
+        "action",
+        choices=[
+            "show", "stop", "snooze", "status", "next-fire-time", "reload", "metrics", "trace",
+        ],
+        help="Command to send to the daemon",
+    )
+    ctl_parser.add_argument(
+        "-m", "--minutes", type=int, help="Snooze duration in minutes (snooze only)"
+    )
+    ctl_parser.add_argument(
+        "-p", "--profile", help="Only apply to this profile (multi-profile daemon)"
+    )
+    ctl_parser.add_argument("--socket", help="Control socket path")
+    ctl_parser.add_argument(
+        "-o", "--output", metavar="FILE",
+        help="Where the daemon writes its trace (trace only; default: a file in the runtime dir)",
+    )
+    ctl_parser.add_argument(
+        "--json", action="store_true", help="Print the raw JSON reply"
+    )
 
-    if args.interval < 1:
-        print("Error: Interval must be at least 1 minute")
-        sys.exit(1)
+    stats_parser = subparsers.add_parser(
+        "stats", help="Show breaks taken vs. snoozed per day or week"
+    )
+    stats_parser.add_argument(
+        "-d", "--days", type=int, default=7, help="Days to show (default: 7)"
+    )
+    stats_parser.add_argument(
+        "-w", "--weeks", type=int, help="Show this many weeks, one row per week"
+    )
+    stats_parser.add_argument("-p", "--profile", help="Only count this profile")
+    stats_parser.add_argument("--db", help="History database path")
+    stats_parser.add_argument(
+        "--json", action="store_true", help="Print the counts as JSON"
+    )
 
-    if args.snooze < 1:
-        print("Error: Snooze duration must be at least 1 minute")
+    supervise_parser = subparsers.add_parser(
+        "supervise",
+        help="Run the daemon in a child process with a warm standby that takes over on a crash",
+    )
+    supervise_parser.add_argument(
+        "--stable", type=float, default=30.0, metavar="SECONDS",
+        help="A daemon that crashes sooner than this after taking over counts towards "
+             "crash-loop backoff (default: 30)",
+    )
+    supervise_parser.add_argument(
+        "--max-backoff", type=float, default=60.0, metavar="SECONDS",
+        help="Longest wait before taking over from a crash loop (default: 60)",
+    )
+    supervise_parser.add_argument(
+        "daemon_args", nargs=argparse.REMAINDER,
+        help="Daemon options after --, e.g. eyes supervise -- -i 30 --sink socket",
+    )
+
+    mem_parser = subparsers.add_parser(
+        "mem", help="Report where a lean daemon's memory goes (tracemalloc)"
+    )
+    mem_parser.add_argument(
+        "-n", "--top", type=int, default=15, help="Modules to list (default: 15)"
+    )
+    mem_parser.add_argument(
+        "--json", action="store_true", help="Print the report as JSON"
+    )
+
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main function with command line argument support"""
+    args = parse_args()
+
+    if args.command == "ctl":
+        control_main(args)
+        return
+
+    if args.command == "stats":
+        stats_main(args)
+        return
+
+    if args.command == "mem":
+        mem_main(args)
+        return
+
+    if args.command == "supervise":
+        supervise_main(args)
+        return
+
+    if args.startup_profile:
+        from .startup import print_startup_profile
+        print_startup_profile()
+        return
+
+    # Platform backends are only imported once a reminder is needed
+    from .core.backends import registry, default_cache_path
+    from .reminders import create_reminder
+
+    if not args.no_backend_cache:
+        registry.cache_path = default_cache_path()
+    if args.lean:
+        registry.limit = 1
+
+    sinks = build_sinks(args.sink) if args.sink and not args.test else None
+    if args.trace is not None:
+        if args.trace < 1:
+            print("Error: --trace needs room for at least one span")
+            sys.exit(1)
+        from .core.trace import tracer
+        tracer.enable(args.trace)
+
+    from .core.log import setup_logging
+    try:
+        # Keep stdout for events when it is a sink
+        setup_logging(args.log_file, args.log_level, args.log_rotate,
+                      stream=sys.stderr if sinks is not None and sinks.stdout else None)
+    except ValueError as e:
+        print(f"Error: {e}")
         sys.exit(1)
 
+    if args.profiles is not None:
+        profiles_main(args, sinks)
+        return
+
+    config, config_path = load_settings(args)
+
     # Create appropriate reminder for platform
     app = create_reminder(
-        advanced=not args.simple,
-        interval_minutes=args.interval,
-        snooze_minutes=args.snooze
+        advanced=config.mode == "advanced",
+        interval_minutes=config.interval_minutes,
+        snooze_minutes=config.snooze_minutes,
+        backend=config.backend,
     )
+    app.apply_config(config)
+    if config_path is not None and not args.test:
+        app.watch_config(config_path)
+    # A standby is fully set up up to here; the rest waits until it takes over
+    supervised = await_promotion(args) if args.standby is not None else None
+    if not args.no_history and not args.test:
+        from .core.history import HistoryWriter, default_history_path
+        app.history = HistoryWriter(default_history_path())
+    if not args.no_state and not args.test:
+        app.state = load_state(args)
+    if not args.test:
+        app.idle = build_idle(args)
+    if args.metrics_file and not args.test:
+        from .core.metrics import FileExporter
+        app.metrics_exporter = FileExporter(args.metrics_file, args.metrics_interval)
+    app.sinks = sinks
 
     if args.test:
         print("Test mode - showing notification now...")
         app.show_reminder()
+        if app.dispatcher is not None:
+            # Delivery happens on the dispatch worker
+            app.dispatcher.join(app.dispatcher.deadline)
         time.sleep(2)
         return
 
+    if args.engine == "asyncio":
+        import asyncio
+        from .core.async_reminder import AsyncReminder
+        from .core.control import AlreadyRunningError
+        if args.lean:
+            from .memory import release_setup_modules
+            release_setup_modules()
+        engine = AsyncReminder(app, handle_sigint=True)
+        if supervised is not None:
+            from .supervisor import follow_supervisor
+            follow_supervisor(args.standby, app, supervised, engine.stop)
+        try:
+            asyncio.run(engine.run())
+        except AlreadyRunningError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
+    if supervised is not None:
+        from .supervisor import follow_supervisor
+        follow_supervisor(args.standby, app, supervised)
+    if args.lean:
+        from .memory import release_setup_modules
+        release_setup_modules()
     app.run()
 
 
+def load_settings(args):
+    """Config file settings with command-line flags taking precedence
+
+    Returns the settings and the config file path (None if there is no file).
+    """
+    import os
+    from .core.config import Config, default_config_path, load_config
+
+    path = args.config or default_config_path()
+    config = Config()
+    if args.config or os.path.exists(path):
+        try:
+            config = load_config(path)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    else:
+        path = None
+    config = config.replace(
+        interval_minutes=args.interval,
+        snooze_minutes=args.snooze,
+        mode="simple" if args.simple else None,
+        on_resume=args.on_resume,
+        backend=args.backend,
+    )
+    if args.hours:
+        from .core.calendar import parse_schedule
+        table = {"windows": args.hours}
+        if args.timezone:
+            table["timezone"] = args.timezone
+        try:
+            config = config.replace(calendar=parse_schedule(table))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    elif args.timezone:
+        print("Error: --timezone needs --hours")
+        sys.exit(1)
+
+    if config.interval_minutes < 1:
+        print("Error: Interval must be at least 1 minute")
+        sys.exit(1)
+
+    if config.snooze_minutes < 1:
+        print("Error: Snooze duration must be at least 1 minute")
+        sys.exit(1)
+
+    return config, path
+
+
+def await_promotion(args):
+    """Standby under `eyes supervise`: wait to take over, returning the supervisor's stats"""
+    from .supervisor import await_promotion
+    return await_promotion(args.standby)
+
+
+def supervise_main(args):
+    """Run the daemon under a supervisor with a warm standby"""
+    from .supervisor import SUPPORTED, Supervisor, daemon_command
+
+    if not SUPPORTED:
+        print("Error: eyes supervise needs a POSIX platform")
+        sys.exit(1)
+    daemon_args = args.daemon_args
+    if daemon_args[:1] == ["--"]:
+        daemon_args = daemon_args[1:]
+    if args.max_backoff <= 0 or args.stable < 0:
+        print("Error: --max-backoff must be positive and --stable not negative")
+        sys.exit(1)
+    from .core.log import setup_logging
+    try:
+        setup_logging(args.log_file, args.log_level, args.log_rotate)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    supervisor = Supervisor(
+        daemon_command(daemon_args), stable=args.stable,
+        backoff=min(1.0, args.max_backoff), max_backoff=args.max_backoff,
+    )
+    sys.exit(supervisor.run())
+
+
+def load_state(args):
+    """The saved schedule to resume from"""
+    from .core.state import StateFile, default_state_path
+    return StateFile(args.state_file or default_state_path()).load()
+
+
+def build_idle(args):
+    """The idle monitor, or None if idle detection is off or unsupported here"""
+    if args.no_idle:
+        return None
+    if args.idle_after <= 0:
+        print("Error: --idle-after must be a positive number of minutes")
+        sys.exit(1)
+    from .core.idle import IdleMonitor, select_probe
+    probe = select_probe()
+    if probe is None:
+        return None
+    return IdleMonitor(probe, threshold=args.idle_after * 60)
+
+
+def build_sinks(specs):
+    """Event subscribers for the --sink options"""
+    from .core.sinks import Broadcaster, parse_sink
+    sinks = Broadcaster()
+    try:
+        for spec in specs:
+            sinks.add(*parse_sink(spec))
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    return sinks
+
+
+def profiles_main(args, sinks=None):
+    """Run the multi-profile daemon"""
+    from .core.profiles import default_profiles_path, load_profiles
+    from .reminders import create_profile_daemon
+
+    path = args.profiles or default_profiles_path()
+    try:
+        profiles = load_profiles(path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    daemon = create_profile_daemon(profiles)
+    for reminder in daemon.reminders.values():
+        reminder.timer.suspend_policy = args.on_resume or "fire"
+    supervised = await_promotion(args) if args.standby is not None else None
+    if not args.no_history:
+        from .core.history import HistoryWriter, default_history_path
+        daemon.attach_history(HistoryWriter(default_history_path()))
+    if not args.no_state:
+        daemon.attach_state(load_state(args))
+    daemon.attach_idle(build_idle(args))
+    if args.metrics_file:
+        from .core.metrics import FileExporter
+        daemon.metrics_exporter = FileExporter(args.metrics_file, args.metrics_interval)
+    if sinks is not None:
+        daemon.attach_sinks(sinks)
+    if supervised is not None:
+        from .supervisor import follow_supervisor
+        follow_supervisor(args.standby, daemon, supervised)
+    if args.lean:
+        from .memory import release_setup_modules
+        release_setup_modules()
+    daemon.run()
+
+
+def stats_main(args):
+    """Print break history counts from the daily rollups"""
+    import datetime
+    import os
+    from .core.history import HistoryStore, default_history_path
+
+    path = args.db or default_history_path()
+    if not os.path.exists(path):
+        print("No break history recorded yet")
+        return
+    store = HistoryStore(path)
+    today = datetime.date.today()
+    if args.weeks:
+        start = today - datetime.timedelta(weeks=args.weeks - 1, days=today.weekday())
+        rows = store.weekly(start.isoformat(), args.profile)
+    else:
+        start = today - datetime.timedelta(days=max(args.days, 1) - 1)
+        rows = store.daily(start.isoformat(), args.profile)
+    store.close()
+
+    if args.json:
+        import json
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        print("No breaks recorded in this period")
+        return
+    print(f"{'Period':<12} {'Shown':>6} {'Breaks':>7} {'Snoozed':>8} {'Missed':>7}")
+    for period, counts in rows.items():
+        print(f"{period:<12} {counts['shown']:>6} {counts['acknowledged']:>7} "
+              f"{counts['snoozed']:>8} {counts['missed']:>7}")
+
+
+def mem_main(args):
+    """Set up the daemon as --lean would and report its memory use"""
+    from .core.backends import registry, default_cache_path
+    from .memory import measure_daemon, print_memory_report
+    from .reminders import create_reminder
+
+    if not args.no_backend_cache:
+        registry.cache_path = default_cache_path()
+    config, _ = load_settings(args)
+
+    def create():
+        return create_reminder(
+            advanced=config.mode == "advanced",
+            interval_minutes=config.interval_minutes,
+            snooze_minutes=config.snooze_minutes,
+            backend=config.backend,
+        )
+
+    if args.json:
+        import contextlib
+        import io
+        import json
+        # Keep setup chatter out of the JSON
+        with contextlib.redirect_stdout(io.StringIO()):
+            report = measure_daemon(create, args.top)
+        print(json.dumps(report, indent=2))
+    else:
+        print_memory_report(measure_daemon(create, args.top))
+
+
+def format_time(timestamp):
+    """Format a wall-clock timestamp for display"""
+    if timestamp is None:
+        return "nothing scheduled"
+    return time.strftime("%H:%M:%S", time.localtime(timestamp))
+
+
+def control_main(args):
+    """Send a command to the running daemon and print its reply"""
+    from .core.control import send_command, DaemonNotRunningError
+
+    params = {}
+    if args.minutes is not None:
+        if args.minutes < 1:
+            print("Error: Snooze duration must be at least 1 minute")
+            sys.exit(1)
+        params["minutes"] = args.minutes
+    if args.profile is not None:
+        params["profile"] = args.profile
+    if args.output is not None:
+        import os
+        # The daemon may be running in another directory
+        params["path"] = os.path.abspath(args.output)
+
+    try:
+        reply = send_command(args.action, path=args.socket, **params)
+    except DaemonNotRunningError:
+        print("Eyes daemon not running")
+        sys.exit(1)
+
+    if args.json:
+        import json
+        print(json.dumps(reply, indent=2))
+    elif not reply["ok"]:
+        print(f"Error: {reply['error']}")
+    elif args.action == "metrics":
+        print(reply["metrics"], end="")
+    elif args.action == "trace":
+        print(f"Trace written to {reply['path']} (open in ui.perfetto.dev or chrome://tracing)")
+    elif args.action == "next-fire-time":
+        print(f"Next reminder: {format_time(reply['next_fire_time'])}")
+    elif args.action == "stop":
+        print(f"Stopping eyes daemon (PID {reply['pid']})...")
+    else:
+        print(f"Eyes daemon running (PID {reply['pid']})")
+        print(f"Next reminder: {format_time(reply['next_fire_time'])}")
+        for name, profile in reply.get("profiles", {}).items():
+            print(f"  {name}: next at {format_time(profile['next_fire_time'])}")
+        jitter = reply.get("jitter")
+        if jitter and jitter["count"]:
+            print(f"Firing jitter: mean {jitter['mean_ms']:.1f} ms, max {jitter['max_ms']:.1f} ms")
+        supervisor = reply.get("supervisor")
+        if supervisor:
+            latency = supervisor["failover_ms"]["last"]
+            print(f"Supervised (PID {supervisor['pid']}): {supervisor['crashes']} crashes"
+                  + (f", last failover {latency:.1f} ms" if latency is not None else ""))
+
+    if not reply["ok"]:
+        sys.exit(1)
+
+
 def interactive_main():
     """Interactive setup for users who prefer guided configuration"""
     print("Eyes - Eye Break Reminder Setup")
@@ -0,0 +1,309 @@
+import asyncio
+import concurrent.futures
+import functools
+import itertools
+import logging
+import signal
+import threading
+
+from .control import ControlServer, handle_line, SUPPORTED as CONTROL_SUPPORTED
+from .reminder import SIGNALS, dump_trace
+from .scheduler import ScheduledEvent
+from .trace import tracer
+
+log = logging.getLogger(__name__)
+
+
+class AsyncioScheduler:
+    """Scheduler with the same interface as Scheduler, driven by an asyncio loop
+
+    Deadlines become loop timer handles, so intervals, snoozes and resets
+    all run on the event loop instead of a dedicated scheduler thread.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self._counter = itertools.count()
+        self._handles = {}
+
+    def __len__(self):
+        return len(self._handles)
+
+    def clock(self):
+        return self.loop.time()
+
+    def attach(self, loop):
+        """Bind the scheduler to a running loop"""
+        self.loop = loop
+
+    def schedule(self, delay, callback, *args, name=None):
+        """Run callback(*args) after delay seconds"""
+        return self.schedule_at(self.loop.time() + delay, callback, *args, name=name)
+
+    def schedule_at(self, deadline, callback, *args, name=None):
+        """Run callback(*args) once the loop clock reaches deadline"""
+        event = ScheduledEvent(deadline, next(self._counter), callback, args, name)
+        self._call_in_loop(self._arm, event)
+        return event
+
+    def cancel(self, event):
+        """Cancel a pending event; returns False if it already ran or was cancelled"""
+        if event is None or event.cancelled or event.fired:
+            return False
+        event.cancelled = True
+        self._call_in_loop(self._disarm, event)
+        return True
+
+    def reschedule(self, event, delay):
+        """Cancel event and schedule the same callback delay seconds from now"""
+        self.cancel(event)
+        return self.schedule(delay, event.callback, *event.args, name=event.name)
+
+    def next_deadline(self):
+        """Return the earliest pending deadline, or None if nothing is scheduled"""
+        deadlines = [handle.when() for handle in self._handles.values()]
+        return min(deadlines) if deadlines else None
+
+    def start(self):
+        """No-op: the loop drives the scheduler"""
+
+    def stop(self, timeout=None):
+        """No-op: the loop drives the scheduler"""
+
+    def clear(self):
+        """Drop every pending event"""
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles.clear()
+
+    def _arm(self, event):
+        if not event.cancelled:
+            self._handles[event.seq] = self.loop.call_at(event.deadline, self._fire, event)
+
+    def _disarm(self, event):
+        handle = self._handles.pop(event.seq, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _fire(self, event):
+        self._handles.pop(event.seq, None)
+        if event.cancelled:
+            return
+        event.fired = True
+        try:
+            with tracer.span(event.name or "callback", "scheduler"):
+                event.callback(*event.args)
+        except Exception as e:
+            log.error(
+                f"Scheduled callback {event.name or event.callback!r} failed: {e}", exc_info=True
+            )
+
+    def _call_in_loop(self, fn, *args):
+        """Run fn now if on the loop thread, otherwise hand it to the loop"""
+        if self.loop is None:
+            raise RuntimeError("AsyncioScheduler is not attached to a loop")
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            fn(*args)
+        else:
+            self.loop.call_soon_threadsafe(fn, *args)
+
+
+class AsyncReminder:
+    """asyncio engine that drives a platform reminder on a single event loop
+
+    The wrapped reminder keeps its interval/snooze/reset logic, but its
+    deadlines run as loop timers, SIGUSR1/SIGTERM are handled through
+    loop.add_signal_handler, and blocking backend calls are pushed to a
+    single-worker executor so they never stall the loop.
+    """
+
+    BACKEND_METHODS = ("show_notification", "show_reminder_with_actions")
+
+    def __init__(self, reminder, handle_signals=True, handle_sigint=False,
+                 control_path=None, serve_control=True):
+        self.reminder = reminder
+        self.handle_signals = handle_signals
+        self.handle_sigint = handle_sigint
+        self.control_path = control_path
+        self.serve_control = serve_control
+        self.scheduler = AsyncioScheduler()
+        self.executor = None
+        self._stopped = None
+        self._loop = None
+        self._loop_thread = None
+        self._previous_handlers = {}
+
+        reminder.scheduler = self.scheduler
+        for method in self.BACKEND_METHODS:
+            if hasattr(reminder, method):
+                setattr(reminder, method, self._offload(getattr(reminder, method)))
+
+    def _offload(self, fn):
+        """Wrap a blocking backend call so it runs in the executor"""
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Nested calls (e.g. a fallback calling show_notification) are
+            # already off the loop, so run them inline
+            if self._loop is None or threading.get_ident() != self._loop_thread:
+                return fn(*args, **kwargs)
+            future = self._loop.run_in_executor(
+                self.executor, functools.partial(fn, *args, **kwargs)
+            )
+            future.add_done_callback(self._report_failure)
+            return future
+
+        return wrapper
+
+    @staticmethod
+    def _report_failure(future):
+        if not future.cancelled() and future.exception() is not None:
+            log.warning(f"Notification backend failed: {future.exception()}")
+
+    def stop(self):
+        """Ask the engine to shut down"""
+        self.reminder.should_run = False
+        if self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    def _signal_show_reminder(self):
+        self.reminder._signal_show_reminder(signal.SIGUSR1, None)
+
+    def _signal_shutdown(self):
+        SIGNALS["SIGTERM"].inc()
+        log.info("Received shutdown signal")
+        self.stop()
+
+    def _install_signal_handlers(self):
+        handlers = {
+            signal.SIGUSR1: self._signal_show_reminder,
+            signal.SIGUSR2: dump_trace,
+            signal.SIGTERM: self._signal_shutdown,
+        }
+        # SIGINT belongs to the host application unless asked for
+        if self.handle_sigint:
+            handlers[signal.SIGINT] = self._signal_shutdown
+        for signum, handler in handlers.items():
+            self._previous_handlers[signum] = signal.getsignal(signum)
+            self._loop.add_signal_handler(signum, handler)
+
+    def _remove_signal_handlers(self):
+        # remove_signal_handler resets to SIG_DFL, so put back whatever was
+        # installed before (e.g. the reminder's own signal.signal handlers)
+        for signum, previous in self._previous_handlers.items():
+            self._loop.remove_signal_handler(signum)
+            if previous is not None:
+                signal.signal(signum, previous)
+        self._previous_handlers = {}
+
+    def _reset_reminder_state(self):
+        """Clear active flags whose reset events were dropped by a previous run"""
+        self.reminder.is_active = False
+        if hasattr(self.reminder, "is_reminder_active"):
+            self.reminder.is_reminder_active = False
+
+    def _handle_control(self, request):
+        reply = self.reminder.handle_control(request)
+        if not self.reminder.should_run:
+            self.stop()
+        return reply
+
+    async def _handle_control_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(handle_line(self._handle_control, line))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _start_control(self):
+        """Serve the control socket on the loop; raises AlreadyRunningError"""
+        control = ControlServer(self._handle_control, self.control_path)
+        control.bind()
+        server = await asyncio.start_unix_server(self._handle_control_client, sock=control.sock)
+        return control, server
+
+    async def run(self):
+        """Run until stopped; can be awaited inside a host application"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stopped = asyncio.Event()
+        self.executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="eyes-backend"
+        )
+        self.scheduler.attach(self._loop)
+        self.reminder.should_run = True
+        self._reset_reminder_state()
+        control = server = None
+        if self.serve_control and CONTROL_SUPPORTED:
+            control, server = await self._start_control()
+            self.reminder.control = control
+
+        if self.handle_signals and threading.current_thread() is threading.main_thread():
+            self._install_signal_handlers()
+            handlers_installed = True
+        else:
+            handlers_installed = False
+
+        log.info("Eye Break Reminder started (asyncio engine)!")
+        log.info(f"Will remind you every {self.reminder.interval_minutes} minutes.")
+
+        # The sink writers are threads of their own; publishing never blocks the loop
+        self.reminder._start_sinks()
+        sinks = self.reminder.sinks
+        state = self.reminder.state
+        if state is not None:
+            state.start()
+        self.reminder._resume()
+        self.reminder._start_idle()
+        idle = self.reminder.idle
+        exporter = self.reminder.metrics_exporter
+        if exporter is not None:
+            exporter.start(self.scheduler)
+        watcher = self.reminder.config_watcher
+        if watcher is not None:
+            watcher.start()
+        try:
+            await self._stopped.wait()
+        finally:
+            hooks = self.reminder.hooks
+            now = self.reminder.clock.wall()
+            hooks.fire("shutdown", self.reminder.name, now)
+            if sinks is not None:
+                sinks.publish("shutdown", self.reminder.name, now)
+            if watcher is not None:
+                watcher.stop()
+            if idle is not None:
+                idle.stop()
+            if exporter is not None:
+                exporter.stop()
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+                control.close()
+                self.reminder.control = None
+            if handlers_installed:
+                self._remove_signal_handlers()
+            self.scheduler.clear()
+            if self.reminder.history is not None:
+                self.reminder.history.close()
+            # Off the loop, so waiting for shutdown hooks doesn't stall a host app
+            if sinks is not None:
+                await self._loop.run_in_executor(self.executor, sinks.close)
+            if state is not None:
+                await self._loop.run_in_executor(self.executor, state.close)
+            await self._loop.run_in_executor(self.executor, hooks.stop, 2)
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            self._stopped = None
+            self._loop = None
+            self._loop_thread = None
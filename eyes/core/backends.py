@@ -0,0 +1,303 @@
+import json
+import os
+import sys
+import threading
+
+
+class BackendUnavailableError(Exception):
+    """No usable notification backend could be found"""
+
+
+class Backend:
+    """Notification backend kept alive for the life of the daemon
+
+    Subclasses import their library and build any long-lived objects once
+    in load(), so each notification only pays for the call itself.
+    """
+
+    name = None
+    modules = ()
+    supports_actions = False
+    # The user's choice arrives after notify_with_actions() returns, and is
+    # passed to its on_action callback instead of being returned
+    async_actions = False
+
+    def __init__(self):
+        self.load()
+
+    def load(self):
+        """Import the backend library and create reusable objects"""
+
+    def notify(self, title, message, timeout=None):
+        raise NotImplementedError
+
+    def notify_with_actions(self, title, message, actions):
+        """Show a notification with action buttons (plain notification by default)"""
+        self.notify(title, message)
+
+
+class PlyerBackend(Backend):
+    name = "plyer"
+    modules = ("plyer",)
+
+    def load(self):
+        from plyer import notification
+        self.notification = notification
+
+    def notify(self, title, message, timeout=None):
+        self.notification.notify(title=title, message=message, timeout=timeout or 10)
+
+
+class PyncBackend(Backend):
+    name = "pync"
+    modules = ("pync",)
+    supports_actions = True
+
+    def load(self):
+        import pync
+        self.pync = pync
+
+    def notify(self, title, message, timeout=None):
+        self.pync.notify(message, title=title)
+
+    def notify_with_actions(self, title, message, actions):
+        self.pync.notify(
+            message,
+            title=title,
+            actions=actions,
+            activate="com.apple.Terminal"  # Bring terminal to front when clicked
+        )
+
+
+class Win10ToastBackend(Backend):
+    name = "win10toast"
+    modules = ("win10toast",)
+
+    def load(self):
+        import win10toast
+        self.toaster = win10toast.ToastNotifier()
+
+    def notify(self, title, message, timeout=None):
+        self.toaster.show_toast(title, message, duration=timeout or 10, threaded=True)
+
+
+class WinotifyBackend(Backend):
+    name = "winotify"
+    modules = ("winotify",)
+
+    def load(self):
+        from winotify import Notification
+        self.Notification = Notification
+        # Reminders repeat the same text, so toasts are built once and reused
+        self._toasts = {}
+
+    def notify(self, title, message, timeout=None):
+        toast = self._toasts.get((title, message))
+        if toast is None:
+            toast = self.Notification(app_id="Eyes", title=title, msg=message, duration="short")
+            self._toasts[(title, message)] = toast
+        toast.show()
+
+
+class DBusBackend(Backend):
+    """freedesktop.org notifications over one persistent session-bus connection
+
+    Each reminder replaces its previous notification by ID instead of
+    stacking a new one. Action buttons are reported by the server's
+    ActionInvoked signal, which arrives on the connection's reader thread.
+    """
+
+    name = "dbus"
+    supports_actions = True
+    async_actions = True
+
+    SERVICE = "org.freedesktop.Notifications"
+    PATH = "/org/freedesktop/Notifications"
+
+    def load(self):
+        from ..platforms.linux import dbus
+        self.dbus = dbus
+        self.connection = None
+        self._lock = threading.Lock()
+        self._ids = {}        # replacement key -> server notification id
+        self._callbacks = {}  # server notification id -> on_action
+        self._connect()
+
+    def _connect(self):
+        try:
+            connection = self.dbus.Connection()
+            connection.subscribe(self.SERVICE, "ActionInvoked", self._action_invoked)
+            connection.subscribe(self.SERVICE, "NotificationClosed", self._notification_closed)
+        except (OSError, self.dbus.DBusError) as e:
+            raise BackendUnavailableError(f"No D-Bus notification service: {e}") from e
+        self.connection = connection
+
+    def notify(self, title, message, timeout=None):
+        self._notify(title, title, message, [], timeout * 1000 if timeout else -1)
+
+    def notify_with_actions(self, title, message, actions, on_action=None):
+        # One notification per reminder: its callback identifies it
+        key = title if on_action is None else on_action
+        action_list = []
+        for label in actions:
+            action_list += ["snooze" if label.lower().startswith("snooze") else "acknowledged", label]
+        # Never expires, so a later reminder replaces it rather than stacking
+        self._notify(key, title, message, action_list, 0, on_action)
+
+    def _notify(self, key, title, message, actions, expire_ms, on_action=None):
+        with self._lock:
+            if self.connection is None or self.connection.closed:
+                self._connect()  # The bus or notification server restarted
+            connection = self.connection
+            replaces = self._ids.get(key, 0)
+        (notification_id,) = connection.call(
+            self.SERVICE, self.PATH, self.SERVICE, "Notify", "susssasa{sv}i",
+            ("Eyes", replaces, "", title, message, actions, {}, expire_ms),
+        )
+        with self._lock:
+            self._ids[key] = notification_id
+            self._callbacks.pop(replaces, None)
+            if on_action is not None:
+                self._callbacks[notification_id] = on_action
+
+    def _action_invoked(self, notification_id, action):
+        with self._lock:
+            on_action = self._callbacks.pop(notification_id, None)
+        if on_action is not None:
+            on_action(action)
+
+    def _notification_closed(self, notification_id, reason):
+        with self._lock:
+            self._callbacks.pop(notification_id, None)
+
+
+def default_cache_path():
+    """Location of the on-disk probe cache"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "eyes", "backends.json")
+
+
+def _environment_key():
+    """Fingerprint of the interpreter and installed packages
+
+    Installing or removing a package touches its site-packages directory,
+    which changes the mtime and so invalidates cached probe results.
+    """
+    import hashlib  # Setup only; a lean daemon releases it afterwards
+
+    parts = [sys.executable, sys.version]
+    for path in sys.path:
+        try:
+            parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+        except OSError:
+            parts.append(path)
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+class BackendRegistry:
+    """Registry of notification backends with cached availability probes"""
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        # Most backends select() loads; 1 in lean mode keeps only the chosen
+        # one resident, with no fallbacks
+        self.limit = None
+        self._classes = {}
+        self._available = {}
+        self._instances = {}
+        self._disk_loaded = False
+        self._env_key = None
+
+    def register(self, backend_class):
+        """Register a Backend subclass under its name"""
+        self._classes[backend_class.name] = backend_class
+        return backend_class
+
+    def names(self):
+        return list(self._classes)
+
+    def probe(self, name):
+        """Return True if the backend's modules are importable (cached)"""
+        if name not in self._classes:
+            raise BackendUnavailableError(f"Unknown notification backend: {name}")
+        if name not in self._available:
+            self._load_disk_cache()
+        if name not in self._available:
+            import importlib.util
+            # find_spec locates the module without paying for its import
+            self._available[name] = all(
+                importlib.util.find_spec(module) is not None
+                for module in self._classes[name].modules
+            )
+            self._save_disk_cache()
+        return self._available[name]
+
+    def get(self, name):
+        """Return the long-lived instance of a backend, creating it on first use"""
+        if name not in self._instances:
+            if not self.probe(name):
+                raise BackendUnavailableError(f"Notification backend not installed: {name}")
+            try:
+                self._instances[name] = self._classes[name]()
+            except ImportError as e:
+                self._available[name] = False
+                self._save_disk_cache()
+                raise BackendUnavailableError(f"Could not load backend {name}: {e}") from e
+        return self._instances[name]
+
+    def select(self, preferred, pinned=None):
+        """Return usable backends in preference order (only `pinned` if given)"""
+        names = [pinned] if pinned else preferred
+        backends = []
+        for name in names:
+            if self.limit is not None and len(backends) >= self.limit:
+                break
+            try:
+                backends.append(self.get(name))
+            except BackendUnavailableError:
+                if pinned:
+                    raise
+        if not backends:
+            raise BackendUnavailableError(
+                f"None of the notification backends are installed: {', '.join(names)}"
+            )
+        return backends
+
+    def _environment_key(self):
+        if self._env_key is None:
+            self._env_key = _environment_key()
+        return self._env_key
+
+    def _load_disk_cache(self):
+        if self._disk_loaded or self.cache_path is None:
+            return
+        self._disk_loaded = True
+        try:
+            with open(self.cache_path) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get("key") == self._environment_key():
+            for name, available in cached.get("backends", {}).items():
+                self._available.setdefault(name, bool(available))
+
+    def _save_disk_cache(self):
+        if self.cache_path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"key": self._environment_key(), "backends": self._available}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass  # The cache is an optimisation only
+
+
+registry = BackendRegistry()
+for _backend_class in (
+    PlyerBackend, PyncBackend, Win10ToastBackend, WinotifyBackend, DBusBackend,
+):
+    registry.register(_backend_class)
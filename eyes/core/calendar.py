@@ -0,0 +1,224 @@
+import bisect
+import datetime
+
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+DAY_ALIASES = {
+    "*": DAYS,
+    "daily": DAYS,
+    "weekdays": DAYS[:5],
+    "weekends": DAYS[5:],
+}
+DAY_SECONDS = 24 * 3600
+WEEK_SECONDS = 7 * DAY_SECONDS
+
+# [schedule] table key -> what it holds
+SCHEDULE_KEYS = {
+    "windows": "active windows, e.g. \"mon-fri 09:00-17:30\"",
+    "exclude": "windows to leave out, e.g. \"12:00-13:00\" for lunch",
+    "timezone": "IANA time zone name (default: the system's local time)",
+}
+
+
+def _parse_days(text):
+    """Weekday numbers (Monday is 0) for "mon-fri", "sat,sun", "weekdays", "*"..."""
+    days = set()
+    for part in text.lower().split(","):
+        if part in DAY_ALIASES:
+            days.update(DAYS.index(day) for day in DAY_ALIASES[part])
+            continue
+        first, _, last = part.partition("-")
+        if first[:3] not in DAYS or (last and last[:3] not in DAYS):
+            raise ValueError(f"unknown day {part!r}")
+        start = DAYS.index(first[:3])
+        end = DAYS.index(last[:3]) if last else start
+        # A range may wrap round the weekend, e.g. "sat-mon"
+        days.update(day % 7 for day in range(start, end + 1 if end >= start else end + 8))
+    return sorted(days)
+
+
+def _parse_clock(text):
+    """Seconds after midnight for "H:MM" or "HH:MM" (up to 24:00)"""
+    hours, sep, minutes = text.partition(":")
+    if not (sep and hours.isdigit() and minutes.isdigit() and len(minutes) == 2):
+        raise ValueError(f"bad time {text!r}, expected HH:MM")
+    seconds = int(hours) * 3600 + int(minutes) * 60
+    if int(minutes) > 59 or seconds > DAY_SECONDS:
+        raise ValueError(f"bad time {text!r}, expected HH:MM")
+    return seconds
+
+
+def parse_window(spec):
+    """Weekly [start, end) second offsets for one "[days] HH:MM-HH:MM" window
+
+    The week starts at Monday 00:00. A window whose end is before its start
+    runs overnight into the next day.
+    """
+    fields = spec.split()
+    if len(fields) == 1:
+        days, hours = list(range(7)), fields[0]
+    elif len(fields) == 2:
+        days, hours = _parse_days(fields[0]), fields[1]
+    else:
+        raise ValueError(f"bad window {spec!r}, expected \"[days] HH:MM-HH:MM\"")
+    start, sep, end = hours.partition("-")
+    if not sep:
+        raise ValueError(f"bad window {spec!r}, expected \"[days] HH:MM-HH:MM\"")
+    start, end = _parse_clock(start), _parse_clock(end)
+    if start == end:
+        raise ValueError(f"empty window {spec!r}")
+    if end < start:
+        end += DAY_SECONDS
+    spans = []
+    for day in days:
+        offset = day * DAY_SECONDS
+        if offset + end <= WEEK_SECONDS:
+            spans.append((offset + start, offset + end))
+        else:
+            # Sunday night into Monday morning wraps round the week
+            spans.append((offset + start, WEEK_SECONDS))
+            spans.append((0, offset + end - WEEK_SECONDS))
+    return spans
+
+
+def _merge(spans):
+    """Sorted, non-overlapping union of [start, end) spans"""
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _subtract(spans, holes):
+    """Remove the (merged) holes from the (merged) spans"""
+    result = []
+    for start, end in spans:
+        for hole_start, hole_end in holes:
+            if hole_end <= start or hole_start >= end:
+                continue
+            if hole_start > start:
+                result.append([start, hole_start])
+            start = max(start, hole_end)
+            if start >= end:
+                break
+        if start < end:
+            result.append([start, end])
+    return result
+
+
+def _load_zone(name):
+    try:
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    except ImportError:  # Python < 3.9
+        from backports.zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown time zone {name!r}") from None
+
+
+class Calendar:
+    """Weekly active hours, compiled once for O(log n) lookups
+
+    Windows and exclusions are flattened into one sorted list of disjoint
+    [start, end) offsets from Monday 00:00 local time, so whether a moment
+    is active, and when the next window opens, is a binary search. Offsets
+    are in local wall-clock time, so 09:00 stays 09:00 across DST changes.
+    """
+
+    __slots__ = ("windows", "exclude", "timezone", "zone", "starts", "ends")
+
+    def __init__(self, windows, exclude=(), timezone=None):
+        self.windows = tuple(windows)
+        self.exclude = tuple(exclude)
+        self.timezone = timezone
+        self.zone = _load_zone(timezone) if timezone else None
+        spans = _merge(span for spec in self.windows for span in parse_window(spec))
+        holes = _merge(span for spec in self.exclude for span in parse_window(spec))
+        spans = _subtract(spans, holes)
+        if not spans:
+            raise ValueError("schedule has no active hours")
+        self.starts = [start for start, _ in spans]
+        self.ends = [end for _, end in spans]
+
+    def __str__(self):
+        text = ", ".join(self.windows)
+        if self.exclude:
+            text += f" except {', '.join(self.exclude)}"
+        if self.timezone:
+            text += f" ({self.timezone})"
+        return text
+
+    def __eq__(self, other):
+        return isinstance(other, Calendar) and str(self) == str(other)
+
+    def _locate(self, t):
+        """Local Monday 00:00 of t's week, and t's offset from it in seconds"""
+        local = datetime.datetime.fromtimestamp(t, self.zone).replace(tzinfo=None)
+        monday = datetime.datetime.combine(
+            local.date() - datetime.timedelta(days=local.weekday()), datetime.time()
+        )
+        return monday, (local - monday).total_seconds()
+
+    def _timestamp(self, local):
+        if self.zone is None:
+            return local.timestamp()
+        return local.replace(tzinfo=self.zone).timestamp()
+
+    def active(self, t):
+        """Whether epoch time t falls inside an active window"""
+        _, offset = self._locate(t)
+        i = bisect.bisect_right(self.starts, offset) - 1
+        return i >= 0 and offset < self.ends[i]
+
+    def next_active(self, t):
+        """t itself if it is active, otherwise when the next window opens"""
+        monday, offset = self._locate(t)
+        i = bisect.bisect_right(self.starts, offset)
+        if i > 0 and offset < self.ends[i - 1]:
+            return t
+        if i < len(self.starts):
+            opens = monday + datetime.timedelta(seconds=self.starts[i])
+        else:
+            opens = monday + datetime.timedelta(days=7, seconds=self.starts[0])
+        # A window opening inside a DST gap can map to just before t
+        return max(self._timestamp(opens), t)
+
+    def fit(self, deadline, period):
+        """deadline if it is in active hours, else one period into the next window
+
+        Time outside the schedule counts as a break, so the first reminder
+        of a window comes a full interval after it opens.
+        """
+        opens = self.next_active(deadline)
+        if opens == deadline:
+            return deadline
+        return opens + period
+
+
+def parse_schedule(table):
+    """Build a Calendar from a [schedule] table, raising ValueError if invalid"""
+    if not isinstance(table, dict):
+        raise ValueError("schedule must be a table")
+    unknown = set(table) - set(SCHEDULE_KEYS)
+    if unknown:
+        raise ValueError(f"schedule: unknown keys {', '.join(sorted(unknown))}")
+    lists = {}
+    for key in ("windows", "exclude"):
+        value = table.get(key, [])
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise ValueError(f"schedule: {key} must be a list of strings")
+        lists[key] = value
+    if not lists["windows"]:
+        raise ValueError("schedule: windows must list at least one window")
+    timezone = table.get("timezone")
+    if timezone is not None and not (isinstance(timezone, str) and timezone):
+        raise ValueError("schedule: timezone must be a non-empty string")
+    try:
+        return Calendar(lists["windows"], lists["exclude"], timezone)
+    except ValueError as e:
+        raise ValueError(f"schedule: {e}") from None
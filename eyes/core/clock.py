@@ -0,0 +1,61 @@
+import time
+
+
+class SystemClock:
+    """Real time: calling the clock reads the monotonic clock, wall() the epoch clock"""
+
+    def __call__(self):
+        return time.monotonic()
+
+    def wall(self):
+        return time.time()
+
+
+SYSTEM_CLOCK = SystemClock()
+
+
+class SimulatedClock:
+    """Deterministic clock for tests and benchmarks
+
+    Time only moves when told to. run() jumps straight from one scheduler
+    deadline to the next and runs what is due there, so days of intervals,
+    snoozes and forced shows play out in milliseconds. suspend() moves the
+    wall clock without the monotonic clock, as a laptop sleep does.
+    """
+
+    def __init__(self, start=0.0, epoch=1_700_000_000.0):
+        self.now = start
+        self.epoch = epoch
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def wall(self):
+        return self.epoch + self.now + self.slept
+
+    def advance(self, seconds):
+        """Move both clocks forward"""
+        self.now += seconds
+
+    def suspend(self, seconds):
+        """Move only the wall clock forward"""
+        self.slept += seconds
+
+    def run(self, scheduler, until, after_step=None):
+        """Run scheduler's events in deadline order up to and including until
+
+        after_step is called after every batch, e.g. to let a dispatcher
+        thread drain before time moves on. Returns the number of events run.
+        """
+        ran = 0
+        while True:
+            deadline = scheduler.next_deadline()
+            if deadline is None or deadline > until:
+                break
+            self.now = max(self.now, deadline)
+            ran += scheduler.run_pending()
+            if after_step is not None:
+                after_step()
+        self.now = max(self.now, until)
+        return ran
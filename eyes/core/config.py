@@ -0,0 +1,109 @@
+import os
+
+from .calendar import parse_schedule
+from .hooks import parse_hooks
+from .reminder import _validate_minutes
+from .timer import SUSPEND_POLICIES
+
+MODES = ("advanced", "simple")
+
+# TOML key -> Config attribute
+CONFIG_KEYS = {
+    "interval": "interval_minutes",
+    "snooze": "snooze_minutes",
+    "mode": "mode",
+    "title": "title",
+    "message": "message",
+    "on_resume": "on_resume",
+    "backend": "backend",
+    "schedule": "calendar",
+    "hooks": "hooks",
+}
+
+# Read at startup only; a running daemon reports that these need a restart
+RESTART_KEYS = ("mode", "backend")
+
+
+def default_config_path():
+    """Location of the daemon config file"""
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    return os.path.join(config_home, "eyes", "config.toml")
+
+
+def read_toml(path):
+    """Parse a TOML file, raising ValueError if it can't be read or parsed"""
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        import tomli as tomllib
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except OSError as e:
+        raise ValueError(f"cannot read {path}: {e.strerror}") from e
+    except tomllib.TOMLDecodeError as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+class Config:
+    """Daemon settings from the config file, merged with command-line flags"""
+
+    __slots__ = tuple(CONFIG_KEYS.values())
+
+    def __init__(self, interval_minutes=20, snooze_minutes=5, mode="advanced", title=None,
+                 message=None, on_resume="fire", backend=None, calendar=None,
+                 hooks=()):
+        self.interval_minutes = interval_minutes
+        self.snooze_minutes = snooze_minutes
+        self.mode = mode
+        self.title = title
+        self.message = message
+        self.on_resume = on_resume
+        self.backend = backend
+        # Active hours (a core.calendar.Calendar); None means around the clock
+        self.calendar = calendar
+        # core.hooks.Hook objects run on reminder events
+        self.hooks = tuple(hooks)
+
+    def replace(self, **changes):
+        """Copy with some settings changed (None leaves a setting as it is)"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update((name, value) for name, value in changes.items() if value is not None)
+        return Config(**values)
+
+
+def parse_config(data):
+    """Build a Config from parsed TOML, raising ValueError on the first bad setting"""
+    unknown = set(data) - set(CONFIG_KEYS)
+    if unknown:
+        raise ValueError(f"unknown keys {', '.join(sorted(unknown))}")
+    kwargs = {CONFIG_KEYS[key]: value for key, value in data.items()}
+    for key in ("interval", "snooze"):
+        if key in data:
+            try:
+                _validate_minutes(data[key])
+            except ValueError as e:
+                raise ValueError(f"{key}: {e}") from None
+    if kwargs.get("mode", "advanced") not in MODES:
+        raise ValueError(f"mode must be one of {', '.join(MODES)}")
+    if kwargs.get("on_resume", "fire") not in SUSPEND_POLICIES:
+        raise ValueError(f"on_resume must be one of {', '.join(SUSPEND_POLICIES)}")
+    for key in ("title", "message", "backend"):
+        if key in kwargs and not (isinstance(kwargs[key], str) and kwargs[key]):
+            raise ValueError(f"{key} must be a non-empty string")
+    if "schedule" in data:
+        kwargs["calendar"] = parse_schedule(data["schedule"])
+    if "hooks" in data:
+        kwargs["hooks"] = parse_hooks(data["hooks"])
+    return Config(**kwargs)
+
+
+def load_config(path):
+    """Read the config file, raising ValueError if it is invalid"""
+    data = read_toml(path)
+    try:
+        return parse_config(data)
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
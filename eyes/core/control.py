@@ -0,0 +1,268 @@
+import errno
+import json
+import os
+import selectors
+import socket
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Unix domain sockets and flock are unavailable on Windows
+SUPPORTED = hasattr(socket, "AF_UNIX") and fcntl is not None
+
+COMMANDS = ("show", "stop", "snooze", "status", "next-fire-time", "reload", "metrics", "trace")
+
+
+class AlreadyRunningError(Exception):
+    """Another eyes daemon is already serving the control socket"""
+
+
+class DaemonNotRunningError(Exception):
+    """No eyes daemon is listening on the control socket"""
+
+
+def default_socket_path():
+    """Per-user control socket path"""
+    override = os.environ.get("EYES_SOCKET")
+    if override:
+        return override
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "eyes.sock")
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join("/tmp", f"eyes-{user}.sock")
+
+
+def encode(message):
+    """Encode a message as one line of JSON"""
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+def handle_line(handler, line):
+    """Decode a request line, run handler and return the encoded reply"""
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict) or "cmd" not in request:
+            raise ValueError("request must be an object with a 'cmd' field")
+    except ValueError as e:
+        return encode({"ok": False, "error": f"bad request: {e}"})
+
+    if request["cmd"] not in COMMANDS:
+        return encode({"ok": False, "error": f"unknown command: {request['cmd']}"})
+
+    try:
+        reply = handler(request)
+    except Exception as e:
+        return encode({"ok": False, "error": str(e)})
+    return encode(dict({"ok": True}, **(reply or {})))
+
+
+class ControlServer:
+    """Line-delimited JSON control socket that doubles as the single-instance lock
+
+    An exclusive flock on a sibling lock file is held for the daemon's
+    lifetime, so only the lock holder ever unlinks or binds the socket
+    path. A socket file left by a crashed daemon is simply replaced.
+    """
+
+    MAX_PENDING_OUTPUT = 64 * 1024
+
+    def __init__(self, handler, path=None):
+        self.handler = handler
+        self.path = path or default_socket_path()
+        self.lock_path = self.path + ".lock"
+        self.sock = None
+        self._lock_fd = None
+        self._thread = None
+        self._selector = None
+        self._wake_r = None
+        self._wake_w = None
+
+    def bind(self):
+        """Take the instance lock and listen, raising AlreadyRunningError if held"""
+        if not SUPPORTED:
+            raise OSError(errno.ENOTSUP, "control socket requires Unix domain sockets")
+        self._acquire_lock()
+        old_umask = os.umask(0o077)
+        try:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.bind(self.path)
+                sock.listen(16)
+            except OSError:
+                sock.close()
+                self._release_lock()
+                raise
+        finally:
+            os.umask(old_umask)
+        sock.setblocking(False)
+        self.sock = sock
+        return sock
+
+    def _acquire_lock(self):
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as e:
+            os.close(fd)
+            if e.errno in (errno.EWOULDBLOCK, errno.EAGAIN, errno.EACCES):
+                raise AlreadyRunningError(f"eyes is already running ({self.path})") from e
+            raise
+        self._lock_fd = fd
+
+    def _release_lock(self):
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def start(self):
+        """Serve requests on a background thread"""
+        if self.sock is None:
+            self.bind()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._selector.register(self.sock, selectors.EVENT_READ, None)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._serve, name="eyes-control", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop serving, remove the socket file and release the lock"""
+        if self._wake_w is not None:
+            try:
+                self._wake_w.send(b"x")
+            except OSError:
+                pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(1)
+        self._thread = None
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        self._release_lock()
+
+    def _serve(self):
+        clients = {}
+        try:
+            while True:
+                for key, mask in self._selector.select():
+                    conn = key.fileobj
+                    if conn is self._wake_r:
+                        return
+                    if conn is self.sock:
+                        self._accept(clients)
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._read(conn, clients)
+                    if conn in clients and mask & selectors.EVENT_WRITE:
+                        self._flush(conn, clients)
+        finally:
+            for conn in clients:
+                conn.close()
+            self._selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+            self._wake_r = self._wake_w = None
+
+    def _accept(self, clients):
+        try:
+            conn, _ = self.sock.accept()
+        except OSError:
+            return
+        conn.setblocking(False)
+        # [input buffer, pending output]
+        clients[conn] = [b"", b""]
+        self._selector.register(conn, selectors.EVENT_READ, None)
+
+    def _read(self, conn, clients):
+        try:
+            data = conn.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(conn, clients)
+            return
+        state = clients[conn]
+        state[0] += data
+        while b"\n" in state[0]:
+            line, state[0] = state[0].split(b"\n", 1)
+            state[1] += handle_line(self.handler, line)
+        self._flush(conn, clients)
+
+    def _flush(self, conn, clients):
+        """Send as much pending output as the socket accepts without blocking"""
+        state = clients[conn]
+        if state[1]:
+            try:
+                sent = conn.send(state[1])
+                state[1] = state[1][sent:]
+            except BlockingIOError:
+                pass
+            except OSError:
+                self._drop(conn, clients)
+                return
+        if len(state[1]) > self.MAX_PENDING_OUTPUT:
+            # Client isn't reading its replies
+            self._drop(conn, clients)
+            return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if state[1] else 0)
+        self._selector.modify(conn, events, None)
+
+    def _drop(self, conn, clients):
+        self._selector.unregister(conn)
+        clients.pop(conn, None)
+        conn.close()
+
+
+class ControlClient:
+    """Persistent client connection to a daemon's control socket"""
+
+    def __init__(self, path=None, timeout=2.0):
+        self.path = path or default_socket_path()
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(self.path)
+        except OSError as e:
+            self.sock.close()
+            raise DaemonNotRunningError(f"eyes daemon not running ({self.path})") from e
+        self._buffer = b""
+
+    def request(self, cmd, **params):
+        """Send one command and return the decoded reply"""
+        self.sock.sendall(encode(dict(params, cmd=cmd)))
+        while b"\n" not in self._buffer:
+            data = self.sock.recv(4096)
+            if not data:
+                raise DaemonNotRunningError("eyes daemon closed the connection")
+            self._buffer += data
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line)
+
+    def close(self):
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def send_command(cmd, path=None, timeout=2.0, **params):
+    """Send a single command to the running daemon and return its reply"""
+    with ControlClient(path, timeout) as client:
+        return client.request(cmd, **params)
@@ -0,0 +1,209 @@
+import collections
+import concurrent.futures
+import logging
+import threading
+import time
+
+from .metrics import registry as metrics
+from .trace import tracer
+
+log = logging.getLogger(__name__)
+
+DROPPED = metrics.counter(
+    "eyes_dispatch_dropped_total", "Queued notifications dropped because the queue was full"
+)
+
+
+class Notification:
+    """A queued notification request"""
+
+    __slots__ = ("title", "message", "timeout", "actions", "on_result", "queued_at")
+
+    def __init__(self, title, message, timeout=None, actions=None, on_result=None):
+        self.title = title
+        self.message = message
+        self.timeout = timeout
+        self.actions = actions
+        self.on_result = on_result
+        self.queued_at = time.monotonic()
+
+
+class Dispatcher:
+    """Bounded notification queue drained by one worker with per-call deadlines
+
+    submit() never blocks, so the scheduler thread and signal handlers only
+    enqueue. The worker hands each backend call to that backend's own
+    single-thread runner and waits at most `deadline` seconds; a call that
+    overruns counts as a timeout and the next backend is tried. A backend
+    whose previous call is still hung is skipped until it returns, which
+    keeps the thread count bounded at one runner per backend.
+    """
+
+    def __init__(self, backends, deadline=10.0, maxsize=8):
+        self.backends = list(backends)
+        self.deadline = deadline
+        self.stats = {
+            "submitted": 0, "delivered": 0, "dropped": 0,
+            "timeouts": 0, "failures": 0, "fallbacks": 0, "undelivered": 0,
+        }
+        self.last_error = None
+        self._queue = collections.deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self._runners = {}
+        self._pending = {}
+        self._thread = None
+        self._running = False
+        self._busy = False
+        self._latency = {}
+        self._timeouts = {}
+        self._failures = {}
+        for backend in self.backends:
+            labels = {"backend": backend.name}
+            self._latency[backend.name] = metrics.histogram(
+                "eyes_backend_call_seconds", "Notification backend call duration", **labels
+            )
+            self._timeouts[backend.name] = metrics.counter(
+                "eyes_backend_timeouts_total", "Backend calls that overran the deadline", **labels
+            )
+            self._failures[backend.name] = metrics.counter(
+                "eyes_backend_failures_total", "Backend calls that raised", **labels
+            )
+
+    def submit(self, title, message, timeout=None, actions=None, on_result=None):
+        """Queue a notification without blocking; the oldest is dropped when full"""
+        notification = Notification(title, message, timeout, actions, on_result)
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                self.stats["dropped"] += 1
+                DROPPED.inc()
+            self._queue.append(notification)
+            self.stats["submitted"] += 1
+            tracer.instant("dispatch.submit", "dispatch", queued=len(self._queue))
+            self._cond.notify()
+        if not self._running:
+            self.start()
+
+    def start(self):
+        """Start the worker thread (idempotent)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._worker, name="eyes-dispatch", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the worker; hung backend calls are abandoned"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+        for runner in self._runners.values():
+            runner.shutdown(wait=False)
+        self._runners.clear()
+        self._pending.clear()
+
+    def join(self, timeout=None):
+        """Wait until the queue is drained (for tests and --test mode)"""
+        end = time.monotonic() + (timeout if timeout is not None else float("inf"))
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+        return True
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running and not self._queue:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                notification = self._queue.popleft()
+                self._busy = True
+            try:
+                with tracer.span("dispatch.deliver", "dispatch") as span:
+                    span.set(backend=self._deliver(notification))
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _deliver(self, notification):
+        """Try each backend in order until one succeeds within the deadline
+
+        Returns the name of the backend that delivered it, or None.
+        """
+        for index, backend in enumerate(self.backends):
+            pending = self._pending.get(backend.name)
+            if pending is not None and not pending.done():
+                continue  # Still hung from an earlier call
+            if index > 0:
+                self.stats["fallbacks"] += 1
+            future = self._runner(backend).submit(self._call, backend, notification)
+            self._pending[backend.name] = future
+            try:
+                result = future.result(self.deadline)
+            except concurrent.futures.TimeoutError:
+                self.stats["timeouts"] += 1
+                self._timeouts[backend.name].inc()
+                self.last_error = f"{backend.name}: no response after {self.deadline}s"
+                log.warning(f"Notification backend {backend.name} timed out")
+                continue
+            except Exception as e:
+                self.stats["failures"] += 1
+                self._failures[backend.name].inc()
+                self.last_error = f"{backend.name}: {e}"
+                log.warning(f"Notification backend {backend.name} failed: {e}")
+                continue
+            self.stats["delivered"] += 1
+            self._report(notification, result)
+            return backend.name
+        self.stats["undelivered"] += 1
+        self._report(notification, None)
+        return None
+
+    def _call(self, backend, notification):
+        """Runs on the backend's runner thread, so hung calls are timed too"""
+        start = time.perf_counter()
+        try:
+            with tracer.span("backend.call", "dispatch", backend=backend.name):
+                return self._notify(backend, notification)
+        finally:
+            self._latency[backend.name].observe(time.perf_counter() - start)
+
+    def _notify(self, backend, notification):
+        if notification.actions and backend.async_actions:
+            # Reported as "no choice yet"; the backend calls on_result
+            # again if the user picks an action later
+            backend.notify_with_actions(
+                notification.title, notification.message, notification.actions,
+                on_action=notification.on_result,
+            )
+            return None
+        if notification.actions and backend.supports_actions:
+            return backend.notify_with_actions(
+                notification.title, notification.message, notification.actions
+            )
+        backend.notify(notification.title, notification.message, notification.timeout)
+        return None
+
+    def _report(self, notification, result):
+        if notification.on_result is not None:
+            try:
+                notification.on_result(result)
+            except Exception as e:
+                log.error(f"Notification result handler failed: {e}", exc_info=True)
+
+    def _runner(self, backend):
+        runner = self._runners.get(backend.name)
+        if runner is None:
+            runner = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"eyes-backend-{backend.name}"
+            )
+            self._runners[backend.name] = runner
+        return runner
@@ -0,0 +1,213 @@
+import collections
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Event kinds, stored as their index
+EVENTS = ("shown", "snoozed", "acknowledged", "missed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL,
+    kind INTEGER NOT NULL,
+    profile TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    kind INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, profile, kind)
+) WITHOUT ROWID;
+"""
+
+
+def default_history_path():
+    """Location of the break history database"""
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    return os.path.join(data_home, "eyes", "history.db")
+
+
+def _day(ts):
+    return time.strftime("%Y-%m-%d", time.localtime(ts))
+
+
+class HistoryStore:
+    """Append-only event log in SQLite (WAL) with per-day rollups
+
+    Every batch appends raw events and bumps the matching (day, profile,
+    kind) counters in the same transaction, so aggregate queries read a
+    few rows per day instead of scanning the event log.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with NORMAL sync is crash-safe; only the last batch can be lost on power failure
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def append(self, events):
+        """Write a batch of (timestamp, kind, profile) events in one transaction"""
+        rows = [(ts, EVENTS.index(kind), profile or "") for ts, kind, profile in events]
+        counts = collections.Counter((_day(ts), profile, kind) for ts, kind, profile in rows)
+        with self.conn:
+            self.conn.executemany("INSERT INTO events VALUES (?, ?, ?)", rows)
+            self.conn.executemany(
+                "INSERT INTO daily VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (day, profile, kind) DO UPDATE SET count = count + excluded.count",
+                [key + (count,) for key, count in counts.items()],
+            )
+
+    def daily(self, since=None, profile=None):
+        """Per-day counts {day: {kind: count}} from the rollups, oldest first"""
+        query = "SELECT day, kind, SUM(count) FROM daily WHERE day >= ?"
+        params = [since or ""]
+        if profile is not None:
+            query += " AND profile = ?"
+            params.append(profile)
+        query += " GROUP BY day, kind ORDER BY day"
+        days = {}
+        for day, kind, count in self.conn.execute(query, params):
+            days.setdefault(day, dict.fromkeys(EVENTS, 0))[EVENTS[kind]] = count
+        return days
+
+    def weekly(self, since=None, profile=None):
+        """Per-ISO-week counts {"YYYY-Www": {kind: count}}, oldest first"""
+        weeks = {}
+        for day, counts in self.daily(since, profile).items():
+            year, week, _ = datetime.date.fromisoformat(day).isocalendar()
+            totals = weeks.setdefault(f"{year}-W{week:02d}", dict.fromkeys(EVENTS, 0))
+            for kind, count in counts.items():
+                totals[kind] += count
+        return weeks
+
+
+class HistoryWriter:
+    """Buffers events in memory and writes them in batches on a background thread
+
+    record() only appends to a deque, so reminders and signal handlers
+    never wait on disk. The writer sleeps until there is something to
+    write, then flushes once the batch fills or flush_interval passes.
+    """
+
+    def __init__(self, path, batch_size=64, flush_interval=5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.errors = 0
+        self._buffer = collections.deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._writing = False
+        self._flush_now = False
+        self._disabled = False
+
+    def record(self, kind, profile=None):
+        """Queue one event (never blocks on I/O)"""
+        if kind not in EVENTS:
+            raise ValueError(f"unknown history event: {kind}")
+        if self._disabled:
+            return
+        with self._cond:
+            self._buffer.append((time.time(), kind, profile))
+            # The first event starts the flush_interval countdown
+            if len(self._buffer) == 1 or len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+        if not self._running:
+            self.start()
+
+    def start(self):
+        """Start the writer thread (idempotent)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._worker, name="eyes-history", daemon=True)
+        self._thread.start()
+
+    def flush(self, timeout=None):
+        """Ask the writer to write everything buffered now and wait for it"""
+        end = time.monotonic() + (timeout if timeout is not None else float("inf"))
+        with self._cond:
+            if self._buffer:
+                self._flush_now = True
+                self._cond.notify()
+            while (self._buffer or self._writing) and self._running:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(min(remaining, 0.05))
+        return True
+
+    def close(self, timeout=2.0):
+        """Flush outstanding events and stop the writer"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def _worker(self):
+        try:
+            store = HistoryStore(self.path)
+        except (OSError, sqlite3.Error) as e:
+            log.warning(f"Break history disabled ({self.path}): {e}")
+            with self._cond:
+                self._disabled = True
+                self._running = False
+                self._buffer.clear()
+                self._cond.notify_all()
+            return
+        try:
+            while True:
+                with self._cond:
+                    while self._running and not self._buffer:
+                        self._cond.wait()
+                    # Give the batch time to fill unless asked to flush
+                    deadline = time.monotonic() + self.flush_interval
+                    while (self._running and not self._flush_now
+                           and len(self._buffer) < self.batch_size):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    batch = list(self._buffer)
+                    self._buffer.clear()
+                    self._flush_now = False
+                    self._writing = bool(batch)
+                    running = self._running
+                if batch:
+                    self._write(store, batch)
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+                if not running:
+                    return
+        finally:
+            store.close()
+
+    def _write(self, store, batch):
+        try:
+            store.append(batch)
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            self.errors += 1
+            log.warning(f"Could not write break history: {e}")
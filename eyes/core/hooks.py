@@ -0,0 +1,263 @@
+import concurrent.futures
+import logging
+import os
+import sys
+import threading
+import time
+
+from .metrics import registry as metrics
+
+log = logging.getLogger(__name__)
+
+HOOK_EVENTS = ("shown", "snoozed", "acknowledged", "missed", "shutdown")
+HOOK_KEYS = ("event", "command", "python", "name", "timeout", "concurrency")
+
+
+def _load_entry_point(spec):
+    """The callable named by "package.module:function" """
+    import importlib
+    module_name, _, attr = spec.partition(":")
+    target = importlib.import_module(module_name)
+    for part in attr.split("."):
+        target = getattr(target, part)
+    return target
+
+
+class Hook:
+    """A shell command or Python callable to run on reminder events"""
+
+    __slots__ = (
+        "name", "events", "command", "python", "timeout", "concurrency",
+        "slots", "runs", "seconds", "_target",
+    )
+
+    def __init__(self, events, command=None, python=None, name=None, timeout=10.0,
+                 concurrency=1):
+        if (command is None) == (python is None):
+            raise ValueError("needs exactly one of command or python")
+        self.events = tuple(events)
+        self.command = command
+        self.python = python
+        if name is None:
+            name = python if python is not None else (
+                command if isinstance(command, str) else command[0]
+            )
+        self.name = name
+        self.timeout = timeout
+        self.concurrency = concurrency
+        # A run holds a slot from the moment it is queued until it finishes
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.runs = {
+            result: metrics.counter(
+                "eyes_hook_runs_total", "Hook runs by result; dropped means all slots were busy",
+                hook=name, result=result,
+            )
+            for result in ("ok", "failed", "timeout", "dropped")
+        }
+        self.seconds = metrics.histogram("eyes_hook_seconds", "Hook run duration", hook=name)
+        self._target = None
+
+    def target(self):
+        """The Python callable, imported on first use"""
+        if self._target is None:
+            self._target = _load_entry_point(self.python)
+        return self._target
+
+
+def parse_hooks(items):
+    """Build Hooks from a list of [[hooks]] tables, raising ValueError if invalid"""
+    if not isinstance(items, list):
+        raise ValueError("hooks must be a list of [[hooks]] tables")
+    hooks = []
+    for index, table in enumerate(items):
+        where = f"hooks[{index}]"
+        if not isinstance(table, dict):
+            raise ValueError(f"{where} must be a table")
+        unknown = set(table) - set(HOOK_KEYS)
+        if unknown:
+            raise ValueError(f"{where}: unknown keys {', '.join(sorted(unknown))}")
+        events = table.get("event")
+        if isinstance(events, str):
+            events = [events]
+        if not events or not isinstance(events, list) or not set(events) <= set(HOOK_EVENTS):
+            raise ValueError(f"{where}: event must be one or more of {', '.join(HOOK_EVENTS)}")
+        command = table.get("command")
+        if command is not None and not (
+            (isinstance(command, str) and command)
+            or (isinstance(command, list) and command and all(isinstance(a, str) for a in command))
+        ):
+            raise ValueError(f"{where}: command must be a string or a list of strings")
+        python = table.get("python")
+        if python is not None and not (isinstance(python, str) and ":" in python):
+            raise ValueError(f"{where}: python must look like \"package.module:function\"")
+        timeout = table.get("timeout", 10.0)
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise ValueError(f"{where}: timeout must be a positive number of seconds")
+        concurrency = table.get("concurrency", 1)
+        if isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1:
+            raise ValueError(f"{where}: concurrency must be a positive integer")
+        name = table.get("name")
+        if name is not None and not (isinstance(name, str) and name):
+            raise ValueError(f"{where}: name must be a non-empty string")
+        try:
+            hooks.append(Hook(events, command, python, name, timeout, concurrency))
+        except ValueError as e:
+            raise ValueError(f"{where}: {e}") from None
+    return hooks
+
+
+class HookRunner:
+    """Runs hooks for reminder events on a bounded pool, never blocking the caller
+
+    fire() only takes a free slot and queues the run, so the scheduler
+    thread, signal handlers and dispatch callbacks never wait on a hook. An
+    event that finds all of a hook's slots busy is dropped for that hook.
+    Shell commands are killed when they overrun their timeout. A Python
+    hook can't be interrupted, so it runs on its own thread and an overrun
+    frees the pool worker while the hook keeps its slot until it returns:
+    a wedged hook only ever holds up later runs of itself.
+    """
+
+    def __init__(self, hooks=(), max_workers=4):
+        self.hooks = list(hooks)
+        self.max_workers = max_workers
+        self.stats = {"ok": 0, "failed": 0, "timeout": 0, "dropped": 0}
+        self.last_error = None
+        self._executor = None
+        self._cond = threading.Condition()
+        self._running = 0
+
+    def configure(self, hooks):
+        """Use a new set of hooks; runs already queued finish as they were"""
+        self.hooks = list(hooks)
+
+    def fire(self, event, profile=None, at=None):
+        """Queue every hook attached to event"""
+        hooks = [hook for hook in self.hooks if event in hook.events]
+        if not hooks:
+            return
+        payload = {"event": event, "profile": profile, "time": time.time() if at is None else at}
+        for hook in hooks:
+            if not hook.slots.acquire(blocking=False):
+                self._count(hook, "dropped")
+                continue
+            with self._cond:
+                self._running += 1
+            try:
+                self._pool().submit(self._run, hook, payload)
+            except RuntimeError:  # Pool already shut down
+                hook.slots.release()
+                self._done()
+
+    def stop(self, timeout=None):
+        """Wait up to timeout for queued and running hooks, then stop the pool"""
+        end = time.monotonic() + (timeout if timeout is not None else float("inf"))
+        with self._cond:
+            while self._running:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="eyes-hook"
+            )
+        return self._executor
+
+    def _run(self, hook, payload):
+        start = time.perf_counter()
+        try:
+            if hook.python is not None:
+                result = self._run_python(hook, payload)
+            else:
+                try:
+                    result = self._run_command(hook, payload)
+                finally:
+                    hook.slots.release()
+            hook.seconds.observe(time.perf_counter() - start)
+            self._count(hook, result)
+        finally:
+            self._done()
+
+    def _run_command(self, hook, payload):
+        import subprocess
+        env = dict(os.environ, EYES_EVENT=payload["event"], EYES_TIME=str(payload["time"]))
+        if payload["profile"] is not None:
+            env["EYES_PROFILE"] = payload["profile"]
+        try:
+            process = subprocess.Popen(
+                hook.command, shell=isinstance(hook.command, str), env=env,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                # Its own process group, so a timeout kills what the shell started too
+                start_new_session=sys.platform != "win32",
+            )
+        except OSError as e:
+            return self._failed(hook, e)
+        try:
+            _, stderr = process.communicate(timeout=hook.timeout)
+        except subprocess.TimeoutExpired:
+            self._kill(process)
+            return self._timed_out(hook)
+        if process.returncode != 0:
+            detail = stderr.decode(errors="replace").strip().splitlines()
+            return self._failed(
+                hook, f"exit status {process.returncode}" + (f": {detail[-1]}" if detail else "")
+            )
+        return "ok"
+
+    @staticmethod
+    def _kill(process):
+        import signal
+        try:
+            if sys.platform != "win32":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except OSError:
+            pass
+        process.communicate()
+
+    def _run_python(self, hook, payload):
+        outcome = []
+
+        def call():
+            try:
+                hook.target()(payload)
+                outcome.append("ok")
+            except Exception as e:
+                outcome.append(e)
+            finally:
+                hook.slots.release()
+
+        thread = threading.Thread(target=call, name=f"eyes-hook-{hook.name}", daemon=True)
+        thread.start()
+        thread.join(hook.timeout)
+        if not outcome:
+            return self._timed_out(hook)
+        if outcome[0] != "ok":
+            return self._failed(hook, outcome[0])
+        return "ok"
+
+    def _failed(self, hook, error):
+        self.last_error = f"{hook.name}: {error}"
+        log.warning(f"Hook {hook.name} failed: {error}")
+        return "failed"
+
+    def _timed_out(self, hook):
+        self.last_error = f"{hook.name}: no result after {hook.timeout}s"
+        log.warning(f"Hook {hook.name} timed out after {hook.timeout}s")
+        return "timeout"
+
+    def _done(self):
+        with self._cond:
+            self._running -= 1
+            self._cond.notify_all()
+
+    def _count(self, hook, result):
+        self.stats[result] += 1
+        hook.runs[result].inc()
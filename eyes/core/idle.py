@@ -0,0 +1,293 @@
+import logging
+import sys
+
+from .metrics import registry as metrics
+from .trace import tracer
+
+log = logging.getLogger(__name__)
+
+IDLE_SAMPLES = metrics.counter("eyes_idle_samples_total", "Idle probe samples taken")
+IDLE_ERRORS = metrics.counter(
+    "eyes_idle_probe_errors_total", "Idle probe samples that failed (the user counts as present)"
+)
+IDLE_PAUSES = metrics.counter(
+    "eyes_idle_pauses_total", "Times reminders were paused because nobody was at the machine"
+)
+IDLE_AWAY = metrics.gauge("eyes_idle_away", "1 while nobody is at the machine")
+
+# Idle times are read a little after the monotonic clock; differences below
+# this are probe and call latency, not input
+INPUT_TOLERANCE = 1.0
+
+
+class IdleUnavailableError(Exception):
+    """The probe can't tell how long the user has been idle"""
+
+
+class IdleProbe:
+    """Source of the time since the user last used keyboard or mouse
+
+    Like notification backends, subclasses set up anything long-lived once
+    in load(), so each sample is a single cheap call.
+    """
+
+    name = None
+
+    def __init__(self):
+        self.load()
+
+    def load(self):
+        """Find the platform API, raising IdleUnavailableError if there is none"""
+
+    def idle_seconds(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class DBusIdleProbe(IdleProbe):
+    """Idle time from the desktop session over the D-Bus session bus
+
+    GNOME's compositor exposes it as Mutter's IdleMonitor; KDE and most
+    others implement the freedesktop ScreenSaver interface. The first that
+    answers is used for the life of the daemon.
+    """
+
+    name = "dbus"
+
+    # (service, object path, interface, method, seconds per unit)
+    SOURCES = (
+        ("org.gnome.Mutter.IdleMonitor", "/org/gnome/Mutter/IdleMonitor/Core",
+         "org.gnome.Mutter.IdleMonitor", "GetIdletime", 0.001),
+        # KDE reports milliseconds here
+        ("org.freedesktop.ScreenSaver", "/org/freedesktop/ScreenSaver",
+         "org.freedesktop.ScreenSaver", "GetSessionIdleTime", 0.001),
+    )
+    # A sample runs on the scheduler thread, so a hung compositor mustn't hold it
+    timeout = 1.0
+
+    def load(self):
+        from ..platforms.linux import dbus
+        self.dbus = dbus
+        self.connection = None
+        self.source = None
+        self._connect()
+
+    def _connect(self):
+        try:
+            connection = self.dbus.Connection(timeout=self.timeout)
+        except (OSError, self.dbus.DBusError) as e:
+            raise IdleUnavailableError(f"no session bus: {e}") from e
+        for source in self.SOURCES:
+            try:
+                self._read(connection, source)
+            except IdleUnavailableError:
+                continue
+            self.connection, self.source = connection, source
+            return
+        connection.close()
+        raise IdleUnavailableError("the desktop publishes no idle time on the session bus")
+
+    def _read(self, connection, source):
+        service, path, interface, method, scale = source
+        try:
+            (value,) = connection.call(service, path, interface, method)
+        except (self.dbus.DBusError, ValueError) as e:
+            raise IdleUnavailableError(f"{interface}.{method}: {e}") from e
+        return value * scale
+
+    def idle_seconds(self):
+        if self.connection is None or self.connection.closed:
+            self._connect()
+        return self._read(self.connection, self.source)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class QuartzIdleProbe(IdleProbe):
+    """Seconds since the last hardware input event, from CoreGraphics (macOS)"""
+
+    name = "quartz"
+
+    def load(self):
+        import ctypes
+        import ctypes.util
+        path = ctypes.util.find_library("ApplicationServices")
+        if path is None:
+            raise IdleUnavailableError("ApplicationServices framework not found")
+        since = ctypes.CDLL(path).CGEventSourceSecondsSinceLastEventType
+        since.restype = ctypes.c_double
+        since.argtypes = [ctypes.c_int32, ctypes.c_uint32]
+        self._since = since
+
+    def idle_seconds(self):
+        # kCGEventSourceStateHIDSystemState, kCGAnyInputEventType
+        return self._since(1, 0xFFFFFFFF)
+
+
+class Win32IdleProbe(IdleProbe):
+    """Time since the last input in this session, from GetLastInputInfo (Windows)"""
+
+    name = "win32"
+
+    def load(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", wintypes.UINT), ("dwTime", wintypes.DWORD)]
+
+        self._info = LASTINPUTINFO(ctypes.sizeof(LASTINPUTINFO), 0)
+        self._info_ref = ctypes.byref(self._info)
+        self._last_input = ctypes.windll.user32.GetLastInputInfo
+        self._tick_count = ctypes.windll.kernel32.GetTickCount
+        self._tick_count.restype = wintypes.DWORD
+
+    def idle_seconds(self):
+        if not self._last_input(self._info_ref):
+            raise IdleUnavailableError("GetLastInputInfo failed")
+        # Both are 32-bit millisecond tick counts; the mask handles wraparound
+        return ((self._tick_count() - self._info.dwTime) & 0xFFFFFFFF) / 1000
+
+
+IDLE_PROBES = {probe.name: probe for probe in (DBusIdleProbe, QuartzIdleProbe, Win32IdleProbe)}
+PLATFORM_PROBES = {"linux": ("dbus",), "darwin": ("quartz",), "win32": ("win32",)}
+
+
+def register_probe(probe):
+    """Make an IdleProbe subclass selectable by name"""
+    IDLE_PROBES[probe.name] = probe
+    return probe
+
+
+def select_probe(names=None):
+    """The first probe that works here (default: this platform's), or None"""
+    if names is None:
+        names = PLATFORM_PROBES.get(sys.platform, ())
+    for name in names:
+        try:
+            return IDLE_PROBES[name]()
+        # A probe for another platform fails on its imports or missing APIs
+        except (IdleUnavailableError, OSError, ImportError, AttributeError) as e:
+            log.info(f"Idle probe {name} unavailable: {e}")
+    log.info("No idle probe here; reminders run whether or not anyone is at the machine")
+    return None
+
+
+class IdleMonitor:
+    """Samples an idle probe on the scheduler and reports the user leaving and returning
+
+    Idle time grows by at most a second per second, so while the user is
+    present the next sample is only due when the threshold could first be
+    crossed: once per threshold for someone working steadily, sooner as
+    their idle time nears it. Once they are away, samples start every
+    min_interval and back off towards max_interval the longer nobody is
+    there. Both changes are dated from the idle time the probe reports, not
+    from when a sample noticed them.
+
+    Listeners are called as callback(away, since) on the scheduler thread:
+    since is the monotonic time of the last input before the user left, or
+    of the latest input once they are back.
+    """
+
+    def __init__(self, probe, threshold=300.0, min_interval=1.0, max_interval=60.0):
+        self.probe = probe
+        self.threshold = threshold
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.away = False
+        self.since = None
+        self.samples = 0
+        self.errors = 0
+        self.pauses = 0
+        self.listeners = []
+        self._scheduler = None
+        self._event = None
+        self._failing = False
+
+    def subscribe(self, callback):
+        """Call callback(away, since) whenever the user leaves or comes back"""
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def start(self, scheduler):
+        """Take the first sample now, then sample adaptively on scheduler"""
+        self._scheduler = scheduler
+        self._event = scheduler.schedule(0, self._sample, name="idle")
+
+    def stop(self):
+        """Stop sampling and release the probe"""
+        if self._scheduler is not None:
+            self._scheduler.cancel(self._event)
+            self._scheduler = None
+        self.probe.close()
+
+    def status(self):
+        return {
+            "probe": self.probe.name,
+            "away": self.away,
+            "samples": self.samples,
+            "errors": self.errors,
+            "pauses": self.pauses,
+        }
+
+    def _sample(self):
+        if self._scheduler is None:
+            return
+        now = self._scheduler.clock()
+        with tracer.span("idle.sample", "idle") as span:
+            self.samples += 1
+            IDLE_SAMPLES.inc()
+            try:
+                idle = self.probe.idle_seconds()
+            except (IdleUnavailableError, OSError) as e:
+                idle = None
+                self.errors += 1
+                IDLE_ERRORS.inc()
+                if not self._failing:
+                    log.warning(f"Idle probe {self.probe.name} failed, assuming you're there: {e}")
+                self._failing = True
+            else:
+                if self._failing:
+                    log.info(f"Idle probe {self.probe.name} working again")
+                self._failing = False
+            delay = self.update(now, idle)
+            span.set(idle=idle, away=self.away, next=delay)
+        if self._scheduler is not None:
+            self._event = self._scheduler.schedule(delay, self._sample, name="idle")
+
+    def update(self, now, idle):
+        """Apply a sample (None if the probe failed); returns the delay until the next one"""
+        if idle is None:
+            if self.away:
+                self._change(False, now)
+            return self.max_interval
+        last_input = now - max(idle, 0.0)
+        if self.away:
+            if last_input <= self.since + INPUT_TOLERANCE:
+                # Still nobody there: check less often the longer that lasts
+                away_for = idle - self.threshold
+                return min(max(away_for / 4, self.min_interval), self.max_interval)
+            self._change(False, last_input)
+        elif idle >= self.threshold:
+            self._change(True, last_input)
+            return self.min_interval
+        return max(self.threshold - idle, self.min_interval)
+
+    def _change(self, away, since):
+        self.away = away
+        self.since = since
+        IDLE_AWAY.set(1 if away else 0)
+        tracer.instant("idle.away" if away else "idle.back", "idle")
+        if away:
+            self.pauses += 1
+            IDLE_PAUSES.inc()
+            log.info(f"No input for {self.threshold / 60:g} minutes, pausing reminders")
+        else:
+            log.info("Activity again, resuming reminders")
+        for callback in list(self.listeners):
+            callback(away, since)
@@ -0,0 +1,144 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+from .metrics import registry as metrics
+
+DROPPED = metrics.counter(
+    "eyes_log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+
+# Attributes every LogRecord has; anything else arrived through extra=
+_RECORD_FIELDS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+ROTATE_TIMES = {"hourly": "H", "daily": "midnight"}
+_SIZE_UNITS = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extra= fields"""
+
+    def format(self, record):
+        entry = {
+            "time": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """The plain lines the daemon has always printed, prefixed for warnings and errors"""
+
+    def format(self, record):
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+        if record.levelno >= logging.ERROR:
+            return f"Error: {message}"
+        if record.levelno >= logging.WARNING:
+            return f"Warning: {message}"
+        return message
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the writer thread without ever blocking
+
+    The queue is a SimpleQueue, whose put() is safe to call from signal
+    handlers and never waits on a lock another frame could be holding. Past
+    maxsize waiting records, new ones are dropped and counted instead of
+    growing the queue while the sink is stuck.
+    """
+
+    def __init__(self, records, maxsize=1000):
+        super().__init__(records)
+        self.maxsize = maxsize
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Keep extra= fields and the original record: the writer formats it
+        return record
+
+    def enqueue(self, record):
+        if self.queue.qsize() >= self.maxsize:
+            self.dropped += 1
+            DROPPED.inc()
+            return
+        self.queue.put_nowait(record)
+
+
+class LogWriter(logging.handlers.QueueListener):
+    """Background thread that formats queued records and writes them to the sinks"""
+
+    def __init__(self, records, *handlers):
+        super().__init__(records, *handlers, respect_handler_level=True)
+
+    def stop(self, timeout=2.0):
+        """Write what is queued, waiting at most timeout for a stuck sink"""
+        if self._thread is None:
+            return
+        self.enqueue_sentinel()
+        self._thread.join(timeout)
+        self._thread = None
+
+
+def parse_rotation(text):
+    """("size", bytes) for "10M", "512K"...; ("time", when) for "hourly"/"daily" """
+    text = text.strip()
+    if text.lower() in ROTATE_TIMES:
+        return "time", ROTATE_TIMES[text.lower()]
+    unit = _SIZE_UNITS.get(text[-1:].upper())
+    number = text[:-1] if unit else text
+    if not number.isdigit() or int(number) == 0:
+        raise ValueError(f"bad log rotation {text!r}, expected a size like 10M or hourly/daily")
+    return "size", int(number) * (unit or 1)
+
+
+def _file_handler(path, rotate, backups):
+    kind, value = parse_rotation(rotate)
+    if kind == "time":
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path, when=value, backupCount=backups, encoding="utf-8", delay=True
+        )
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=value, backupCount=backups, encoding="utf-8", delay=True
+        )
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def setup_logging(path=None, level="info", rotate="1M", backups=3, console=True,
+                  maxsize=1000, stream=None):
+    """Send eyes.* logging through a queue to a background writer
+
+    Records go to stream (default stdout) as plain lines if console, and to
+    path as JSON lines, rotated by size or time. Logging calls only enqueue, so signal
+    handlers and the scheduler thread never wait on a slow terminal, pipe
+    or disk. Returns the writer, which is also stopped at exit.
+    """
+    handlers = []
+    if console:
+        handler = logging.StreamHandler(stream or sys.stdout)
+        handler.setFormatter(ConsoleFormatter())
+        handlers.append(handler)
+    if path:
+        handlers.append(_file_handler(path, rotate, backups))
+    records = queue.SimpleQueue()
+    logger = logging.getLogger("eyes")
+    logger.setLevel(level.upper())
+    logger.handlers[:] = [QueueHandler(records, maxsize)]
+    logger.propagate = False
+    writer = LogWriter(records, *handlers)
+    writer.start()
+    atexit.register(writer.stop)
+    return writer
@@ -0,0 +1,203 @@
+import bisect
+import logging
+import os
+import sys
+import threading
+
+log = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from sub-millisecond backend calls up to the
+# dispatcher's 10s deadline
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """Monotonically increasing count
+
+    inc() is a plain attribute update, so instrumenting a hot path costs
+    well under a microsecond. Updates from several threads can in rare
+    cases lose an increment, which is acceptable for monitoring.
+    """
+
+    __slots__ = ("labels", "value", "fn")
+    kind = "counter"
+
+    def __init__(self, labels, fn=None):
+        self.labels = labels
+        self.value = 0
+        self.fn = fn
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self, name):
+        value = self.fn() if self.fn is not None else self.value
+        yield name, self.labels, value
+
+
+class Gauge(Counter):
+    """Value that can go up and down, set directly or read from fn at export"""
+
+    __slots__ = ()
+    kind = "gauge"
+
+    def set(self, value):
+        self.value = value
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class Histogram:
+    """Distribution of observed values in fixed buckets"""
+
+    __slots__ = ("labels", "buckets", "counts", "sum", "count")
+    kind = "histogram"
+
+    def __init__(self, labels, buckets=DEFAULT_BUCKETS):
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            yield f"{name}_bucket", self.labels + (("le", _format_value(float(bound))),), cumulative
+        yield f"{name}_sum", self.labels, self.sum
+        yield f"{name}_count", self.labels, self.count
+
+
+class MetricsRegistry:
+    """Named metrics with Prometheus text exposition
+
+    Asking for an existing name and label set returns the same metric, so
+    modules can create their metrics at import time or lazily per backend.
+    """
+
+    def __init__(self):
+        self._families = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, help_text, fn=None, **labels):
+        return self._get(Counter, name, help_text, labels, fn=fn)
+
+    def gauge(self, name, help_text, fn=None, **labels):
+        return self._get(Gauge, name, help_text, labels, fn=fn)
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS, **labels):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = (cls, help_text, {})
+            elif family[0] is not cls:
+                raise ValueError(f"metric {name} is already a {family[0].kind}")
+            metric = family[2].get(key)
+            if metric is None:
+                metric = family[2][key] = cls(key, **kwargs)
+            elif kwargs.get("fn") is not None:
+                metric.fn = kwargs["fn"]  # a newer daemon object takes over
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            families = [(name, cls, help_text, list(metrics.values()))
+                        for name, (cls, help_text, metrics) in self._families.items()]
+        for name, cls, help_text, metrics in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {cls.kind}")
+            for metric in metrics:
+                for sample, labels, value in metric.samples(name):
+                    lines.append(f"{sample}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where current isn't available)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+registry = MetricsRegistry()
+registry.gauge("eyes_threads", "Live threads in the daemon", fn=threading.active_count)
+registry.gauge("eyes_resident_memory_bytes", "Resident set size of the daemon", fn=rss_bytes)
+
+
+class FileExporter:
+    """Periodically writes the registry to a file (node_exporter textfile style)"""
+
+    def __init__(self, path, interval=60.0, metrics=registry):
+        self.path = path
+        self.interval = interval
+        self.metrics = metrics
+        self._scheduler = None
+        self._event = None
+
+    def start(self, scheduler):
+        """Write now and then every interval seconds on scheduler"""
+        self._scheduler = scheduler
+        self._tick()
+
+    def stop(self):
+        """Cancel periodic writes and write the final values"""
+        if self._scheduler is not None:
+            self._scheduler.cancel(self._event)
+            self._scheduler = None
+        self.write()
+
+    def write(self):
+        """Atomically replace the metrics file"""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(self.metrics.render())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning(f"Could not write metrics to {self.path}: {e}")
+
+    def _tick(self):
+        self.write()
+        if self._scheduler is not None:
+            self._event = self._scheduler.schedule(self.interval, self._tick, name="metrics")
+
@@ -0,0 +1,332 @@
+import atexit
+import logging
+import os
+import signal
+import sys
+
+from .calendar import parse_schedule
+from .clock import SYSTEM_CLOCK
+from .config import read_toml
+from .control import ControlServer, AlreadyRunningError, SUPPORTED as CONTROL_SUPPORTED
+from .dispatch import Dispatcher
+from .metrics import registry as metrics
+from .reminder import AdvancedReminder, SIGNALS, _validate_minutes, dump_trace
+from .scheduler import Scheduler
+from .trace import tracer
+from .wakeup import Wakeup
+
+log = logging.getLogger(__name__)
+
+
+def default_profiles_path():
+    """Location of the reminder profiles file"""
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(
+        os.path.expanduser("~"), ".config"
+    )
+    return os.path.join(config_home, "eyes", "profiles.toml")
+
+
+class Profile:
+    """One named reminder schedule"""
+
+    __slots__ = (
+        "name", "interval_minutes", "snooze_minutes", "title", "message", "backend", "calendar",
+    )
+
+    def __init__(self, name, interval_minutes=20, snooze_minutes=5, title=None,
+                 message=None, backend=None, calendar=None):
+        self.name = name
+        self.interval_minutes = interval_minutes
+        self.snooze_minutes = snooze_minutes
+        self.title = title or AdvancedReminder.title
+        self.message = message or AdvancedReminder.message
+        self.backend = backend
+        self.calendar = calendar
+
+
+PROFILE_KEYS = {
+    "interval": "interval_minutes",
+    "snooze": "snooze_minutes",
+    "title": "title",
+    "message": "message",
+    "backend": "backend",
+    "schedule": "calendar",
+}
+
+
+def parse_profiles(data):
+    """Build Profiles from a {"profiles": {name: {...}}} mapping, raising ValueError"""
+    tables = data.get("profiles")
+    if not isinstance(tables, dict) or not tables:
+        raise ValueError("no [profiles.<name>] tables defined")
+    profiles = []
+    for name, table in tables.items():
+        if not isinstance(table, dict):
+            raise ValueError(f"profile {name!r} must be a table")
+        unknown = set(table) - set(PROFILE_KEYS)
+        if unknown:
+            raise ValueError(f"profile {name!r}: unknown keys {', '.join(sorted(unknown))}")
+        kwargs = {PROFILE_KEYS[key]: value for key, value in table.items()}
+        for key in ("interval_minutes", "snooze_minutes"):
+            try:
+                _validate_minutes(kwargs.get(key))
+            except ValueError as e:
+                raise ValueError(f"profile {name!r}: {e}") from None
+        if "calendar" in kwargs:
+            try:
+                kwargs["calendar"] = parse_schedule(kwargs["calendar"])
+            except ValueError as e:
+                raise ValueError(f"profile {name!r}: {e}") from None
+        profiles.append(Profile(name, **kwargs))
+    return profiles
+
+
+def load_profiles(path):
+    """Read reminder profiles from a TOML file, raising ValueError if invalid"""
+    return parse_profiles(read_toml(path))
+
+
+class ProfileReminder(AdvancedReminder):
+    """Reminder for one profile, driven by the daemon's shared scheduler"""
+
+    def __init__(self, profile, scheduler, dispatcher, clock=None):
+        super().__init__(
+            profile.interval_minutes, profile.snooze_minutes,
+            scheduler=scheduler, handle_signals=False, clock=clock,
+        )
+        self.name = profile.name
+        self.title = profile.title
+        self.message = profile.message
+        self.calendar = profile.calendar
+        self.dispatcher = dispatcher
+
+    def show_notification(self, title, message, timeout=None):
+        self.dispatcher.submit(title, message, timeout)
+
+    def show_reminder_with_actions(self, title, message, actions):
+        self.dispatcher.submit(
+            title, message, actions=actions, on_result=self._on_action_result
+        )
+
+
+class ProfileDaemon:
+    """Runs many reminder profiles in one process on one scheduler thread
+
+    Profiles sharing a backend share its dispatcher, so the thread count
+    depends on the number of distinct backends rather than profiles. The
+    scheduler's slack lets deadlines that land within the same second run
+    in a single wakeup.
+    """
+
+    def __init__(self, profiles, select_backends, slack=1.0, clock=None):
+        self._stopping = Wakeup()
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        self.scheduler = Scheduler(clock=self.clock, slack=slack)
+        self.control = None
+        self.history = None
+        self.sinks = None
+        self.state = None
+        self.idle = None
+        self.supervisor = None
+        self.metrics_exporter = None
+        self.started_at = self.clock.wall()
+        self.dispatchers = {}
+        self.reminders = {}
+        sharing = {}
+        for profile in profiles:
+            sharing[profile.backend] = sharing.get(profile.backend, 0) + 1
+        for profile in profiles:
+            if profile.name in self.reminders:
+                raise ValueError(f"duplicate profile name: {profile.name}")
+            dispatcher = self.dispatchers.get(profile.backend)
+            if dispatcher is None:
+                # Room for every profile on this backend to fire at once
+                dispatcher = Dispatcher(
+                    select_backends(profile.backend), maxsize=max(8, sharing[profile.backend])
+                )
+                self.dispatchers[profile.backend] = dispatcher
+            self.reminders[profile.name] = ProfileReminder(
+                profile, self.scheduler, dispatcher, self.clock
+            )
+
+    @property
+    def should_run(self):
+        """False once shutdown has been requested"""
+        return not self._stopping.is_set()
+
+    @should_run.setter
+    def should_run(self, value):
+        if value:
+            self._stopping.clear()
+        else:
+            self._stopping.set()
+
+    def attach_history(self, history):
+        """Record every profile's events to one history writer"""
+        self.history = history
+        for reminder in self.reminders.values():
+            reminder.history = history
+
+    def attach_state(self, state):
+        """Save and restore every profile's schedule in one state file"""
+        self.state = state
+        for reminder in self.reminders.values():
+            reminder.state = state
+
+    def attach_idle(self, idle):
+        """Pause every profile's countdown while nobody is at the machine, from one monitor"""
+        self.idle = idle
+        for reminder in self.reminders.values():
+            reminder.idle = idle
+
+    def attach_sinks(self, sinks):
+        """Publish every profile's events to one set of subscribers"""
+        self.sinks = sinks
+        for reminder in self.reminders.values():
+            reminder.sinks = sinks
+
+    def _targets(self, request):
+        """Reminders a control request applies to (all unless a profile is named)"""
+        name = request.get("profile")
+        if name is None:
+            return list(self.reminders.values())
+        if name not in self.reminders:
+            raise ValueError(f"unknown profile: {name}")
+        return [self.reminders[name]]
+
+    def next_fire_time(self):
+        """Wall-clock time of the next reminder across all profiles, or None"""
+        times = [t for t in (r.next_fire_time() for r in self.reminders.values()) if t]
+        return min(times) if times else None
+
+    def status(self):
+        """Structured snapshot of the daemon and each profile"""
+        return {
+            "pid": os.getpid(),
+            "running": self.should_run,
+            "uptime": self.clock.wall() - self.started_at,
+            "next_fire_time": self.next_fire_time(),
+            "pending_events": len(self.scheduler),
+            "wakeups": self.scheduler.wakeups,
+            "idle": self.idle.status() if self.idle is not None else None,
+            "supervisor": self.supervisor,
+            "profiles": {
+                name: {
+                    "interval_minutes": r.interval_minutes,
+                    "snooze_minutes": r.snooze_minutes,
+                    "active": r.is_reminder_active,
+                    "next_fire_time": r.next_fire_time(),
+                }
+                for name, r in self.reminders.items()
+            },
+        }
+
+    def handle_control(self, request):
+        """Handle a control-socket request, optionally scoped by "profile" """
+        cmd = request["cmd"]
+        targets = self._targets(request)
+        if cmd == "stop":
+            self.should_run = False
+        elif cmd in ("show", "snooze", "reload"):
+            for reminder in targets:
+                reminder.handle_control(request)
+        elif cmd == "next-fire-time":
+            if "profile" in request:
+                return {"next_fire_time": targets[0].next_fire_time()}
+            return {"next_fire_time": self.next_fire_time()}
+        elif cmd == "metrics":
+            return {"metrics": metrics.render()}
+        elif cmd == "trace":
+            return {"path": tracer.dump(request.get("path"))}
+        return self.status()
+
+    def _signal_show_reminder(self, signum, frame):
+        """Signal handler for SIGUSR1 - show every profile's reminder now"""
+        SIGNALS["SIGUSR1"].inc()
+        tracer.instant("SIGUSR1", "signal")
+        shown = [reminder.force_show() for reminder in self.reminders.values()]
+        if any(shown):
+            log.info("Received signal to show reminder")
+
+    def _signal_shutdown(self, signum, frame):
+        """Signal handler for SIGTERM - graceful shutdown"""
+        SIGNALS["SIGTERM"].inc()
+        tracer.instant("SIGTERM", "signal")
+        log.info("Received shutdown signal")
+        self.should_run = False
+
+    def _start_control(self):
+        """Serve the control socket, exiting if another daemon holds it"""
+        if not CONTROL_SUPPORTED:
+            log.warning("Control socket not supported on this platform")
+            return
+        self.control = ControlServer(self.handle_control)
+        try:
+            self.control.bind()
+        except AlreadyRunningError as e:
+            log.error(str(e))
+            sys.exit(1)
+        except OSError as e:
+            log.warning(f"Could not create control socket {self.control.path}: {e}")
+            self.control = None
+            return
+        self.control.start()
+        atexit.register(self._stop_control)
+
+    def _stop_control(self):
+        if self.control is not None:
+            self.control.close()
+            self.control = None
+
+    def run(self):
+        """Run every profile until shutdown"""
+        log.info(f"Eye Break Reminder started with {len(self.reminders)} profiles!")
+        for name, reminder in self.reminders.items():
+            log.info(f"  {name}: every {reminder.interval_minutes} minutes")
+        log.info("Press Ctrl+C to quit.")
+        signal.signal(signal.SIGUSR1, self._signal_show_reminder)
+        signal.signal(signal.SIGTERM, self._signal_shutdown)
+        signal.signal(signal.SIGUSR2, lambda signum, frame: dump_trace())
+
+        self._start_control()
+        if self.sinks is not None:
+            try:
+                self.sinks.start()
+            except OSError as e:
+                log.warning(f"Could not create event socket {self.sinks.path}: {e}")
+                self.attach_sinks(None)
+        if self.state is not None:
+            self.state.start()
+        self.scheduler.start()
+        for reminder in self.reminders.values():
+            reminder._resume()
+        if self.idle is not None:
+            # One probe and one sampling schedule, however many profiles
+            for reminder in self.reminders.values():
+                self.idle.subscribe(reminder.on_idle)
+            self.idle.start(self.scheduler)
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.start(self.scheduler)
+        try:
+            self._stopping.wait()
+        except KeyboardInterrupt:
+            log.info("Shutting down...")
+            self.should_run = False
+        finally:
+            if self.sinks is not None:
+                self.sinks.publish("shutdown", at=self.clock.wall())
+            self.scheduler.stop(timeout=2)
+            if self.idle is not None:
+                self.idle.stop()
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.stop()
+            self.scheduler.clear()
+            for dispatcher in self.dispatchers.values():
+                dispatcher.stop(timeout=2)
+            if self.history is not None:
+                self.history.close()
+            if self.sinks is not None:
+                self.sinks.close()
+            if self.state is not None:
+                self.state.close()
+            self._stop_control()
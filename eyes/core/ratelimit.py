@@ -0,0 +1,73 @@
+import threading
+
+from .metrics import registry as metrics
+
+DROPPED = {
+    reason: metrics.counter(
+        "eyes_show_requests_dropped_total",
+        "Reminder show requests dropped; coalesced means merged into one just shown",
+        reason=reason,
+    )
+    for reason in ("coalesced", "rate_limited")
+}
+
+
+class TokenBucket:
+    """Allows bursts of up to `burst` events, refilled at `rate` tokens per second"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst, now=0.0):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now):
+        """Use up one token if there is one"""
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class ShowGate:
+    """Decides whether a request to show a reminder goes ahead
+
+    Requests within `window` seconds of the last admitted show are
+    coalesced into it, so a burst of SIGUSR1s or `ctl show`s produces one
+    notification. Past the window, a token bucket caps the sustained rate.
+    admit() never blocks: a request that arrives while another is being
+    decided (another thread, or a signal handler interrupting one) is
+    concurrent with it and is coalesced too.
+    """
+
+    def __init__(self, window=2.0, rate=1 / 60, burst=5, now=0.0):
+        self.window = window
+        self.bucket = TokenBucket(rate, burst, now)
+        self.stats = {"admitted": 0, "coalesced": 0, "rate_limited": 0}
+        self._until = None
+        self._lock = threading.Lock()
+
+    def admit(self, now):
+        """Return True if a show requested at monotonic time now should go ahead"""
+        if not self._lock.acquire(blocking=False):
+            return self._drop("coalesced")
+        try:
+            if self._until is not None and now < self._until:
+                return self._drop("coalesced")
+            if not self.bucket.take(now):
+                return self._drop("rate_limited")
+            self._until = now + self.window
+            self.stats["admitted"] += 1
+            return True
+        finally:
+            self._lock.release()
+
+    def _drop(self, reason):
+        self.stats[reason] += 1
+        DROPPED[reason].inc()
+        return False
@@ -1,28 +1,133 @@
-import time
-import threading
 import signal
 import abc
 import os
+import sys
 import atexit
+import logging
+
+from .clock import SYSTEM_CLOCK
+from .control import ControlServer, AlreadyRunningError, SUPPORTED as CONTROL_SUPPORTED
+from .hooks import HookRunner
+from .metrics import registry as metrics
+from .ratelimit import ShowGate
+from .scheduler import Scheduler
+from .timer import IntervalTimer
+from .trace import tracer
+from .wakeup import Wakeup
+
+log = logging.getLogger(__name__)
+
+REMINDER_EVENTS = {
+    kind: metrics.counter(
+        "eyes_reminder_events_total",
+        "Reminder events by kind; missed means suppressed because one was already active",
+        kind=kind,
+    )
+    for kind in ("shown", "snoozed", "acknowledged", "missed")
+}
+SIGNALS = {
+    name: metrics.counter("eyes_signals_total", "Control signals received", signal=name)
+    for name in ("SIGUSR1", "SIGTERM")
+}
+TIMER_WAKEUPS = metrics.counter(
+    "eyes_timer_wakeups_total", "Interval timer wakeups (deadlines and resume checks)"
+)
+TIMER_LATENESS = metrics.histogram(
+    "eyes_timer_lateness_seconds", "How late interval reminders fired after their deadline"
+)
+TIMER_SUSPENDS = metrics.counter(
+    "eyes_timer_suspends_total", "Suspend/resume gaps detected by the interval timer"
+)
+
+
+def _validate_minutes(minutes):
+    """Check a minutes value received over the control socket"""
+    if minutes is None:
+        return None
+    if isinstance(minutes, bool) or not isinstance(minutes, (int, float)) or minutes <= 0:
+        raise ValueError(f"minutes must be a positive number, got {minutes!r}")
+    return minutes
+
+
+def _pending(event):
+    return event is not None and not event.cancelled and not event.fired
+
+
+def dump_trace():
+    """Write the trace ring to its default file, logging where it went"""
+    try:
+        log.info(f"Trace written to {tracer.dump()}")
+    except (ValueError, OSError) as e:
+        log.warning(f"Could not write trace: {e}")
 
 
 class BaseReminder(abc.ABC):
     """Base class for eye break reminders with common functionality"""
     
-    def __init__(self, interval_minutes=20):
+    title = "👁️ Eye Break Time!"
+    message = "Look at something 20 feet away for 20 seconds (20-20-20 rule)"
+    # Profile name recorded with history events (None for a single reminder)
+    name = None
+    
+    def __init__(self, interval_minutes=20, scheduler=None, handle_signals=True, clock=None):
         self.interval_minutes = interval_minutes
-        self.should_run = True
+        # The main thread sleeps on this until shutdown is requested
+        self._stopping = Wakeup()
         self.is_active = False
-        self.pidfile = "/tmp/eyes.pid"
-        
-        print(f"Reminder interval: {interval_minutes} minutes")
+        # All timing goes through clock, so a SimulatedClock can drive the
+        # reminder through days of schedule without waiting
+        self.clock = SYSTEM_CLOCK if clock is None else clock
+        # Several reminders can share one scheduler (see core.profiles)
+        self.scheduler = Scheduler(clock=self.clock) if scheduler is None else scheduler
+        self.timer = IntervalTimer(interval_minutes * 60, wall_clock=self.clock.wall)
+        # Forced and scheduled shows pass through one gate, so bursts of
+        # requests coalesce and the sustained rate is capped
+        self.show_gate = ShowGate(now=self.clock())
+        # Active hours (core.calendar.Calendar); None means around the clock
+        self.calendar = None
+        # Side effects (shell commands, Python callables) run on reminder events
+        self.hooks = HookRunner()
+        self.dispatcher = None
+        self.history = None
+        # Event subscribers (core.sinks.Broadcaster): stdout, FIFOs, event socket
+        self.sinks = None
+        # Saved schedule (core.state.StateFile), so a restart resumes the countdown
+        self.state = None
+        # Pauses the countdown while nobody is at the machine (core.idle.IdleMonitor)
+        self.idle = None
+        # Crash counts and failover latency from `eyes supervise`, if supervised
+        self.supervisor = None
+        self.metrics_exporter = None
+        self.control = None
+        # Settings last applied from the config file, and its watcher
+        self.config = None
+        self.config_path = None
+        self.config_error = None
+        self.config_watcher = None
+        self.started_at = self.clock.wall()
+        self._interval_event = None
+        self._reset_event = None
+        self._shown_at = None
         
-        # Create pidfile
-        self._create_pidfile()
+        log.info(f"Reminder interval: {interval_minutes} minutes")
         
         # Set up signal handlers for IPC control
-        signal.signal(signal.SIGUSR1, self._signal_show_reminder)
-        signal.signal(signal.SIGTERM, self._signal_shutdown)
+        if handle_signals:
+            signal.signal(signal.SIGUSR1, self._signal_show_reminder)
+            signal.signal(signal.SIGTERM, self._signal_shutdown)
+            signal.signal(signal.SIGUSR2, self._signal_dump_trace)
+    
+    @property
+    def should_run(self):
+        """False once shutdown has been requested"""
+        return not self._stopping.is_set()
+    
+    @should_run.setter
+    def should_run(self, value):
+        if value:
+            self._stopping.clear()
+        else:
+            self._stopping.set()
     
     @abc.abstractmethod
     def show_notification(self, title, message, timeout=None):
@@ -31,77 +136,469 @@ class BaseReminder(abc.ABC):
     
     def show_reminder(self):
         """Show eye break reminder notification"""
-        if self.is_active:
-            return
-        
-        self.is_active = True
-        self.show_notification(
-            "👁️ Eye Break Time!",
-            "Look at something 20 feet away for 20 seconds (20-20-20 rule)",
-            timeout=30
-        )
-        
-        # Reset active state after timeout
-        threading.Timer(30.0, self._reset_active).start()
+        with tracer.span("show_reminder") as span:
+            if self.is_active:
+                span.set(outcome="missed")
+                self._record("missed")
+                return
+            
+            self.is_active = True
+            self._shown_at = self.clock.wall()
+            self._record("shown")
+            span.set(outcome="shown")
+            self.show_notification(self.title, self.message, timeout=30)
+            
+            # Reset active state after timeout
+            self.scheduler.cancel(self._reset_event)
+            self._reset_event = self.scheduler.schedule(30.0, self._reset_active, name="reset")
+            self._checkpoint()
+    
+    def _record(self, kind):
+        """Count and log an event, record it to history, publish it and queue its hooks"""
+        REMINDER_EVENTS[kind].inc()
+        log.debug("Reminder %s", kind, extra={"event": kind, "profile": self.name})
+        if self.history is not None:
+            self.history.record(kind, self.name)
+        now = self.clock.wall()
+        if self.sinks is not None:
+            self.sinks.publish(kind, self.name, now)
+        self.hooks.fire(kind, self.name, now)
     
     def _reset_active(self):
         """Reset the active state"""
+        tracer.instant("reset", profile=self.name)
         self.is_active = False
+        self._checkpoint()
+    
+    def _schedule_interval(self, delay=None):
+        """Start a fresh interval (or a custom delay) from now"""
+        now = self.scheduler.clock()
+        self.timer.period = self.interval_minutes * 60
+        self.timer.reset(now, delay)
+        self._arm_interval(now)
+    
+    def _arm_interval(self, now):
+        """Schedule the next interval wakeup from the timer's absolute deadline"""
+        if self.calendar is not None:
+            self._fit_calendar(now)
+        self.scheduler.cancel(self._interval_event)
+        self._interval_event = self.scheduler.schedule_at(
+            self.timer.wake_at(now), self._on_interval_wake, name="interval"
+        )
+        self._checkpoint()
+    
+    def state_entry(self):
+        """The schedule as wall-clock times, for the state file"""
+        now = self.scheduler.clock()
+        wall = self.clock.wall()
+        if self.timer.paused is not None:
+            # Picked up by the next process as if the user were back
+            left = self.timer.paused
+        elif _pending(self._interval_event):
+            left = self.timer.deadline - now
+        else:
+            left = None
+        return {
+            # Rounded so re-arming for a resume check doesn't look like a change
+            "next": round(wall + left, 1) if left is not None else None,
+            "active": self.is_active,
+            "shown_at": self._shown_at,
+        }
+    
+    def _checkpoint(self):
+        """Save the schedule if it is persisted; the writer skips unchanged state"""
+        if self.state is not None:
+            self.state.save(self.name, self.state_entry())
+    
+    def _resume(self):
+        """Carry on from the saved schedule, or start a fresh interval without one"""
+        entry = self.state.get(self.name) if self.state is not None else None
+        if entry is None:
+            self._schedule_interval()
+            return
+        try:
+            self.restore(entry)
+        except (KeyError, TypeError, ValueError) as e:
+            log.warning(f"Saved schedule not used ({e!r}), starting a fresh interval")
+            self._schedule_interval()
+    
+    def restore(self, entry):
+        """Apply a state_entry() saved by an earlier process"""
+        now = self.scheduler.clock()
+        wall = self.clock.wall()
+        self.timer.period = self.interval_minutes * 60
+        if entry["next"] is None:
+            self.timer.reset(now)
+        else:
+            self.timer.resume(now, float(entry["next"]) - wall)
+        shown_at = entry.get("shown_at")
+        # A reminder still on screen keeps blocking repeats for the rest of its 30s
+        if entry.get("active") and shown_at is not None and 0 <= wall - shown_at < 30:
+            self._shown_at = float(shown_at)
+            self._restore_active(30 - (wall - self._shown_at))
+        self._restore_extra(entry, wall)
+        self._arm_interval(now)
+    
+    def _restore_active(self, remaining):
+        self.is_active = True
+        self._reset_event = self.scheduler.schedule(remaining, self._reset_active, name="reset")
+    
+    def _restore_extra(self, entry, wall):
+        """Restore what a subclass adds to state_entry()"""
+    
+    def on_idle(self, away, since):
+        """Idle monitor callback: hold the countdown while nobody is at the machine
+        
+        The interval is paused from the user's last input and resumed from
+        their first sign of activity, so time away neither counts towards
+        the next reminder nor lets reminders pile up on an empty desk.
+        """
+        now = self.scheduler.clock()
+        if away:
+            if self.timer.paused is not None or self.timer.deadline is None:
+                return
+            tracer.instant("pause", profile=self.name)
+            self.scheduler.cancel(self._interval_event)
+            self.timer.pause(now, since)
+            self._pause_extra(now, since)
+            self._checkpoint()
+        elif self.timer.paused is not None:
+            tracer.instant("unpause", profile=self.name)
+            self.timer.unpause(now, since)
+            self._unpause_extra(now, since)
+            self._arm_interval(now)
+    
+    def _pause_extra(self, now, since):
+        """Hold whatever else a subclass schedules towards a reminder"""
+    
+    def _unpause_extra(self, now, since):
+        """Restart what _pause_extra() held"""
+    
+    def _start_idle(self):
+        """Follow the idle monitor, if any, on this reminder's scheduler"""
+        if self.idle is not None:
+            self.idle.subscribe(self.on_idle)
+            self.idle.start(self.scheduler)
+    
+    def _fit_calendar(self, now):
+        """Move an interval deadline outside active hours into the next window
+        
+        The wakeup goes straight to the next window, so nothing runs through
+        nights and weekends beyond the timer's resume checks.
+        """
+        wall = self.clock.wall()
+        deadline = wall + self.timer.deadline - now
+        fitted = self.calendar.fit(deadline, self.timer.period)
+        if fitted != deadline:
+            self.timer.deadline = now + fitted - wall
+    
+    def _on_interval_wake(self):
+        """Interval wakeup - re-arm, then show a reminder if one is due"""
+        # A wakeup already taken off the queue when the countdown was paused
+        if not self.should_run or self.timer.paused is not None:
+            return
+        TIMER_WAKEUPS.inc()
+        with tracer.span("timer.wake", profile=self.name) as span:
+            now = self.scheduler.clock()
+            fired, suspends = self.timer.jitter.count, self.timer.suspends
+            due = self.timer.check(now)
+            if self.timer.jitter.count != fired:
+                TIMER_LATENESS.observe(self.timer.jitter.last)
+                span.set(late_ms=self.timer.jitter.last * 1000)
+            if self.timer.suspends != suspends:
+                TIMER_SUSPENDS.inc()
+                span.set(suspended=True)
+            if due and self.calendar is not None and not self.calendar.active(self.clock.wall()):
+                due = False  # Resumed from a suspend outside active hours
+            span.set(due=due)
+            self._arm_interval(now)
+            if due:
+                self._on_interval()
+    
+    def _on_interval(self):
+        """Interval deadline reached - show reminder"""
+        self._scheduled_show()
+    
+    def _scheduled_show(self):
+        """Show a reminder from a schedule, unless the show gate drops it"""
+        # show_reminder skips the notification if one is already active
+        if self._admit("scheduled"):
+            self.show_reminder()
+    
+    def _admit(self, source):
+        """Pass a show request through the show gate"""
+        with tracer.span("show_gate", source=source) as span:
+            admitted = self.show_gate.admit(self.clock())
+            span.set(admitted=admitted)
+        return admitted
     
     def _signal_show_reminder(self, signum, frame):
         """Signal handler for SIGUSR1 - show immediate reminder"""
-        print("Received signal to show reminder")
-        # Force reset active state and show reminder
-        self.is_active = False
+        SIGNALS["SIGUSR1"].inc()
+        tracer.instant("SIGUSR1", "signal")
+        if self.force_show():
+            log.info("Received signal to show reminder")
+    
+    def force_show(self):
+        """Reset active state and show a reminder immediately
+        
+        Returns False if the request was coalesced with a reminder just
+        shown or rate limited.
+        """
+        if not self._admit("forced"):
+            return False
+        self._clear_active()
         self.show_reminder()
+        return True
+    
+    def _clear_active(self):
+        """Forget any reminder still on screen so a new one can be shown"""
+        self.is_active = False
     
     def _signal_shutdown(self, signum, frame):
         """Signal handler for SIGTERM - graceful shutdown"""
-        print("Received shutdown signal")
+        SIGNALS["SIGTERM"].inc()
+        tracer.instant("SIGTERM", "signal")
+        log.info("Received shutdown signal")
         self.should_run = False
     
-    def _create_pidfile(self):
-        """Create pidfile with current process ID"""
+    def _signal_dump_trace(self, signum, frame):
+        """Signal handler for SIGUSR2 - write the trace ring to a file"""
+        dump_trace()
+    
+    def postpone(self, minutes=None):
+        """Push the next reminder out to minutes from now (default: one interval)"""
+        if minutes is None:
+            minutes = self.interval_minutes
+        self._schedule_interval(minutes * 60)
+    
+    def reload(self):
+        """Re-read the config file, or restart the interval countdown without one"""
+        if self.config_path is not None:
+            self.reload_config()
+        else:
+            self._schedule_interval()
+    
+    def apply_config(self, config):
+        """Switch to config's settings, rolling back if any can't be applied"""
+        previous = self.config
+        try:
+            self._apply_config(config)
+        except Exception:
+            if previous is not None:
+                self._apply_config(previous)
+            raise
+        self.config = config
+    
+    def _apply_config(self, config):
+        now = self.scheduler.clock()
+        self.interval_minutes = config.interval_minutes
+        # Keeps the time already spent in the current interval
+        self.timer.retime(now, config.interval_minutes * 60)
+        self.timer.suspend_policy = config.on_resume
+        self.calendar = config.calendar
+        self.hooks.configure(config.hooks)
+        self.title = config.title or type(self).title
+        self.message = config.message or type(self).message
+        if _pending(self._interval_event):
+            self._arm_interval(now)
+    
+    def watch_config(self, path):
+        """Reload the config file whenever it changes on disk"""
+        from .watch import FileWatcher
+        self.config_path = path
+        self.config_watcher = FileWatcher(path, self._config_changed)
+    
+    def _config_changed(self):
+        """Watcher thread: apply the new config on the scheduler, between events"""
+        self.scheduler.schedule(0, self.reload_config, name="config")
+    
+    def reload_config(self):
+        """Apply the config file, keeping the current settings if it is invalid"""
+        from .config import RESTART_KEYS, load_config
         try:
-            with open(self.pidfile, "w") as f:
-                f.write(str(os.getpid()))
-            # Register cleanup on exit
-            atexit.register(self._cleanup_pidfile)
+            config = load_config(self.config_path)
+        except ValueError as e:
+            self.config_error = str(e)
+            log.warning(f"Config not applied, keeping previous settings: {e}")
+            return False
+        if self.config is not None:
+            for key in RESTART_KEYS:
+                if getattr(config, key) != getattr(self.config, key):
+                    log.info(f"Config: {key} change takes effect after a restart")
+                    setattr(config, key, getattr(self.config, key))
+        try:
+            self.apply_config(config)
+        except Exception as e:
+            self.config_error = f"{self.config_path}: {e}"
+            log.warning(f"Config not applied, keeping previous settings: {e}")
+            return False
+        self.config_error = None
+        log.info(f"Config reloaded from {self.config_path}")
+        return True
+    
+    def next_fire_time(self):
+        """Wall-clock time of the next pending reminder, or None"""
+        deadlines = self._reminder_deadlines()
+        if not deadlines:
+            return None
+        return self.clock.wall() + (min(deadlines) - self.scheduler.clock())
+    
+    def _reminder_deadlines(self):
+        """Monotonic deadlines of pending events that lead to a reminder"""
+        # The interval event may be an earlier resume check; the timer
+        # holds the actual reminder deadline
+        if _pending(self._interval_event):
+            return [self.timer.deadline]
+        return []
+    
+    def status(self):
+        """Structured snapshot of the daemon state"""
+        return {
+            "pid": os.getpid(),
+            "running": self.should_run,
+            "uptime": self.clock.wall() - self.started_at,
+            "interval_minutes": self.interval_minutes,
+            "active": self.is_active,
+            "next_fire_time": self.next_fire_time(),
+            "pending_events": len(self.scheduler),
+            "jitter": self.timer.jitter.as_dict(),
+            "suspends": self.timer.suspends,
+            "paused": self.timer.paused is not None,
+            "idle": self.idle.status() if self.idle is not None else None,
+            "dispatch": dict(self.dispatcher.stats) if self.dispatcher else None,
+            "shows": dict(self.show_gate.stats),
+            "schedule": str(self.calendar) if self.calendar is not None else None,
+            "hooks": dict(self.hooks.stats),
+            "sinks": self.sinks.stats() if self.sinks is not None else None,
+            "config": self.config_path,
+            "config_error": self.config_error,
+            "supervisor": self.supervisor,
+        }
+    
+    def handle_control(self, request):
+        """Handle a control-socket request and return the reply fields"""
+        cmd = request["cmd"]
+        if cmd == "show":
+            self.force_show()
+        elif cmd == "stop":
+            self.should_run = False
+        elif cmd == "snooze":
+            self.postpone(_validate_minutes(request.get("minutes")))
+        elif cmd == "reload":
+            self.reload()
+        elif cmd == "next-fire-time":
+            return {"next_fire_time": self.next_fire_time()}
+        elif cmd == "metrics":
+            return {"metrics": metrics.render()}
+        elif cmd == "trace":
+            return {"path": tracer.dump(request.get("path"))}
+        return self.status()
+    
+    def _start_control(self):
+        """Serve the control socket, exiting if another daemon holds it"""
+        if not CONTROL_SUPPORTED:
+            log.warning("Control socket not supported on this platform")
+            return
+        self.control = ControlServer(self.handle_control)
+        try:
+            self.control.bind()
+        except AlreadyRunningError as e:
+            log.error(str(e))
+            sys.exit(1)
         except OSError as e:
-            print(f"Warning: Could not create pidfile {self.pidfile}: {e}")
+            log.warning(f"Could not create control socket {self.control.path}: {e}")
+            self.control = None
+            return
+        self.control.start()
+        atexit.register(self._stop_control)
+    
+    def _stop_control(self):
+        """Close the control socket"""
+        if self.control is not None:
+            self.control.close()
+            self.control = None
     
-    def _cleanup_pidfile(self):
-        """Remove pidfile"""
+    def _start_sinks(self):
+        """Start event subscribers, carrying on without them if the socket can't be bound"""
+        if self.sinks is None:
+            return
         try:
-            os.unlink(self.pidfile)
-        except OSError:
-            pass  # File might already be gone
+            self.sinks.start()
+        except OSError as e:
+            log.warning(f"Could not create event socket {self.sinks.path}: {e}")
+            self.sinks = None
     
-    def run(self):
-        """Main reminder loop"""
-        print("Eye Break Reminder started!")
-        print(f"Will remind you every {self.interval_minutes} minutes.")
-        print("Press Ctrl+C to quit.")
+    def _serve(self):
+        """Start scheduling and block until shutdown"""
+        self._start_control()
+        self._start_sinks()
+        if self.state is not None:
+            self.state.start()
+        self.scheduler.start()
+        self._resume()
+        self._start_idle()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.start(self.scheduler)
+        if self.config_watcher is not None:
+            self.config_watcher.start()
         
         try:
-            while self.should_run:
-                time.sleep(self.interval_minutes * 60)
-                if self.should_run and not self.is_active:
-                    self.show_reminder()
+            # No polling: signals and control commands wake this directly
+            self._stopping.wait()
         except KeyboardInterrupt:
-            print("\nShutting down...")
+            log.info("Shutting down...")
             self.should_run = False
+        finally:
+            now = self.clock.wall()
+            self.hooks.fire("shutdown", self.name, now)
+            if self.sinks is not None:
+                self.sinks.publish("shutdown", self.name, now)
+            if self.config_watcher is not None:
+                self.config_watcher.stop()
+            # Bounded so a hung backend call can't block shutdown
+            self.scheduler.stop(timeout=2)
+            if self.idle is not None:
+                self.idle.stop()
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.stop()
+            self.scheduler.clear()
+            if self.dispatcher is not None:
+                self.dispatcher.stop(timeout=2)
+            if self.history is not None:
+                self.history.close()
+            if self.sinks is not None:
+                self.sinks.close()
+            if self.state is not None:
+                # Pending deadlines stay saved for the next start
+                self.state.close()
+            # Give shutdown hooks a moment, bounded like the dispatcher
+            self.hooks.stop(timeout=2)
+            self._stop_control()
+    
+    def run(self):
+        """Main reminder loop"""
+        log.info("Eye Break Reminder started!")
+        log.info(f"Will remind you every {self.interval_minutes} minutes.")
+        log.info("Press Ctrl+C to quit.")
+        self._serve()
 
 
 class AdvancedReminder(BaseReminder):
     """Advanced reminder with snooze functionality"""
     
-    def __init__(self, interval_minutes=20, snooze_minutes=5):
-        super().__init__(interval_minutes)
+    message = "Look at something 20 feet away for 20 seconds"
+    
+    def __init__(self, interval_minutes=20, snooze_minutes=5, **kwargs):
+        super().__init__(interval_minutes, **kwargs)
         self.snooze_minutes = snooze_minutes
         self.is_reminder_active = False
+        self._snooze_event = None
+        # Time a snooze had left when the user went away
+        self._snooze_left = None
+        self._acknowledge_event = None
         
-        print(f"Snooze duration: {snooze_minutes} minutes")
+        log.info(f"Snooze duration: {snooze_minutes} minutes")
     
     @abc.abstractmethod
     def show_reminder_with_actions(self, title, message, actions):
@@ -110,46 +607,140 @@ class AdvancedReminder(BaseReminder):
     
     def show_reminder(self):
         """Show advanced reminder with snooze option"""
-        if self.is_reminder_active:
-            return
-            
-        self.is_reminder_active = True
-        self.show_reminder_with_actions(
-            "👁️ Eye Break Time!",
-            "Look at something 20 feet away for 20 seconds",
-            ["Take Break", "Snooze 5min"]
-        )
+        with tracer.span("show_reminder") as span:
+            if self.is_reminder_active:
+                span.set(outcome="missed")
+                self._record("missed")
+                return
+                
+            self.is_reminder_active = True
+            self._shown_at = self.clock.wall()
+            self._record("shown")
+            span.set(outcome="shown")
+            self.show_reminder_with_actions(
+                self.title, self.message, ["Take Break", f"Snooze {self.snooze_minutes}min"]
+            )
+            self._checkpoint()
     
     def handle_reminder_action(self, action):
         """Handle user action from reminder"""
+        with tracer.span("action", action=action, profile=self.name):
+            self.is_reminder_active = False
+            self.scheduler.cancel(self._acknowledge_event)
+            
+            if action == "snooze":
+                self._record("snoozed")
+                self.snooze()
+            else:
+                self._record("acknowledged")
+                log.info("Break acknowledged")
+            self._checkpoint()
+    
+    def snooze(self, minutes=None):
+        """Show the reminder again after minutes (default: snooze duration)"""
+        if minutes is None:
+            minutes = self.snooze_minutes
+        log.info(f"Reminder snoozed for {minutes} minutes")
+        self._snooze_left = None
+        self.scheduler.cancel(self._snooze_event)
+        self._snooze_event = self.scheduler.schedule(
+            minutes * 60, self._scheduled_show, name="snooze"
+        )
+        self._checkpoint()
+    
+    def postpone(self, minutes=None):
+        """Push the next reminder out to minutes from now (default: snooze duration)"""
+        if minutes is None:
+            minutes = self.snooze_minutes
+        # A pending snooze would otherwise fire before the postponed reminder
+        self._snooze_left = None
+        self.scheduler.cancel(self._snooze_event)
+        super().postpone(minutes)
+    
+    def _clear_active(self):
+        super()._clear_active()
         self.is_reminder_active = False
-        
-        if action == "snooze":
-            print(f"Reminder snoozed for {self.snooze_minutes} minutes")
-            threading.Timer(self.snooze_minutes * 60, self.show_reminder).start()
+    
+    def state_entry(self):
+        entry = super().state_entry()
+        entry["active"] = self.is_reminder_active
+        entry["snooze"] = None
+        if self._snooze_left is not None:
+            entry["snooze"] = round(self.clock.wall() + self._snooze_left, 1)
+        elif _pending(self._snooze_event):
+            delay = self._snooze_event.deadline - self.scheduler.clock()
+            entry["snooze"] = round(self.clock.wall() + delay, 1)
+        return entry
+    
+    def _restore_active(self, remaining):
+        # The notification's buttons died with the old process
+        self.is_reminder_active = True
+        self.schedule_auto_acknowledge(remaining)
+    
+    def _restore_extra(self, entry, wall):
+        snooze = entry.get("snooze")
+        if snooze is None:
+            return
+        delay = float(snooze) - wall
+        # A snooze that ran out while stopped still shows, unless it is over an interval stale
+        if delay > -self.timer.period:
+            self._snooze_event = self.scheduler.schedule(
+                max(delay, 0.0), self._scheduled_show, name="snooze"
+            )
+    
+    def _pause_extra(self, now, since):
+        # A snooze running out on an empty desk would show to nobody
+        self._snooze_left = None
+        if _pending(self._snooze_event):
+            self._snooze_left = max(self._snooze_event.deadline - min(since, now), 0.0)
+            self.scheduler.cancel(self._snooze_event)
+    
+    def _unpause_extra(self, now, since):
+        if self._snooze_left is not None:
+            delay = max(min(since, now) + self._snooze_left - now, 0.0)
+            self._snooze_left = None
+            self.scheduler.cancel(self._snooze_event)
+            self._snooze_event = self.scheduler.schedule(
+                delay, self._scheduled_show, name="snooze"
+            )
+    
+    def _reminder_deadlines(self):
+        """Monotonic deadlines of pending events that lead to a reminder"""
+        deadlines = super()._reminder_deadlines()
+        if _pending(self._snooze_event):
+            deadlines.append(self._snooze_event.deadline)
+        return deadlines
+    
+    def _apply_config(self, config):
+        super()._apply_config(config)
+        self.snooze_minutes = config.snooze_minutes
+    
+    def status(self):
+        """Structured snapshot of the daemon state"""
+        status = super().status()
+        status["snooze_minutes"] = self.snooze_minutes
+        status["active"] = self.is_reminder_active
+        return status
+    
+    def _on_action_result(self, action):
+        """Dispatch callback: apply the chosen action, or auto-acknowledge if none"""
+        if action:
+            self.handle_reminder_action(action)
         else:
-            print("Break acknowledged")
+            self.schedule_auto_acknowledge(30.0)
+    
+    def schedule_auto_acknowledge(self, delay=30.0):
+        """Acknowledge the reminder after delay seconds for backends without actions"""
+        self.scheduler.cancel(self._acknowledge_event)
+        self._acknowledge_event = self.scheduler.schedule(
+            delay, self.handle_reminder_action, "acknowledged", name="auto-acknowledge"
+        )
     
     def run(self):
         """Main reminder loop for advanced reminder"""
-        print("Advanced Eye Break Reminder started!")
-        print(f"Will remind you every {self.interval_minutes} minutes to take an eye break.")
-        print("Press Ctrl+C to quit.")
-        
-        # Start timer in background thread
-        timer_thread = threading.Thread(target=self._timer_loop, daemon=True)
-        timer_thread.start()
+        log.info("Advanced Eye Break Reminder started!")
+        log.info(f"Will remind you every {self.interval_minutes} minutes to take an eye break.")
+        log.info("Press Ctrl+C to quit.")
         
-        try:
-            while self.should_run:
-                time.sleep(1)
-        except KeyboardInterrupt:
-            print("\nShutting down Eye Break Reminder...")
-            self.should_run = False
-    
-    def _timer_loop(self):
-        """Background timer loop"""
-        while self.should_run:
-            time.sleep(self.interval_minutes * 60)
-            if self.should_run:
-                self.show_reminder()
\ No newline at end of file
+        # All deadlines are serviced by the scheduler thread
+        self._serve()
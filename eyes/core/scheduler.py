@@ -0,0 +1,189 @@
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+
+from .trace import tracer
+
+log = logging.getLogger(__name__)
+
+
+class ScheduledEvent:
+    """Handle for a pending deadline owned by a Scheduler"""
+
+    __slots__ = ("deadline", "seq", "callback", "args", "name", "cancelled", "fired")
+
+    def __init__(self, deadline, seq, callback, args, name):
+        self.deadline = deadline
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+        self.name = name
+        self.cancelled = False
+        self.fired = False
+
+    def __lt__(self, other):
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+    def __repr__(self):
+        state = "cancelled" if self.cancelled else "fired" if self.fired else "pending"
+        return f"<ScheduledEvent {self.name or self.callback!r} at {self.deadline:.3f} {state}>"
+
+
+class Scheduler:
+    """Single-thread scheduler backed by a monotonic-clock priority queue
+
+    Every pending deadline (intervals, snoozes, resets, auto-acknowledge)
+    lives in one heap serviced by one worker thread, so the daemon's
+    thread count stays fixed however many events are scheduled.
+
+    With a non-zero slack, deadlines are rounded up to a multiple of slack
+    seconds so events that fall close together run in a single wakeup.
+    """
+
+    def __init__(self, clock=time.monotonic, slack=0.0):
+        self.clock = clock
+        self.slack = slack
+        self.wakeups = 0
+        self._heap = []
+        self._counter = itertools.count()
+        self._cancelled = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def __len__(self):
+        with self._cond:
+            return len(self._heap) - self._cancelled
+
+    def schedule(self, delay, callback, *args, name=None):
+        """Run callback(*args) after delay seconds"""
+        return self.schedule_at(self.clock() + delay, callback, *args, name=name)
+
+    def schedule_at(self, deadline, callback, *args, name=None):
+        """Run callback(*args) once the clock reaches deadline"""
+        if self.slack:
+            deadline = math.ceil(deadline / self.slack) * self.slack
+        event = ScheduledEvent(deadline, next(self._counter), callback, args, name)
+        with self._cond:
+            heapq.heappush(self._heap, event)
+            # Only wake the worker if the new event is now the earliest
+            if self._heap[0] is event:
+                self._cond.notify()
+        return event
+
+    def cancel(self, event):
+        """Cancel a pending event; returns False if it already ran or was cancelled"""
+        if event is None:
+            return False
+        with self._cond:
+            if event.cancelled or event.fired:
+                return False
+            event.cancelled = True
+            self._cancelled += 1
+            self._compact()
+            return True
+
+    def reschedule(self, event, delay):
+        """Cancel event and schedule the same callback delay seconds from now"""
+        self.cancel(event)
+        return self.schedule(delay, event.callback, *event.args, name=event.name)
+
+    def next_deadline(self):
+        """Return the earliest pending deadline, or None if nothing is scheduled"""
+        with self._cond:
+            self._drop_cancelled_head()
+            return self._heap[0].deadline if self._heap else None
+
+    def run_pending(self):
+        """Run every event whose deadline has passed; returns the number run"""
+        ran = 0
+        due = self._pop_due()
+        if due:
+            self.wakeups += 1
+        for event in due:
+            event.callback(*event.args)
+            ran += 1
+        return ran
+
+    def start(self):
+        """Start the worker thread (idempotent)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._worker, name="eyes-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the worker thread; pending events are kept"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def clear(self):
+        """Drop every pending event"""
+        with self._cond:
+            for event in self._heap:
+                event.cancelled = True
+            self._heap.clear()
+            self._cancelled = 0
+
+    def _worker(self):
+        """Worker loop: sleep until the earliest deadline, then run due events"""
+        while True:
+            with self._cond:
+                while self._running:
+                    self._drop_cancelled_head()
+                    if not self._heap:
+                        self._cond.wait()
+                        self.wakeups += 1
+                        continue
+                    delay = self._heap[0].deadline - self.clock()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                    self.wakeups += 1
+                if not self._running:
+                    return
+            for event in self._pop_due():
+                try:
+                    with tracer.span(event.name or "callback", "scheduler"):
+                        event.callback(*event.args)
+                except Exception as e:
+                    log.error(
+                f"Scheduled callback {event.name or event.callback!r} failed: {e}", exc_info=True
+            )
+
+    def _pop_due(self):
+        """Remove and return every live event whose deadline has passed"""
+        due = []
+        with self._cond:
+            now = self.clock()
+            while self._heap and self._heap[0].deadline <= now:
+                event = heapq.heappop(self._heap)
+                if event.cancelled:
+                    self._cancelled -= 1
+                else:
+                    event.fired = True
+                    due.append(event)
+        return due
+
+    def _drop_cancelled_head(self):
+        """Discard cancelled events sitting at the top of the heap"""
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def _compact(self):
+        """Rebuild the heap once cancelled entries make up most of it"""
+        self._drop_cancelled_head()
+        if self._cancelled > 64 and self._cancelled * 2 > len(self._heap):
+            self._heap = [event for event in self._heap if not event.cancelled]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
@@ -0,0 +1,401 @@
+import collections
+import errno
+import json
+import logging
+import os
+import selectors
+import socket
+import sys
+import threading
+
+from .control import SUPPORTED as UNIX_SUPPORTED, default_socket_path
+from .metrics import registry as metrics
+
+log = logging.getLogger(__name__)
+
+SINK_KINDS = ("stdout", "fifo", "socket")
+PUBLISHED = {
+    kind: metrics.counter("eyes_sink_events_total", "Reminder events queued for subscribers",
+                          sink=kind)
+    for kind in SINK_KINDS
+}
+DROPPED = {
+    kind: metrics.counter(
+        "eyes_sink_events_dropped_total",
+        "Events dropped because a subscriber fell behind or no FIFO reader was attached",
+        sink=kind,
+    )
+    for kind in SINK_KINDS
+}
+SUBSCRIBERS = metrics.gauge("eyes_sink_subscribers", "Subscribers connected to the event socket")
+
+
+def default_events_path():
+    """Event socket path, next to the control socket"""
+    base, ext = os.path.splitext(default_socket_path())
+    return f"{base}-events{ext}"
+
+
+def parse_sink(spec):
+    """(kind, path) for "stdout", "fifo:PATH", "socket" or "socket:PATH" """
+    kind, _, path = spec.partition(":")
+    if kind not in SINK_KINDS:
+        raise ValueError(f"unknown sink {spec!r}, expected stdout, fifo:PATH or socket[:PATH]")
+    if kind == "stdout" and path:
+        raise ValueError("the stdout sink takes no path")
+    if kind == "fifo" and not path:
+        raise ValueError("the fifo sink needs a path, e.g. fifo:/tmp/eyes.fifo")
+    if kind != "stdout" and not UNIX_SUPPORTED:
+        raise ValueError(f"{kind} sinks need Unix domain sockets and FIFOs")
+    if kind == "socket" and not path:
+        path = default_events_path()
+    return kind, path or None
+
+
+class Subscriber:
+    """One reader's bounded queue of encoded events
+
+    When the reader falls maxlen events behind, the oldest are dropped, so a
+    stuck reader costs a fixed amount of memory and never slows the others.
+    """
+
+    __slots__ = ("kind", "queue", "pending", "events", "dropped", "conn", "fd", "buffer")
+
+    def __init__(self, kind, maxlen, conn=None):
+        self.kind = kind
+        self.queue = collections.deque(maxlen=maxlen)
+        # Bytes taken off the queue but not yet written (at most one batch)
+        self.pending = b""
+        # Event kinds to send, None for all; a socket client can narrow it
+        self.events = None
+        self.dropped = 0
+        self.conn = conn
+        self.fd = None
+        self.buffer = b""
+
+    def offer(self, kind, line):
+        if self.events is not None and kind not in self.events:
+            return
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+            DROPPED[self.kind].inc()
+        self.queue.append(line)
+
+    def take(self):
+        """Bytes to write next: the unfinished batch, else everything queued
+
+        New events wait in the queue (dropping the oldest) until the batch
+        in flight is written, so a stuck reader's backlog stays bounded.
+        """
+        if not self.pending:
+            lines = []
+            while self.queue:
+                lines.append(self.queue.popleft())
+            self.pending = b"".join(lines)
+        return self.pending
+
+    def discard(self):
+        count = len(self.queue) + (1 if self.pending else 0)
+        self.queue.clear()
+        self.pending = b""
+        self.dropped += count
+        DROPPED[self.kind].inc(count)
+
+
+class Broadcaster:
+    """Fans reminder events out to local subscribers as JSON lines
+
+    Sinks are stdout, named FIFOs and a Unix socket any number of clients
+    can connect to (e.g. `socat - UNIX-CONNECT:PATH` in a tmux status
+    script). publish() only appends to each subscriber's bounded queue and
+    pokes the writer thread, which does all socket and FIFO I/O without
+    blocking; stdout gets a thread of its own since its blocking mode is
+    shared with the rest of the process. A socket client may send
+    {"events": [...]} to receive only some event kinds.
+    """
+
+    MAX_REQUEST = 4096
+
+    def __init__(self, maxlen=256):
+        self.maxlen = maxlen
+        self.fifos = []
+        self.clients = {}
+        self.stdout = None
+        self.path = None
+        self.sock = None
+        self.published = 0
+        self._lock = threading.Lock()
+        self._selector = None
+        self._wake_r = self._wake_w = None
+        self._thread = None
+        self._stdout_thread = None
+        self._stdout_ready = threading.Event()
+        self._stopping = False
+
+    def stats(self):
+        """Events published, subscribers attached and events dropped for them"""
+        with self._lock:
+            subscribers = list(self.clients.values())
+        subscribers += self.fifos
+        if self.stdout is not None:
+            subscribers.append(self.stdout)
+        return {
+            "published": self.published,
+            "subscribers": len(subscribers),
+            "dropped": sum(s.dropped for s in subscribers),
+        }
+
+    def add(self, kind, path=None):
+        """Add a sink as returned by parse_sink"""
+        if kind == "stdout":
+            self.stdout = Subscriber("stdout", self.maxlen)
+        elif kind == "fifo":
+            if not os.path.exists(path):
+                os.mkfifo(path, 0o600)
+            subscriber = Subscriber("fifo", self.maxlen)
+            subscriber.conn = path
+            self.fifos.append(subscriber)
+        else:
+            self.path = path
+        return self
+
+    def start(self):
+        """Open the event socket and start the writer threads"""
+        self._stopping = False
+        self._stdout_ready.clear()
+        if self.path is not None:
+            self._listen()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        if self.sock is not None:
+            self._selector.register(self.sock, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._serve, name="eyes-sinks", daemon=True)
+        self._thread.start()
+        if self.stdout is not None:
+            self._stdout_thread = threading.Thread(
+                target=self._serve_stdout, name="eyes-sinks-stdout", daemon=True
+            )
+            self._stdout_thread.start()
+
+    def _listen(self):
+        old_umask = os.umask(0o077)
+        try:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.bind(self.path)
+                sock.listen(128)
+            except OSError:
+                sock.close()
+                raise
+        finally:
+            os.umask(old_umask)
+        sock.setblocking(False)
+        self.sock = sock
+
+    def publish(self, event, profile=None, at=None, **fields):
+        """Queue an event for every subscriber; never blocks on a reader"""
+        message = dict({"event": event, "profile": profile, "time": at}, **fields)
+        line = (json.dumps(message, separators=(",", ":")) + "\n").encode()
+        self.published += 1
+        with self._lock:
+            clients = list(self.clients.values())
+        for subscriber in clients:
+            subscriber.offer(event, line)
+        for subscriber in self.fifos:
+            subscriber.offer(event, line)
+        if self.fifos:
+            PUBLISHED["fifo"].inc(len(self.fifos))
+        if clients:
+            PUBLISHED["socket"].inc(len(clients))
+        if self.stdout is not None:
+            self.stdout.offer(event, line)
+            PUBLISHED["stdout"].inc()
+            self._stdout_ready.set()
+        self._wake()
+
+    def close(self, timeout=1.0):
+        """Flush what the writers can in timeout, then close every sink"""
+        self._stopping = True
+        self._wake()
+        self._stdout_ready.set()
+        for thread in (self._thread, self._stdout_thread):
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout)
+        self._thread = self._stdout_thread = None
+
+    def _wake(self):
+        w = self._wake_w
+        if w is not None:
+            try:
+                w.send(b"x")
+            except OSError:  # Buffer full: the writer is already due to wake
+                pass
+
+    def _serve(self):
+        try:
+            while not self._stopping:
+                for key, mask in self._selector.select():
+                    target = key.fileobj
+                    if target is self._wake_r:
+                        self._drain_wake()
+                    elif target is self.sock:
+                        self._accept()
+                    elif mask & selectors.EVENT_READ and isinstance(target, socket.socket):
+                        self._read(target)
+                self._flush_all()
+            self._flush_all()
+        finally:
+            self._shutdown()
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            conn.setblocking(False)
+            with self._lock:
+                self.clients[conn] = Subscriber("socket", self.maxlen, conn)
+            SUBSCRIBERS.inc()
+            self._selector.register(conn, selectors.EVENT_READ, None)
+
+    def _read(self, conn):
+        subscriber = self.clients.get(conn)
+        if subscriber is None:
+            return
+        try:
+            data = conn.recv(self.MAX_REQUEST)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data or len(subscriber.buffer) + len(data) > self.MAX_REQUEST:
+            self._drop(subscriber)
+            return
+        subscriber.buffer += data
+        while b"\n" in subscriber.buffer:
+            line, subscriber.buffer = subscriber.buffer.split(b"\n", 1)
+            try:
+                request = json.loads(line)
+                events = request["events"]
+                if not (isinstance(events, list) and all(isinstance(e, str) for e in events)):
+                    raise ValueError
+            except (ValueError, KeyError, TypeError):
+                continue  # Only subscriptions are understood; ignore anything else
+            subscriber.events = frozenset(events)
+
+    def _flush_all(self):
+        for subscriber in list(self.clients.values()):
+            self._flush_socket(subscriber)
+        for subscriber in self.fifos:
+            self._flush_fifo(subscriber)
+
+    def _flush_socket(self, subscriber):
+        data = subscriber.take()
+        if not data:
+            return
+        try:
+            sent = subscriber.conn.send(data)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(subscriber)
+            return
+        subscriber.pending = data[sent:]
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if subscriber.pending else 0)
+        self._selector.modify(subscriber.conn, events, None)
+
+    def _flush_fifo(self, subscriber):
+        if not subscriber.queue and not subscriber.pending:
+            return
+        if subscriber.fd is None:
+            try:
+                subscriber.fd = os.open(subscriber.conn, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError as e:
+                if e.errno != errno.ENXIO:
+                    log.warning(f"Could not open event FIFO {subscriber.conn}: {e}")
+                subscriber.discard()  # Nobody is reading
+                return
+        data = subscriber.take()
+        try:
+            written = os.write(subscriber.fd, data)
+        except BlockingIOError:
+            written = 0
+        except OSError:  # Reader went away
+            self._close_fifo(subscriber)
+            subscriber.discard()
+            return
+        subscriber.pending = data[written:]
+        # Wait for a full FIFO to drain; its queue stays bounded meanwhile
+        waiting = subscriber.fd in self._selector.get_map()
+        if subscriber.pending and not waiting:
+            self._selector.register(subscriber.fd, selectors.EVENT_WRITE, None)
+        elif waiting and not subscriber.pending:
+            self._selector.unregister(subscriber.fd)
+
+    def _close_fifo(self, subscriber):
+        if subscriber.fd is not None:
+            if subscriber.fd in self._selector.get_map():
+                self._selector.unregister(subscriber.fd)
+            os.close(subscriber.fd)
+            subscriber.fd = None
+
+    def _drop(self, subscriber):
+        with self._lock:
+            self.clients.pop(subscriber.conn, None)
+        SUBSCRIBERS.dec()
+        self._selector.unregister(subscriber.conn)
+        subscriber.conn.close()
+
+    def _shutdown(self):
+        for subscriber in list(self.clients.values()):
+            self._drop(subscriber)
+        for subscriber in self.fifos:
+            self._close_fifo(subscriber)
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        self._selector.close()
+        w, self._wake_w = self._wake_w, None
+        w.close()
+        self._wake_r.close()
+
+    def _serve_stdout(self):
+        subscriber = self.stdout
+        out = sys.stdout.buffer if hasattr(sys.stdout, "buffer") else None
+        while True:
+            self._stdout_ready.wait()
+            self._stdout_ready.clear()
+            data = subscriber.take()
+            if data:
+                try:
+                    if out is not None:
+                        out.write(data)
+                        out.flush()
+                    else:
+                        sys.stdout.write(data.decode())
+                        sys.stdout.flush()
+                except (OSError, ValueError):  # Closed pipe or stream
+                    subscriber.discard()
+                    return
+                subscriber.pending = b""
+            if self._stopping and not subscriber.queue:
+                return
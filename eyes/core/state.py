@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import queue
+import threading
+
+log = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+
+def default_state_path():
+    """Location of the saved schedule state"""
+    state_home = os.environ.get("XDG_STATE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "state"
+    )
+    return os.path.join(state_home, "eyes", "state.json")
+
+
+def write_atomic(path, data):
+    """Replace path with data so a crash leaves either the old or the new file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class StateFile:
+    """Each profile's schedule (next deadline, snooze, active reminder) in one JSON file
+
+    save() stores an entry and pokes the writer thread through a
+    SimpleQueue, which is safe to use from signal handlers, so reminders
+    never wait on disk. The writer coalesces a burst of changes into one
+    write of the latest state and skips writes that change nothing. Times
+    are wall-clock, since monotonic deadlines mean nothing to the next
+    process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.writes = 0
+        self.errors = 0
+        self._written = None
+        self._requests = queue.SimpleQueue()
+        self._thread = None
+
+    def load(self):
+        """Read the saved entries; a missing or unreadable file means none"""
+        try:
+            with open(self.path, "rb") as f:
+                data = json.load(f)
+            if data.get("version") != STATE_VERSION or not isinstance(data.get("profiles"), dict):
+                raise ValueError("unrecognised layout")
+            self.entries = data["profiles"]
+        except FileNotFoundError:
+            self.entries = {}
+        except (OSError, ValueError, AttributeError) as e:
+            log.warning(f"Ignoring saved state {self.path}: {e}")
+            self.entries = {}
+        self._written = self._document()
+        return self
+
+    def get(self, name=None):
+        """The saved entry for a profile (None for a single reminder), if any"""
+        return self.entries.get(name or "")
+
+    def save(self, name, entry):
+        """Record a profile's new state; it is written shortly after, off this thread"""
+        self.entries[name or ""] = entry
+        self._requests.put(True)
+
+    def start(self):
+        """Start the writer thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="eyes-state", daemon=True)
+            self._thread.start()
+
+    def flush(self, timeout=None):
+        """Wait until everything saved so far is on disk"""
+        if self._thread is None:
+            self._write()
+            return True
+        done = threading.Event()
+        self._requests.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=2.0):
+        """Write the latest state and stop the writer"""
+        if self._thread is None:
+            self._write()
+            return
+        self._requests.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            requests = [self._requests.get()]
+            while True:
+                try:
+                    requests.append(self._requests.get_nowait())
+                except queue.Empty:
+                    break
+            self._write()
+            for request in requests:
+                if isinstance(request, threading.Event):
+                    request.set()
+            if None in requests:
+                return
+
+    def _document(self):
+        # dict() copies in one step, even while other threads save
+        return {"version": STATE_VERSION, "profiles": dict(self.entries)}
+
+    def _write(self):
+        document = self._document()
+        if document == self._written:
+            return
+        try:
+            write_atomic(self.path, json.dumps(document, sort_keys=True).encode())
+        except OSError as e:
+            self.errors += 1
+            log.warning(f"Could not save schedule state to {self.path}: {e}")
+            return
+        self._written = document
+        self.writes += 1
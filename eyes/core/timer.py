@@ -0,0 +1,182 @@
+import time
+
+# What to do when the machine was suspended across an interval:
+#   fire    - show a reminder as soon as the resume is noticed
+#   restart - count the suspend as a break and start a fresh interval
+#   skip    - drop the reminders missed while asleep and keep the original cadence
+SUSPEND_POLICIES = ("fire", "restart", "skip")
+
+
+class JitterStats:
+    """Running summary of how late interval firings were"""
+
+    __slots__ = ("count", "total", "max", "last")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, lateness):
+        self.count += 1
+        self.total += lateness
+        self.last = lateness
+        if lateness > self.max:
+            self.max = lateness
+
+    def as_dict(self):
+        """Jitter in milliseconds, for status replies"""
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "last_ms": round(self.last * 1000, 3),
+        }
+
+
+class IntervalTimer:
+    """Absolute-deadline interval tracking with suspend/resume detection
+
+    Each deadline is the previous deadline plus the period, never "now plus
+    the period", so time spent showing a reminder or a late wakeup does not
+    push later reminders back. The monotonic clock stops while the machine
+    is suspended and the wall clock does not; the difference between the
+    two since the last check is how long the machine slept.
+
+    The timer only does the bookkeeping: the owner schedules a wakeup at
+    wake_at() and calls check() when it runs. While paused (nobody at the
+    machine) it holds the time left instead of a deadline the owner waits for.
+    """
+
+    __slots__ = (
+        "period", "suspend_policy", "suspend_threshold", "resume_check", "wall_clock",
+        "deadline", "paused", "jitter", "suspends", "skipped", "_mono_ref", "_wall_ref",
+    )
+
+    def __init__(self, period, suspend_policy="fire", suspend_threshold=5.0,
+                 resume_check=60.0, wall_clock=time.time):
+        if suspend_policy not in SUSPEND_POLICIES:
+            raise ValueError(f"unknown suspend policy: {suspend_policy!r}")
+        self.period = period
+        self.suspend_policy = suspend_policy
+        self.suspend_threshold = suspend_threshold
+        # Longest wait between checks, so a resume is noticed promptly rather
+        # than when the pre-suspend deadline finally comes round
+        self.resume_check = resume_check
+        self.wall_clock = wall_clock
+        self.deadline = None
+        # Seconds left in the interval while paused, else None
+        self.paused = None
+        self.jitter = JitterStats()
+        self.suspends = 0
+        self.skipped = 0
+        self._mono_ref = None
+        self._wall_ref = None
+
+    def reset(self, now, delay=None):
+        """Start a fresh interval (or a custom delay) from now; returns the deadline"""
+        self.deadline = now + (self.period if delay is None else delay)
+        self.paused = None
+        self._sync(now)
+        return self.deadline
+
+    def pause(self, now, since=None):
+        """Stop the countdown as of since (default now), keeping the time left
+
+        since may be in the past, e.g. the user's last input, so the minutes
+        it took to notice they had gone don't count against the interval.
+        """
+        at = now if since is None else min(since, now)
+        self.paused = min(max(self.deadline - at, 0.0), self.period)
+        return self.paused
+
+    def unpause(self, now, since=None):
+        """Count down the time left again from since (default now); returns the deadline"""
+        at = now if since is None else min(since, now)
+        remaining, self.paused = self.paused, None
+        self.deadline = max(at + remaining, now)
+        self._sync(now)
+        return self.deadline
+
+    def resume(self, now, remaining):
+        """Continue an interval saved by an earlier process, remaining seconds from now
+
+        A deadline further out than one period (the clock was changed, or
+        the period shortened) is clamped to it. One that passed while no
+        process was running is handled like a suspend, by suspend_policy:
+        fire makes the reminder due now.
+        """
+        if remaining > 0:
+            return self.reset(now, min(remaining, self.period))
+        if self.suspend_policy == "fire":
+            return self.reset(now, 0.0)
+        if self.suspend_policy == "restart":
+            return self.reset(now)
+        overdue = -remaining
+        self.skipped += int(overdue // self.period) + 1
+        return self.reset(now, self.period - overdue % self.period)
+
+    def retime(self, now, period):
+        """Change the period, keeping the time already elapsed in this interval
+
+        The deadline moves by the change in period; if the new period has
+        already elapsed, the reminder is due now.
+        """
+        if self.deadline is not None:
+            self.deadline = max(self.deadline + period - self.period, now)
+        if self.paused is not None:
+            self.paused = max(self.paused + period - self.period, 0.0)
+        self.period = period
+
+    def wake_at(self, now):
+        """When the owner should next call check()"""
+        if self.resume_check is None:
+            return self.deadline
+        return min(self.deadline, now + self.resume_check)
+
+    def check(self, now):
+        """Advance the timer to now; returns True if a reminder is due"""
+        gap = self._suspend_gap(now)
+        if gap > self.suspend_threshold:
+            self.suspends += 1
+            return self._resumed(now, gap)
+        if now < self.deadline:
+            return False
+        self.jitter.record(now - self.deadline)
+        self.deadline += self.period
+        if self.deadline <= now:
+            # Stalled for more than a whole period; don't fire a burst to catch up
+            missed = int((now - self.deadline) // self.period) + 1
+            self.skipped += missed
+            self.deadline += missed * self.period
+        return True
+
+    def _resumed(self, now, gap):
+        if self.suspend_policy == "fire":
+            self.deadline = now + self.period
+            return True
+        if self.suspend_policy == "restart":
+            self.deadline = now + self.period
+            return False
+        # skip: the suspend counts against the current interval
+        overdue = gap - (self.deadline - now)
+        if overdue < 0:
+            self.deadline -= gap
+        else:
+            self.skipped += int(overdue // self.period) + 1
+            self.deadline = now + self.period - overdue % self.period
+        return False
+
+    def _suspend_gap(self, now):
+        """Wall time that passed without the monotonic clock moving"""
+        wall = self.wall_clock()
+        gap = (wall - self._wall_ref) - (now - self._mono_ref)
+        self._mono_ref = now
+        self._wall_ref = wall
+        return gap
+
+    def _sync(self, now):
+        self._mono_ref = now
+        self._wall_ref = self.wall_clock()
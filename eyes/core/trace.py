@@ -0,0 +1,151 @@
+import collections
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+def default_trace_path():
+    """Where a trace dump goes unless a path is given"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not (runtime_dir and os.path.isdir(runtime_dir)):
+        runtime_dir = tempfile.gettempdir()
+    return os.path.join(runtime_dir, f"eyes-trace-{os.getpid()}.json")
+
+
+class _NullSpan:
+    """What span() returns while tracing is off: enter, exit and set do nothing"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A timed section; recorded into the tracer's ring when it exits"""
+
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record("X", self.name, self.cat, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        """Attach results found inside the span (outcome, backend...)"""
+        self.args.update(args)
+
+
+class Tracer:
+    """Fixed-size ring buffer of spans, dumped as Chrome trace-event JSON
+
+    Off by default, when span() is an attribute check returning a shared
+    no-op span. Once enabled, each span costs two clock reads and a deque
+    append, which is atomic, so the scheduler, dispatch and backend threads
+    and signal handlers can all record without a lock. The oldest spans
+    are overwritten once the ring is full. Dumps load in chrome://tracing
+    and ui.perfetto.dev.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.recorded = 0
+        self.threads = {}
+        self._events = collections.deque(maxlen=1)
+        self._origin = time.perf_counter_ns()
+
+    def enable(self, capacity=10000):
+        """Start recording into a fresh ring of capacity spans"""
+        self._events = collections.deque(maxlen=capacity)
+        self.recorded = 0
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name, cat="reminder", **args):
+        """Context manager timing a section of work"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, cat, args)
+
+    def instant(self, name, cat="reminder", **args):
+        """Record a point in time, e.g. a signal arriving"""
+        if self.enabled:
+            self._record("i", name, cat, time.perf_counter_ns(), 0, args)
+
+    def _record(self, phase, name, cat, start, duration, args):
+        tid = threading.get_ident()
+        if tid not in self.threads:
+            self.threads[tid] = threading.current_thread().name
+        self._events.append((phase, name, cat, start, duration, tid, args))
+        self.recorded += 1
+
+    def events(self):
+        """Recorded spans, oldest first"""
+        # list() copies the deque in one step under the GIL
+        return list(self._events)
+
+    def chrome(self):
+        """The ring as a Chrome trace-event document"""
+        pid = os.getpid()
+        trace = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self.threads.items())
+        ]
+        events = self.events()
+        for phase, name, cat, start, duration, tid, args in events:
+            event = {
+                "name": name, "cat": cat, "ph": phase, "pid": pid, "tid": tid,
+                "ts": (start - self._origin) / 1000, "args": args,
+            }
+            if phase == "X":
+                event["dur"] = duration / 1000
+            else:
+                event["s"] = "t"
+            trace.append(event)
+        return {
+            "traceEvents": trace,
+            "displayTimeUnit": "ms",
+            "otherData": {"recorded": self.recorded, "overwritten": self.recorded - len(events)},
+        }
+
+    def dump(self, path=None):
+        """Write the ring to path (default: default_trace_path()) and return the path"""
+        if not self.enabled:
+            raise ValueError("tracing is off; start the daemon with --trace")
+        path = path or default_trace_path()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.chrome(), f, default=str)
+        os.replace(tmp, path)
+        return path
+
+
+# The process-wide tracer every component records into
+tracer = Tracer()
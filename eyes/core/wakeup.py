@@ -0,0 +1,63 @@
+import select
+import signal
+import socket
+import threading
+
+
+class Wakeup:
+    """A stop flag the main thread sleeps on until it is set
+
+    set() only writes a byte to a socket pair, so it is safe from signal
+    handlers (a threading.Event is not: the interrupted frame may hold its
+    lock) and from any thread. While the main thread waits, the pair is also
+    the signal wakeup fd, so any signal ends the select at once, wherever
+    the OS delivered it and on every platform. wait() has no timeout: the
+    process stays asleep until the flag is set.
+    """
+
+    def __init__(self):
+        self._set = False
+        # Only open while someone waits, so idle profiles cost no descriptors
+        self._r = self._w = None
+        self.wakeups = 0
+
+    def is_set(self):
+        return self._set
+
+    def set(self):
+        self._set = True
+        w = self._w
+        if w is not None:
+            try:
+                w.send(b"x")
+            except OSError:  # Buffer full (already woken) or just closed
+                pass
+
+    def clear(self):
+        self._set = False
+
+    def wait(self):
+        """Block until set; signal handlers run as their signals arrive"""
+        self._r, self._w = socket.socketpair()
+        self._r.setblocking(False)
+        self._w.setblocking(False)
+        previous = None
+        main = threading.current_thread() is threading.main_thread()
+        if main:
+            previous = signal.set_wakeup_fd(self._w.fileno(), warn_on_full_buffer=False)
+        try:
+            while not self._set:
+                select.select([self._r], [], [])
+                self.wakeups += 1
+                try:
+                    while self._r.recv(4096):
+                        pass
+                except OSError:
+                    pass
+        finally:
+            if main:
+                signal.set_wakeup_fd(previous)
+            r, w = self._r, self._w
+            self._r = self._w = None
+            r.close()
+            w.close()
@@ -0,0 +1,200 @@
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+
+log = logging.getLogger(__name__)
+
+# inotify(7) constants
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT = struct.Struct("iIII")
+
+
+def _signature(path):
+    """What changes when a file is written or replaced"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class FileWatcher:
+    """Calls callback() from a background thread when a file is written or replaced
+
+    The containing directory is watched, since editors often save by
+    writing a new file and renaming it over the old one. inotify (Linux) and
+    kqueue (macOS, BSD) block in the kernel until something changes, so an
+    idle watcher never wakes up; elsewhere the file's modification time is
+    checked every poll_interval seconds. A burst of events within debounce
+    seconds (write, then chmod, then rename) produces one callback.
+    """
+
+    def __init__(self, path, callback, debounce=0.1, poll_interval=2.0):
+        self.path = os.path.abspath(path)
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        if sys.platform.startswith("linux"):
+            self.method = "inotify"
+        elif hasattr(select, "kqueue"):
+            self.method = "kqueue"
+        else:
+            self.method = "poll"
+        self._signature = None
+        self._wake_r = self._wake_w = None
+        self._stopping = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+
+    def start(self, timeout=1.0):
+        """Start watching (the current contents count as already seen)
+
+        Returns once the kernel watch is in place, so a save straight after
+        start() is not missed.
+        """
+        self._signature = _signature(self.path)
+        self._stopping.clear()
+        self._ready.clear()
+        self._wake_r, self._wake_w = os.pipe()
+        run = getattr(self, f"_run_{self.method}")
+        self._thread = threading.Thread(
+            target=self._run, args=(run,), name="eyes-watch", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait(timeout)
+
+    def stop(self, timeout=1.0):
+        if self._thread is None:
+            return
+        self._stopping.set()
+        os.write(self._wake_w, b"x")
+        self._thread.join(timeout)
+        self._thread = None
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+
+    def _run(self, run):
+        try:
+            run()
+        except OSError as e:
+            if not self._stopping.is_set():
+                log.warning(f"Stopped watching {self.path}: {e}")
+        finally:
+            self._ready.set()
+
+    def _changed(self):
+        """Settle, then call back if the file really is different"""
+        if self._stopping.wait(self.debounce):
+            return
+        signature = _signature(self.path)
+        if signature is not None and signature != self._signature:
+            self._signature = signature
+            try:
+                self.callback()
+            except Exception as e:
+                log.warning(f"File change handler failed: {e}")
+
+    def _run_inotify(self):
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            directory, name = os.path.split(self.path)
+            mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY | IN_ATTRIB
+            if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, f"cannot watch {directory}: {os.strerror(errno)}")
+            name = os.fsencode(name)
+            self._ready.set()
+            while True:
+                ready = select.select([fd, self._wake_r], [], [])[0]
+                if self._wake_r in ready:
+                    return
+                if name in self._read_inotify(fd):
+                    self._changed()
+                    if self._stopping.is_set():
+                        return
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_inotify(fd):
+        """Names of the directory entries in the pending events"""
+        names = set()
+        try:
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            names.add(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+        return names
+
+    def _run_kqueue(self):
+        kq = select.kqueue()
+        directory = os.open(os.path.dirname(self.path), os.O_RDONLY)
+        watched = None
+        try:
+            changes = [
+                select.kevent(self._wake_r, select.KQ_FILTER_READ, select.KQ_EV_ADD),
+                # A directory "write" is an entry being created, removed or renamed
+                select.kevent(
+                    directory, select.KQ_FILTER_VNODE, select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+                    select.KQ_NOTE_WRITE,
+                ),
+            ]
+            while True:
+                if watched is None:
+                    watched = self._open_kqueue_file(changes)
+                if changes:
+                    kq.control(changes, 0)
+                    changes = []
+                    self._ready.set()
+                events = kq.control(None, 4)
+                if any(event.ident == self._wake_r for event in events):
+                    return
+                if any(event.fflags & (select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME)
+                       for event in events if event.ident == watched):
+                    os.close(watched)  # Replaced: follow the new file
+                    watched = None
+                self._changed()
+                if self._stopping.is_set():
+                    return
+        finally:
+            if watched is not None:
+                os.close(watched)
+            os.close(directory)
+            kq.close()
+
+    def _open_kqueue_file(self, changes):
+        """Watch the file itself for in-place writes, if it exists"""
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            return None
+        flags = (select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND | select.KQ_NOTE_ATTRIB
+                 | select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME)
+        changes.append(select.kevent(
+            fd, select.KQ_FILTER_VNODE, select.KQ_EV_ADD | select.KQ_EV_CLEAR, flags,
+        ))
+        return fd
+
+    def _run_poll(self):
+        self._ready.set()
+        while not self._stopping.wait(self.poll_interval):
+            if _signature(self.path) != self._signature:
+                self._changed()
@@ -0,0 +1,108 @@
+import gc
+import os
+import sys
+import threading
+
+# Resident set size the lean single-reminder daemon must stay under once
+# set up (checked by tests/test_memory.py). CPython 3.11 on Linux measures
+# about 14 MiB, most of which is the interpreter itself.
+RSS_BUDGET_BYTES = 24 * 1024 * 1024
+
+# Needed to parse arguments, read config and probe backends, never again
+SETUP_MODULES = (
+    "argparse", "gettext", "hashlib", "_hashlib", "_blake2", "importlib.util",
+    "tomllib", "tomllib._parser", "tomllib._re", "tomllib._types", "tomli",
+    "eyes.startup",
+)
+
+
+def release_setup_modules(modules=SETUP_MODULES):
+    """Drop setup-only modules so their code and data can be freed
+
+    Anything still referencing a module keeps it alive, and a later import
+    simply loads it again, so this is always safe. Returns the names dropped.
+    """
+    dropped = [name for name in modules if sys.modules.pop(name, None) is not None]
+    gc.collect()
+    return dropped
+
+
+def _module_files():
+    """Map source file paths to module names for the loaded modules"""
+    files = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if path:
+            files[os.path.abspath(path)] = name
+    return files
+
+
+def group_by_module(snapshot, limit=15):
+    """[(module, bytes, allocations)] for the biggest allocators in a tracemalloc snapshot"""
+    files = _module_files()
+    totals = {}
+    for stat in snapshot.statistics("filename"):
+        path = stat.traceback[0].filename
+        if path.startswith("<frozen importlib"):
+            name = "(code of newly imported modules)"
+        else:
+            name = files.get(os.path.abspath(path), path)
+        size, count = totals.get(name, (0, 0))
+        totals[name] = (size + stat.size, count + stat.count)
+    ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+    return [(name, size, count) for name, (size, count) in ranked[:limit]]
+
+
+def measure_daemon(create, limit=15):
+    """Set up a lean daemon with create() under tracemalloc and report its memory
+
+    create() must return the reminder without running it; its scheduler is started briefly so thread stacks are counted.
+    """
+    import tracemalloc
+
+    from .core.backends import registry
+    from .core.metrics import rss_bytes
+
+    registry.limit = 1
+    tracemalloc.start()
+    app = create()
+    app.scheduler.start()
+    release_setup_modules()
+    traced = tracemalloc.get_traced_memory()[0]
+    top = group_by_module(tracemalloc.take_snapshot(), limit)
+    # The traces themselves take megabytes; free them before reading RSS
+    tracemalloc.stop()
+    gc.collect()
+    report = {
+        "rss_bytes": rss_bytes(),
+        "budget_bytes": RSS_BUDGET_BYTES,
+        "traced_bytes": traced,
+        "modules": len(sys.modules),
+        "threads": threading.active_count(),
+        "top": [
+            {"module": name, "bytes": size, "allocations": count}
+            for name, size, count in top
+        ],
+    }
+    app.scheduler.stop(timeout=1)
+    if getattr(app, "dispatcher", None) is not None:
+        app.dispatcher.stop(timeout=1)
+    return report
+
+
+def print_memory_report(report):
+    """Print a measure_daemon() report"""
+    mib = 1024 * 1024
+    rss, budget = report["rss_bytes"], report["budget_bytes"]
+    print(f"Resident memory: {rss / mib:.1f} MiB (budget {budget / mib:.0f} MiB; "
+          f"tracing itself adds a few MiB)")
+    print(f"Python allocations during daemon setup: {report['traced_bytes'] / 1024:.0f} KiB")
+    print(f"Interpreter, C libraries and earlier imports: "
+          f"{max(rss - report['traced_bytes'], 0) / mib:.1f} MiB")
+    print(f"Modules loaded: {report['modules']}, threads: {report['threads']}")
+    print()
+    print(f"{'KiB':>8} {'allocs':>7}  module")
+    for entry in report["top"]:
+        print(f"{entry['bytes'] / 1024:>8.1f} {entry['allocations']:>7}  {entry['module']}")
+    if rss > budget:
+        print(f"\nOver budget by {(rss - budget) / mib:.1f} MiB")
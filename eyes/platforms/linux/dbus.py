@@ -0,0 +1,371 @@
+"""Minimal D-Bus client: just enough of the wire protocol for desktop notifications
+
+Speaks the binary protocol directly over the session bus socket (SASL
+EXTERNAL authentication, then length-prefixed messages), so neither
+libdbus, jeepney nor a notify-send process is needed.
+"""
+import logging
+import os
+import socket
+import struct
+import threading
+
+log = logging.getLogger(__name__)
+
+BUS_NAME = "org.freedesktop.DBus"
+BUS_PATH = "/org/freedesktop/DBus"
+
+# Message types
+METHOD_CALL, METHOD_RETURN, ERROR, SIGNAL = 1, 2, 3, 4
+
+# Header fields and the type of each field's value
+PATH, INTERFACE, MEMBER, ERROR_NAME, REPLY_SERIAL, DESTINATION, SENDER, SIGNATURE = range(1, 9)
+FIELD_TYPES = {
+    PATH: "o", INTERFACE: "s", MEMBER: "s", ERROR_NAME: "s",
+    REPLY_SERIAL: "u", DESTINATION: "s", SENDER: "s", SIGNATURE: "g",
+}
+
+# Fixed-size basic types: struct format and size (alignment is the size)
+_FIXED = {
+    "y": ("B", 1), "b": ("I", 4), "n": ("h", 2), "q": ("H", 2), "i": ("i", 4),
+    "u": ("I", 4), "x": ("q", 8), "t": ("Q", 8), "d": ("d", 8), "h": ("I", 4),
+}
+_ALIGN = {code: size for code, (_, size) in _FIXED.items()}
+_ALIGN.update({"s": 4, "o": 4, "g": 1, "a": 4, "v": 1, "(": 8, "{": 8})
+
+
+class DBusError(Exception):
+    """An error reply from the bus, or a connection that could not be used"""
+
+    def __init__(self, message, name=None):
+        super().__init__(message)
+        self.name = name
+
+
+def split_signature(signature):
+    """Split a signature into its complete types"""
+    types = []
+    start = 0
+    while start < len(signature):
+        end = _type_end(signature, start)
+        types.append(signature[start:end])
+        start = end
+    return types
+
+
+def _type_end(signature, index):
+    code = signature[index]
+    if code == "a":
+        return _type_end(signature, index + 1)
+    if code in "({":
+        close = ")" if code == "(" else "}"
+        index += 1
+        while signature[index] != close:
+            index = _type_end(signature, index)
+    return index + 1
+
+
+def _pad(buf, align):
+    buf.extend(b"\0" * (-len(buf) % align))
+
+
+def _marshal(buf, signature, value):
+    """Append value of type signature to buf (offsets relative to the message start)"""
+    code = signature[0]
+    _pad(buf, _ALIGN[code])
+    if code in _FIXED:
+        buf.extend(struct.pack("<" + _FIXED[code][0], value))
+    elif code in "so":
+        data = value.encode()
+        buf.extend(struct.pack("<I", len(data)) + data + b"\0")
+    elif code == "g":
+        data = value.encode()
+        buf.extend(bytes([len(data)]) + data + b"\0")
+    elif code == "v":
+        inner_signature, inner = value  # variants are (signature, value) pairs
+        _marshal(buf, "g", inner_signature)
+        _marshal(buf, inner_signature, inner)
+    elif code == "a":
+        item = signature[1:]
+        length_at = len(buf)
+        buf.extend(b"\0\0\0\0")
+        _pad(buf, _ALIGN[item[0]])
+        start = len(buf)
+        for element in (value.items() if item[0] == "{" else value):
+            _marshal(buf, item, element)
+        struct.pack_into("<I", buf, length_at, len(buf) - start)
+    elif code in "({":
+        for item, element in zip(split_signature(signature[1:-1]), value):
+            _marshal(buf, item, element)
+    else:
+        raise ValueError(f"unsupported D-Bus type: {signature}")
+
+
+def _unmarshal(data, offset, signature, endian):
+    """Read a value of type signature at offset; returns (value, new offset)"""
+    code = signature[0]
+    offset += -offset % _ALIGN[code]
+    if code in _FIXED:
+        fmt, size = _FIXED[code]
+        value = struct.unpack_from(endian + fmt, data, offset)[0]
+        return (bool(value) if code == "b" else value), offset + size
+    if code in "so":
+        (length,) = struct.unpack_from(endian + "I", data, offset)
+        offset += 4
+        return data[offset:offset + length].decode(), offset + length + 1
+    if code == "g":
+        length = data[offset]
+        offset += 1
+        return data[offset:offset + length].decode(), offset + length + 1
+    if code == "v":
+        inner_signature, offset = _unmarshal(data, offset, "g", endian)
+        return _unmarshal(data, offset, inner_signature, endian)
+    if code == "a":
+        (length,) = struct.unpack_from(endian + "I", data, offset)
+        item = signature[1:]
+        offset += 4
+        offset += -offset % _ALIGN[item[0]]
+        end = offset + length
+        items = []
+        while offset < end:
+            value, offset = _unmarshal(data, offset, item, endian)
+            items.append(value)
+        return (dict(items) if item[0] == "{" else items), offset
+    if code in "({":
+        values = []
+        for item in split_signature(signature[1:-1]):
+            value, offset = _unmarshal(data, offset, item, endian)
+            values.append(value)
+        return tuple(values), offset
+    raise ValueError(f"unsupported D-Bus type: {signature}")
+
+
+class Message:
+    """One D-Bus message: type, header fields and body values"""
+
+    __slots__ = ("type", "fields", "body", "flags", "serial")
+
+    def __init__(self, type, fields, body=(), flags=0, serial=0):
+        self.type = type
+        self.fields = fields
+        self.body = tuple(body)
+        self.flags = flags
+        self.serial = serial
+
+    @property
+    def member(self):
+        return self.fields.get(MEMBER)
+
+    def encode(self):
+        """Little-endian wire format"""
+        body = bytearray()
+        for item, value in zip(split_signature(self.fields.get(SIGNATURE, "")), self.body):
+            _marshal(body, item, value)
+        header = bytearray(b"l" + bytes([self.type, self.flags, 1]))
+        header.extend(struct.pack("<II", len(body), self.serial))
+        fields = [(code, (FIELD_TYPES[code], value)) for code, value in sorted(self.fields.items())]
+        _marshal(header, "a(yv)", fields)
+        _pad(header, 8)
+        return bytes(header + body)
+
+    @classmethod
+    def decode(cls, data):
+        endian = "<" if data[:1] == b"l" else ">"
+        body_length, serial = struct.unpack_from(endian + "II", data, 4)
+        fields, offset = _unmarshal(data, 12, "a(yv)", endian)
+        fields = dict(fields)
+        offset += -offset % 8
+        body = []
+        for item in split_signature(fields.get(SIGNATURE, "")):
+            value, offset = _unmarshal(data, offset, item, endian)
+            body.append(value)
+        return cls(data[1], fields, body, flags=data[2], serial=serial)
+
+
+def message_length(data):
+    """Total length of the message at the start of data, or None if the header is incomplete"""
+    if len(data) < 16:
+        return None
+    endian = "<" if data[:1] == b"l" else ">"
+    body_length, _, fields_length = struct.unpack_from(endian + "III", data, 4)
+    return 16 + fields_length + (-fields_length % 8) + body_length
+
+
+def session_bus_address():
+    """Address of the session bus from the environment"""
+    address = os.environ.get("DBUS_SESSION_BUS_ADDRESS")
+    if address:
+        return address
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return f"unix:path={runtime_dir}/bus"
+    raise DBusError("no session bus: DBUS_SESSION_BUS_ADDRESS is not set")
+
+
+def _unescape(value):
+    """Undo D-Bus address escaping (%XX bytes) without importing urllib"""
+    parts = value.split("%")
+    data = bytearray(parts[0].encode())
+    for part in parts[1:]:
+        data.append(int(part[:2], 16))
+        data.extend(part[2:].encode())
+    return data.decode()
+
+
+def _open_socket(address, timeout):
+    """Connect to the first reachable unix: transport in a bus address"""
+    error = None
+    for candidate in address.split(";"):
+        transport, _, params = candidate.partition(":")
+        options = dict(param.split("=", 1) for param in params.split(",") if "=" in param)
+        if transport != "unix":
+            continue
+        if "path" in options:
+            target = _unescape(options["path"])
+        elif "abstract" in options:
+            target = "\0" + _unescape(options["abstract"])
+        else:
+            continue
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(target)
+            return sock
+        except OSError as e:
+            sock.close()
+            error = e
+    raise DBusError(f"could not connect to {address}: {error or 'no unix transport'}")
+
+
+def _authenticate(sock):
+    """SASL EXTERNAL: the bus checks our uid from the socket credentials"""
+    uid = str(os.getuid()).encode().hex()
+    sock.sendall(b"\0AUTH EXTERNAL " + uid.encode() + b"\r\n")
+    response = b""
+    while not response.endswith(b"\r\n"):
+        chunk = sock.recv(256)
+        if not chunk:
+            raise DBusError("bus closed the connection during authentication")
+        response += chunk
+    if not response.startswith(b"OK "):
+        raise DBusError(f"bus rejected authentication: {response.strip().decode(errors='replace')}")
+    sock.sendall(b"BEGIN\r\n")
+
+
+class Connection:
+    """One long-lived bus connection
+
+    call() may be used from any thread and blocks until its reply. A reader
+    thread routes replies to their callers and signals to the callbacks
+    registered with subscribe(). Once the bus goes away `closed` is set and
+    pending and later calls raise DBusError.
+    """
+
+    def __init__(self, address=None, timeout=5.0):
+        self.timeout = timeout
+        self.closed = False
+        self._sock = _open_socket(address or session_bus_address(), timeout)
+        try:
+            _authenticate(self._sock)
+        except (OSError, DBusError):
+            self._sock.close()
+            raise
+        self._sock.settimeout(None)
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._serial = 0
+        self._waiting = {}
+        self._handlers = {}
+        self._reader = threading.Thread(target=self._read_loop, name="eyes-dbus", daemon=True)
+        self._reader.start()
+        self.unique_name = self.call(BUS_NAME, BUS_PATH, BUS_NAME, "Hello")[0]
+
+    def call(self, destination, path, interface, member, signature="", args=(), timeout=None):
+        """Call a method and return its reply body as a tuple"""
+        done = threading.Event()
+        with self._lock:
+            if self.closed:
+                raise DBusError("connection closed")
+            self._serial += 1
+            serial = self._serial
+            self._waiting[serial] = [done, None]
+        fields = {PATH: path, INTERFACE: interface, MEMBER: member, DESTINATION: destination}
+        if signature:
+            fields[SIGNATURE] = signature
+        try:
+            self._send(Message(METHOD_CALL, fields, args, serial=serial))
+            if not done.wait(self.timeout if timeout is None else timeout):
+                raise DBusError(f"no reply to {interface}.{member}")
+        finally:
+            with self._lock:
+                reply = self._waiting.pop(serial)[1]
+        if reply is None:
+            raise DBusError("connection closed")
+        if reply.type == ERROR:
+            text = reply.body[0] if reply.body else reply.fields.get(ERROR_NAME)
+            raise DBusError(text, reply.fields.get(ERROR_NAME))
+        return reply.body
+
+    def subscribe(self, interface, member, callback):
+        """Call callback(*args) on the reader thread for each matching signal"""
+        self._handlers[(interface, member)] = callback
+        self.call(
+            BUS_NAME, BUS_PATH, BUS_NAME, "AddMatch", "s",
+            (f"type='signal',interface='{interface}',member='{member}'",),
+        )
+
+    def close(self):
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        self._reader.join(1)
+
+    def _send(self, message):
+        data = message.encode()
+        with self._send_lock:
+            try:
+                self._sock.sendall(data)
+            except OSError as e:
+                raise DBusError(f"send failed: {e}") from e
+
+    def _read_loop(self):
+        buf = bytearray()
+        try:
+            while True:
+                chunk = self._sock.recv(65536)
+                if not chunk:
+                    break
+                buf.extend(chunk)
+                while True:
+                    length = message_length(buf)
+                    if length is None or len(buf) < length:
+                        break
+                    message = Message.decode(bytes(buf[:length]))
+                    del buf[:length]
+                    self._dispatch(message)
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self.closed = True
+                for done, _ in self._waiting.values():
+                    done.set()
+
+    def _dispatch(self, message):
+        if message.type in (METHOD_RETURN, ERROR):
+            with self._lock:
+                waiter = self._waiting.get(message.fields.get(REPLY_SERIAL))
+                if waiter is not None:
+                    waiter[1] = message
+                    waiter[0].set()
+        elif message.type == SIGNAL:
+            callback = self._handlers.get((message.fields.get(INTERFACE), message.member))
+            if callback is not None:
+                try:
+                    callback(*message.body)
+                except Exception as e:
+                    log.error(
+                        f"D-Bus signal handler for {message.member} failed: {e}", exc_info=True
+                    )
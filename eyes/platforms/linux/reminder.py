@@ -0,0 +1,77 @@
+import logging
+import sys
+from ...core.backends import registry, BackendUnavailableError
+from ...core.dispatch import Dispatcher
+from ...core.reminder import BaseReminder, AdvancedReminder
+
+log = logging.getLogger(__name__)
+
+# Native desktop notifications first, plyer as a fallback
+LINUX_BACKENDS = ["dbus", "plyer"]
+
+
+def _select_backends(pinned=None):
+    """Pick Linux notification backends, exiting with install hints if none work"""
+    try:
+        return registry.select(LINUX_BACKENDS, pinned)
+    except BackendUnavailableError as e:
+        print(e)
+        print("Eyes needs a desktop notification service on the D-Bus session bus")
+        print("(most desktops run one; otherwise install dunst or mako)")
+        print("or: pip install plyer")
+        sys.exit(1)
+
+
+class LinuxReminder(BaseReminder):
+    """Simple Linux reminder using desktop notifications"""
+
+    def __init__(self, interval_minutes=20, backend=None, clock=None):
+        super().__init__(interval_minutes, clock=clock)
+        self.backends = _select_backends(backend)
+        self.backend = self.backends[0]
+        self.dispatcher = Dispatcher(self.backends)
+
+    def show_notification(self, title, message, timeout=None):
+        """Queue notification for delivery"""
+        self.dispatcher.submit(title, message, timeout)
+
+
+class LinuxAdvancedReminder(AdvancedReminder):
+    """Advanced Linux reminder with action buttons via org.freedesktop.Notifications"""
+
+    def __init__(self, interval_minutes=20, snooze_minutes=5, backend=None, clock=None):
+        super().__init__(interval_minutes, snooze_minutes, clock=clock)
+        self.backends = _select_backends(backend)
+        self.backend = self.backends[0]
+        self.dispatcher = Dispatcher(self.backends)
+        if self.backend.supports_actions:
+            log.info("Using desktop notifications over D-Bus")
+        else:
+            log.info(f"Using {self.backend.name} notifications (no action buttons)")
+
+    def show_notification(self, title, message, timeout=None):
+        """Queue basic notification"""
+        self.dispatcher.submit(title, message, timeout)
+
+    def show_reminder_with_actions(self, title, message, actions):
+        """Queue reminder with action buttons"""
+        # The D-Bus backend reports a click later through ActionInvoked;
+        # until then (or without buttons) the reminder auto-acknowledges
+        self.dispatcher.submit(
+            title, message, actions=actions, on_result=self._on_action_result
+        )
+
+
+# Factory function to create appropriate reminder type
+def create_reminder(advanced=False, interval_minutes=20, snooze_minutes=5, backend=None,
+                    clock=None):
+    """Create appropriate reminder for Linux"""
+    if advanced:
+        return LinuxAdvancedReminder(interval_minutes, snooze_minutes, backend, clock)
+    else:
+        return LinuxReminder(interval_minutes, backend, clock)
+
+
+def select_backends(backend=None):
+    """Notification backends for a reminder profile, best first"""
+    return _select_backends(backend)
@@ -1,86 +1,78 @@
+import logging
 import sys
+from ...core.backends import registry, BackendUnavailableError
+from ...core.dispatch import Dispatcher
 from ...core.reminder import BaseReminder, AdvancedReminder
 
+log = logging.getLogger(__name__)
+
+
+def _select_backends(preferred, pinned=None):
+    """Pick macOS notification backends, exiting with install hints if none work"""
+    try:
+        return registry.select(preferred, pinned)
+    except BackendUnavailableError as e:
+        print(e)
+        print("Please install notification support:")
+        print("pip install pync  # for native macOS notifications")
+        print("or: pip install plyer  # for basic notifications")
+        sys.exit(1)
+
 
 class MacOSReminder(BaseReminder):
     """Simple macOS reminder using plyer"""
     
-    def __init__(self, interval_minutes=20):
-        super().__init__(interval_minutes)
-        
-        try:
-            import plyer
-            self.plyer = plyer
-        except ImportError:
-            print("Please install plyer: pip install plyer")
-            sys.exit(1)
+    def __init__(self, interval_minutes=20, backend=None, clock=None):
+        super().__init__(interval_minutes, clock=clock)
+        self.backends = _select_backends(["plyer"], backend)
+        self.backend = self.backends[0]
+        self.dispatcher = Dispatcher(self.backends)
     
     def show_notification(self, title, message, timeout=None):
-        """Show notification using plyer"""
-        self.plyer.notification.notify(
-            title=title,
-            message=message,
-            timeout=timeout or 10
-        )
+        """Queue notification for delivery via plyer"""
+        self.dispatcher.submit(title, message, timeout)
 
 
 class MacOSAdvancedReminder(AdvancedReminder):
     """Advanced macOS reminder with native notifications and action buttons"""
     
-    def __init__(self, interval_minutes=20, snooze_minutes=5):
-        super().__init__(interval_minutes, snooze_minutes)
+    def __init__(self, interval_minutes=20, snooze_minutes=5, backend=None, clock=None):
+        super().__init__(interval_minutes, snooze_minutes, clock=clock)
         
-        # Try to set up native macOS notifications
-        try:
-            import pync
-            self.pync = pync
-            self.notification_method = "pync"
-            print("Using native macOS notifications")
-        except ImportError:
-            try:
-                import plyer
-                self.plyer = plyer
-                self.notification_method = "plyer"
-                print("Using plyer notifications (no action buttons)")
-            except ImportError:
-                print("Please install notification support:")
-                print("pip install pync  # for native macOS notifications")
-                print("or: pip install plyer  # for basic notifications")
-                sys.exit(1)
+        # Prefer native macOS notifications
+        self.backends = _select_backends(["pync", "plyer"], backend)
+        self.backend = self.backends[0]
+        self.notification_method = self.backend.name
+        # Remaining backends are fallbacks if the preferred one hangs or fails
+        self.dispatcher = Dispatcher(self.backends)
+        if self.backend.supports_actions:
+            log.info("Using native macOS notifications")
+        else:
+            log.info(f"Using {self.backend.name} notifications (no action buttons)")
     
     def show_notification(self, title, message, timeout=None):
-        """Show basic notification"""
-        if self.notification_method == "pync":
-            self.pync.notify(message, title=title)
-        else:
-            self.plyer.notification.notify(
-                title=title,
-                message=message,
-                timeout=timeout or 10
-            )
+        """Queue basic notification"""
+        self.dispatcher.submit(title, message, timeout)
     
     def show_reminder_with_actions(self, title, message, actions):
-        """Show reminder with action buttons (macOS specific)"""
-        if self.notification_method == "pync":
-            # Use pync with action buttons
-            self.pync.notify(
-                message,
-                title=title,
-                actions=actions,
-                activate="com.apple.Terminal"  # Bring terminal to front when clicked
-            )
-        else:
-            # Fallback to basic notification
-            self.show_notification(title, message)
-            # Auto-acknowledge after timeout since we can't handle actions
-            import threading
-            threading.Timer(30.0, lambda: self.handle_reminder_action("acknowledged")).start()
+        """Queue reminder with action buttons (macOS specific)"""
+        # Backends without action buttons (or that can't report the choice)
+        # deliver a plain notification and the reminder auto-acknowledges
+        self.dispatcher.submit(
+            title, message, actions=actions, on_result=self._on_action_result
+        )
 
 
 # Factory function to create appropriate reminder type
-def create_reminder(advanced=False, interval_minutes=20, snooze_minutes=5):
+def create_reminder(advanced=False, interval_minutes=20, snooze_minutes=5, backend=None,
+                    clock=None):
     """Create appropriate reminder for macOS"""
     if advanced:
-        return MacOSAdvancedReminder(interval_minutes, snooze_minutes)
+        return MacOSAdvancedReminder(interval_minutes, snooze_minutes, backend, clock)
     else:
-        return MacOSReminder(interval_minutes)
\ No newline at end of file
+        return MacOSReminder(interval_minutes, backend, clock)
+
+
+def select_backends(backend=None):
+    """Notification backends for a reminder profile, best first"""
+    return _select_backends(["pync", "plyer"], backend)
@@ -2,17 +2,38 @@ import platform
 import sys
 
 
-def create_reminder(advanced=False, interval_minutes=20, snooze_minutes=5):
+def create_reminder(advanced=False, interval_minutes=20, snooze_minutes=5, backend=None,
+                    clock=None):
     """Create platform-appropriate reminder instance"""
     system = platform.system()
     
     if system == "Darwin":
         from .platforms.macos.reminder import create_reminder as create_macos_reminder
-        return create_macos_reminder(advanced, interval_minutes, snooze_minutes)
+        return create_macos_reminder(advanced, interval_minutes, snooze_minutes, backend, clock)
     elif system == "Windows":
         from .platforms.windows.reminder import create_reminder as create_windows_reminder
-        return create_windows_reminder(advanced, interval_minutes, snooze_minutes)
+        return create_windows_reminder(advanced, interval_minutes, snooze_minutes, backend, clock)
+    elif system == "Linux":
+        from .platforms.linux.reminder import create_reminder as create_linux_reminder
+        return create_linux_reminder(advanced, interval_minutes, snooze_minutes, backend, clock)
     else:
         print(f"Unsupported platform: {system}")
-        print("This app supports macOS and Windows.")
-        sys.exit(1)
\ No newline at end of file
+        print("This app supports macOS, Windows and Linux.")
+        sys.exit(1)
+
+def create_profile_daemon(profiles):
+    """Create a daemon running every profile with this platform's backends"""
+    system = platform.system()
+    
+    if system == "Darwin":
+        from .platforms.macos.reminder import select_backends
+    elif system == "Windows":
+        from .platforms.windows.reminder import select_backends
+    elif system == "Linux":
+        from .platforms.linux.reminder import select_backends
+    else:
+        print(f"Unsupported platform: {system}")
+        print("This app supports macOS, Windows and Linux.")
+        sys.exit(1)
+    from .core.profiles import ProfileDaemon
+    return ProfileDaemon(profiles, select_backends)
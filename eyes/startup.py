@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+
+# Each phase is imported in order in a fresh interpreter; everything a phase
+# pulls in is what that startup path pays for.
+PHASES = [
+    ("cli", ["eyes.cli"]),
+    ("control", ["eyes.core.control"]),
+    ("reminder", ["eyes.reminders", "eyes.core.reminder"]),
+    ("platform", ["eyes.platforms.macos.reminder", "eyes.platforms.windows.reminder"]),
+    ("backends", ["plyer", "pync", "win10toast", "winotify"]),
+]
+
+PHASE_MARKER = "eyes-startup-phase:"
+
+
+def _probe_script():
+    """Source for the child interpreter that imports each phase in turn"""
+    # __import__ (unlike importlib.import_module) goes through the import
+    # machinery that -X importtime instruments
+    lines = ["import sys"]
+    for phase, modules in PHASES:
+        lines.append(f"sys.stderr.write({PHASE_MARKER + phase!r} + '\\n'); sys.stderr.flush()")
+        for module in modules:
+            lines.append(
+                f"try:\n    __import__({module!r})\nexcept Exception:\n    pass"
+            )
+    return "\n".join(lines)
+
+
+def parse_importtime(output):
+    """Parse -X importtime output into {phase: [(module, depth, self_us, cumulative_us)]}
+
+    Depth 0 entries are imported directly by the phase, so their cumulative
+    times add up to the phase total; deeper entries are what they pulled in.
+    """
+    phases = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith(PHASE_MARKER):
+            current = line[len(PHASE_MARKER):]
+            phases[current] = []
+            continue
+        if current is None or not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        phases[current].append((name.strip(), depth, int(fields[0]), int(fields[1])))
+    return phases
+
+
+def profile_startup():
+    """Import each startup phase in a fresh interpreter and return the breakdown"""
+    env = dict(os.environ)
+    # Keep pex/venv import paths so the child sees the same modules
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _probe_script()],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    return parse_importtime(result.stderr)
+
+
+def print_startup_profile(top=8):
+    """Print per-phase import time with the most expensive modules"""
+    phases = profile_startup()
+    total = 0
+    print("Import-time breakdown (fresh interpreter, cumulative ms):")
+    for phase, _ in PHASES:
+        entries = phases.get(phase, [])
+        phase_total = sum(cumulative for _, depth, _, cumulative in entries if depth == 0)
+        total += phase_total
+        print(f"\n{phase:<10} {phase_total / 1000:8.2f} ms")
+        # Direct imports plus what they pulled in, most expensive first
+        shown = [entry for entry in entries if entry[1] <= 1]
+        for name, depth, _, cumulative in sorted(shown, key=lambda e: -e[3])[:top]:
+            print(f"  {'  ' * depth}{name:<{40 - 2 * depth}} {cumulative / 1000:8.2f} ms")
+    print(f"\n{'total':<10} {total / 1000:8.2f} ms")
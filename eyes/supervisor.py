@@ -0,0 +1,330 @@
+import json
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# The status pipe is handed down as an inherited file descriptor
+SUPPORTED = os.name == "posix"
+
+
+def daemon_command(daemon_args):
+    """Command line for a daemon child; the supervisor adds --standby FD"""
+    return [sys.executable, "-m", "eyes.cli", *daemon_args]
+
+
+def await_promotion(fd):
+    """Standby side: report ready and block until promoted; returns the supervisor's stats
+
+    Exits quietly if the supervisor goes away first.
+    """
+    os.write(fd, b"ready\n")
+    line = sys.stdin.readline()
+    if not line:
+        sys.exit(0)
+    return json.loads(line).get("stats", {})
+
+
+def follow_supervisor(fd, target, stats, stop=None):
+    """Active side: report taking over, keep target.supervisor current from the pipe
+
+    When the supervisor goes away the daemon shuts down (stop(), by default
+    clearing target.should_run), so a restarted supervisor doesn't find
+    an orphan holding the control socket.
+    """
+    target.supervisor = stats
+    os.write(fd, b"active\n")
+    os.close(fd)
+
+    def stopped():
+        target.should_run = False
+
+    def read():
+        for line in sys.stdin:
+            try:
+                target.supervisor = json.loads(line)["stats"]
+            except (ValueError, KeyError):
+                log.warning(f"Ignoring bad line from the supervisor: {line.strip()!r}")
+        log.warning("Supervisor went away, shutting down")
+        (stop or stopped)()
+
+    threading.Thread(target=read, name="eyes-supervisor", daemon=True).start()
+
+
+class Child:
+    """A daemon process and the pipes it is driven through"""
+
+    def __init__(self, command, events):
+        read_fd, write_fd = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                command + ["--standby", str(write_fd)],
+                stdin=subprocess.PIPE, pass_fds=(write_fd,),
+                # Ctrl+C reaches the supervisor only, which shuts children down in order
+                start_new_session=True,
+            )
+        except OSError:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+        self.pid = self.process.pid
+        self.ready = False
+        self.promoted_at = None
+        self._events = events
+        self._status = os.fdopen(read_fd, "rb", buffering=0)
+        threading.Thread(target=self._watch, name=f"eyes-child-{self.pid}", daemon=True).start()
+
+    def send(self, message):
+        """Write a JSON line to the child's stdin; False if it is gone"""
+        try:
+            self.process.stdin.write(json.dumps(message).encode() + b"\n")
+            self.process.stdin.flush()
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def release(self):
+        """Close stdin: a standby exits, an active daemon shuts down"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+    def signal(self, signum):
+        try:
+            self.process.send_signal(signum)
+        except OSError:
+            pass
+
+    def _watch(self):
+        # One line per state change; end of file once the child has exited
+        for line in self._status:
+            self._events.put((line.strip().decode(), self, time.monotonic()))
+        self._status.close()
+        returncode = self.process.wait()
+        self._events.put(("exit", self, time.monotonic(), returncode))
+
+
+class Supervisor:
+    """Keeps one active daemon child and one warm standby
+
+    Every child starts as a standby: it imports everything, loads its
+    notification backend and builds the reminder, then reports ready and
+    blocks on its stdin. Promoting it is one line down that pipe, after
+    which it loads the schedule the previous daemon saved (core.state) and
+    serves, and a new standby starts behind it. The supervisor itself only
+    manages processes and imports next to nothing.
+
+    The first crash is taken over at once. Every further crash within
+    stable seconds of a takeover doubles the wait before the next one,
+    from backoff up to max_backoff; a child that stays up for stable
+    seconds resets it. A daemon that exits cleanly (`eyes ctl stop`) ends
+    supervision, as does a first child that can't even start. Crash counts
+    and failover latency are logged and sent to the active daemon, which
+    reports them in `eyes ctl status`.
+    """
+
+    def __init__(self, command, stable=30.0, backoff=1.0, max_backoff=60.0):
+        self.command = command
+        self.stable = stable
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.active = None
+        self.standby = None
+        self.crashes = 0
+        self.standby_crashes = 0
+        self.failovers = []
+        self.delays = []
+        self._events = queue.SimpleQueue()
+        self._stopping = False
+        self._kill_after = None
+        self._lost_at = None
+        self._promote_after = None
+        self._spawn_after = None
+        self._quick_crashes = 0
+        self._standby_failures = 0
+        self._started = False
+        self._returncode = 0
+
+    def stats(self):
+        """Crash counts and failover latency, as reported to the active daemon"""
+        latencies = [round(seconds * 1000, 1) for seconds in self.failovers]
+        return {
+            "pid": os.getpid(),
+            "crashes": self.crashes,
+            "standby_crashes": self.standby_crashes,
+            "failovers": len(latencies),
+            "failover_ms": {
+                "last": latencies[-1] if latencies else None,
+                "max": max(latencies) if latencies else None,
+                "mean": round(sum(latencies) / len(latencies), 1) if latencies else None,
+            },
+            "backoff": self.delays[-1] if self.delays else 0.0,
+            "standby_ready": self.standby is not None and self.standby.ready,
+        }
+
+    def stop(self):
+        """Shut the daemon down and end supervision; safe from signal handlers and threads"""
+        self._events.put(("stop",))
+
+    def run(self, handle_signals=True):
+        """Supervise until the daemon stops; returns the exit status"""
+        if handle_signals and threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda signum, frame: self.stop())
+            # Shows and trace dumps are the active daemon's business
+            for signum in (signal.SIGUSR1, signal.SIGUSR2):
+                signal.signal(signum, lambda signum, frame: self._events.put(("signal", signum)))
+        log.info("Supervising the eyes daemon with a warm standby")
+        self._lost_at = time.monotonic()
+        self._promote_after = self._lost_at
+        self._spawn()
+        while self.active is not None or self.standby is not None or not self._stopping:
+            try:
+                event = self._events.get(timeout=self._timeout())
+            except queue.Empty:
+                event = ("tick",)
+            self._handle(event)
+        return self._returncode
+
+    def _timeout(self):
+        now = time.monotonic()
+        due = [t for t in (self._spawn_after, self._promote_after) if t is not None]
+        if self._stopping:
+            due.append(self._kill_after)
+        return max(min(due) - now, 0.0) if due else None
+
+    def _handle(self, event):
+        kind, args = event[0], event[1:]
+        if kind == "ready":
+            args[0].ready = True
+            self._standby_failures = 0
+        elif kind == "active":
+            self._took_over(*args)
+        elif kind == "exit":
+            self._exited(*args)
+        elif kind == "stop":
+            self._stop()
+        elif kind == "signal" and self.active is not None:
+            self.active.signal(args[0])
+        now = time.monotonic()
+        if self._stopping:
+            if now >= self._kill_after:
+                for child in (self.active, self.standby):
+                    if child is not None:
+                        child.signal(signal.SIGKILL)
+            return
+        if self._spawn_after is not None and now >= self._spawn_after:
+            self._spawn()
+        if self._promote_after is not None and now >= self._promote_after:
+            self._promote()
+
+    def _spawn(self):
+        self._spawn_after = None
+        try:
+            self.standby = Child(self.command, self._events)
+        except OSError as e:
+            log.error(f"Could not start a standby daemon: {e}")
+            self._standby_failed()
+
+    def _promote(self):
+        standby = self.standby
+        if standby is None or not standby.ready:
+            return  # Promoted as soon as it reports ready
+        self.standby = None
+        self._promote_after = None
+        standby.promoted_at = time.monotonic()
+        self.active = standby
+        if not standby.send({"cmd": "go", "stats": self.stats()}):
+            log.warning(f"Standby {standby.pid} went away before taking over")
+
+    def _took_over(self, child, at):
+        if child is not self.active:
+            return
+        if self._started:
+            latency = at - self._lost_at
+            self.failovers.append(latency)
+            log.info(f"Standby {child.pid} took over in {latency * 1000:.1f} ms "
+                     f"(crash {self.crashes})")
+        else:
+            self._started = True
+            log.info(f"Daemon {child.pid} started")
+        self._lost_at = None
+        # The next standby starts once this one is serving, not competing with it
+        if self.standby is None:
+            self._spawn()
+        self._report()
+
+    def _exited(self, child, at, returncode):
+        if child is self.standby:
+            self.standby = None
+            if self._stopping:
+                return
+            if not self._started and self.active is None and returncode != 0:
+                self._failed_to_start(returncode)
+                return
+            self.standby_crashes += 1
+            log.warning(f"Standby {child.pid} exited with status {returncode}")
+            self._standby_failed()
+            self._report()
+            return
+        if child is not self.active:
+            return
+        self.active = None
+        if self._stopping or returncode == 0:
+            # Stopped on request: take the standby down with it
+            log.info(f"Daemon {child.pid} stopped")
+            self._returncode = returncode if not self._stopping else 0
+            self._stop()
+            return
+        if not self._started:
+            self._failed_to_start(returncode)
+            return
+        self.crashes += 1
+        if child.promoted_at is not None and at - child.promoted_at < self.stable:
+            self._quick_crashes += 1
+        else:
+            self._quick_crashes = 1
+        delay = 0.0
+        if self._quick_crashes > 1:
+            delay = min(self.backoff * 2 ** (self._quick_crashes - 2), self.max_backoff)
+        self.delays.append(delay)
+        log.warning(f"Daemon {child.pid} died with status {returncode} (crash {self.crashes}); "
+                    + (f"taking over in {delay:g}s" if delay else "taking over now"))
+        self._lost_at = at
+        self._promote_after = at + delay
+        if self.standby is None and self._spawn_after is None:
+            self._spawn()
+
+    def _failed_to_start(self, returncode):
+        # Bad options or config fail every child the same way: don't loop
+        log.error(f"Daemon failed to start (exit status {returncode})")
+        self._returncode = returncode
+        self._stop()
+
+    def _standby_failed(self):
+        self._standby_failures += 1
+        delay = min(self.backoff * 2 ** (self._standby_failures - 1), self.max_backoff)
+        self._spawn_after = time.monotonic() + delay
+
+    def _report(self):
+        if self.active is not None:
+            self.active.send({"stats": self.stats()})
+
+    def _stop(self):
+        if not self._stopping:
+            self._stopping = True
+            # Children get this long to save their state and exit
+            self._kill_after = time.monotonic() + 10.0
+        self._spawn_after = self._promote_after = None
+        if self.active is not None:
+            self.active.signal(signal.SIGTERM)
+        if self.standby is not None:
+            self.standby.release()
@@ -0,0 +1,125 @@
+import asyncio
+import signal
+import threading
+
+import pytest
+
+from eyes.core.async_reminder import AsyncReminder
+from eyes.core.ratelimit import ShowGate
+from eyes.core.reminder import AdvancedReminder
+
+
+class FakeAdvancedReminder(AdvancedReminder):
+    """Advanced reminder that records which thread each backend call ran on."""
+
+    def show_notification(self, title, message, timeout=None):
+        self.calls.append(threading.current_thread().name)
+
+    def show_reminder_with_actions(self, title, message, actions):
+        self.calls.append(threading.current_thread().name)
+        self.schedule_auto_acknowledge(0.01)
+
+
+@pytest.fixture
+def reminder():
+    reminder = FakeAdvancedReminder(interval_minutes=20, snooze_minutes=5)
+    reminder.calls = []
+    # Sub-second interval so the test completes quickly, with a show gate
+    # scaled down to match
+    reminder.interval_minutes = 0.05 / 60
+    reminder.show_gate = ShowGate(window=0.0, rate=1000.0, burst=1000)
+    return reminder
+
+
+async def wait_until(predicate, timeout=2):
+    """Poll predicate on the loop, failing instead of hanging on a regression."""
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+def test_intervals_run_on_loop_and_backend_in_executor(reminder):
+    """Test that intervals fire repeatedly and backend calls leave the loop thread."""
+    engine = AsyncReminder(reminder, handle_signals=False, serve_control=False)
+
+    async def scenario():
+        task = asyncio.ensure_future(engine.run())
+        await wait_until(lambda: len(reminder.calls) >= 3)
+        engine.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+    assert len(reminder.calls) >= 3
+    assert all(name.startswith("eyes-backend") for name in reminder.calls)
+    assert reminder.should_run is False
+
+def test_snooze_is_a_loop_timer(reminder):
+    """Test that snoozing schedules on the asyncio scheduler."""
+    reminder.interval_minutes = 60
+    reminder.snooze_minutes = 0.05 / 60
+    engine = AsyncReminder(reminder, handle_signals=False, serve_control=False)
+
+    async def scenario():
+        task = asyncio.ensure_future(engine.run())
+        await asyncio.sleep(0)
+        reminder.handle_reminder_action("snooze")
+        assert len(engine.scheduler) == 2
+        await wait_until(lambda: reminder.calls)
+        engine.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+    assert len(reminder.calls) == 1
+
+def test_fallback_calling_show_notification_runs_inline(reminder):
+    """Test that a backend call made from the executor is not re-queued."""
+    results = []
+
+    def show_reminder_with_actions(title, message, actions):
+        results.append(reminder.show_notification(title, message))
+
+    reminder.show_reminder_with_actions = show_reminder_with_actions
+    engine = AsyncReminder(reminder, handle_signals=False, serve_control=False)
+
+    async def scenario():
+        task = asyncio.ensure_future(engine.run())
+        await wait_until(lambda: reminder.calls)
+        engine.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+    assert results[0] is None
+    assert reminder.calls[0].startswith("eyes-backend")
+
+def test_engine_can_run_twice(reminder):
+    """Test that run() can be awaited again after stopping."""
+    engine = AsyncReminder(reminder, handle_signals=False, serve_control=False)
+
+    async def scenario():
+        task = asyncio.ensure_future(engine.run())
+        count = len(reminder.calls)
+        await wait_until(lambda: len(reminder.calls) > count)
+        engine.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+    asyncio.run(scenario())
+    assert len(reminder.calls) >= 2
+
+def test_previous_signal_handlers_are_restored(reminder):
+    """Test that stopping the engine puts back the host's signal handlers."""
+    previous = signal.getsignal(signal.SIGUSR1)
+    sigint = signal.getsignal(signal.SIGINT)
+    reminder.interval_minutes = 60
+    engine = AsyncReminder(reminder, serve_control=False)
+
+    async def scenario():
+        task = asyncio.ensure_future(engine.run())
+        await asyncio.sleep(0)
+        engine.stop()
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(scenario())
+    assert signal.getsignal(signal.SIGUSR1) == previous
+    assert signal.getsignal(signal.SIGINT) is sigint
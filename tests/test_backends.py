@@ -0,0 +1,93 @@
+import json
+import sys
+import types
+
+import pytest
+from unittest.mock import patch
+
+from eyes.core.backends import Backend, BackendRegistry, BackendUnavailableError, WinotifyBackend
+
+
+class FakeBackend(Backend):
+    """Backend that counts constructions and notifications."""
+
+    name = "fake"
+    modules = ("json",)
+    loads = 0
+
+    def load(self):
+        FakeBackend.loads += 1
+        self.sent = []
+
+    def notify(self, title, message, timeout=None):
+        self.sent.append((title, message))
+
+
+class MissingBackend(Backend):
+    name = "missing"
+    modules = ("eyes_no_such_backend_module",)
+
+
+@pytest.fixture
+def registry():
+    FakeBackend.loads = 0
+    registry = BackendRegistry()
+    registry.register(FakeBackend)
+    registry.register(MissingBackend)
+    return registry
+
+
+def test_probe_is_cached(registry):
+    """Test that each backend is probed once per process."""
+    with patch("importlib.util.find_spec", return_value=object()) as find_spec:
+        assert registry.probe("fake") is True
+        assert registry.probe("fake") is True
+    assert find_spec.call_count == 1
+
+def test_backend_objects_are_reused(registry):
+    """Test that get() returns the same long-lived instance."""
+    assert registry.get("fake") is registry.get("fake")
+    assert FakeBackend.loads == 1
+
+def test_select_skips_missing_and_honours_pin(registry):
+    """Test preference order, fallback past missing backends and pinning."""
+    assert [b.name for b in registry.select(["missing", "fake"])] == ["fake"]
+    with pytest.raises(BackendUnavailableError):
+        registry.select(["fake"], pinned="missing")
+    with pytest.raises(BackendUnavailableError):
+        registry.select(["missing"])
+    with pytest.raises(BackendUnavailableError):
+        registry.select(["fake"], pinned="nonexistent")
+
+def test_disk_cache_between_runs(registry, tmp_path):
+    """Test that probe results persist on disk and skip find_spec next run."""
+    cache_path = str(tmp_path / "backends.json")
+    registry.cache_path = cache_path
+    registry.probe("fake")
+    registry.probe("missing")
+    assert json.load(open(cache_path))["backends"] == {"fake": True, "missing": False}
+
+    second = BackendRegistry(cache_path)
+    second.register(FakeBackend)
+    second.register(MissingBackend)
+    with patch("importlib.util.find_spec") as find_spec:
+        assert second.probe("fake") is True
+        assert second.probe("missing") is False
+    find_spec.assert_not_called()
+
+def test_winotify_reuses_toast_objects():
+    """Test that winotify builds one Notification per distinct message."""
+    built = []
+
+    class Notification:
+        def __init__(self, **kwargs):
+            built.append(kwargs)
+
+        def show(self):
+            pass
+
+    with patch.dict(sys.modules, {"winotify": types.SimpleNamespace(Notification=Notification)}):
+        backend = WinotifyBackend()
+    for _ in range(10):
+        backend.notify("Eye Break", "Look away")
+    assert len(built) == 1
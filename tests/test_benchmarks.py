@@ -0,0 +1,33 @@
+from benchmarks.run import bench_calendar, bench_idle, bench_simulated_day, compare
+
+
+def test_compare_flags_only_real_regressions():
+    """Test that results must exceed both the ratio and the slack to regress."""
+    baseline = {"cli_version_ms": 40.0, "dispatch_p50_us": 50.0, "threads_peak": 2}
+    results = {"cli_version_ms": 58.0, "dispatch_p50_us": 400.0, "threads_peak": 3}
+    regressed = {metric for metric, *_ in compare(results, baseline)}
+    assert regressed == {"dispatch_p50_us"}
+    results["threads_peak"] = 4
+    assert {metric for metric, *_ in compare(results, baseline)} == {"dispatch_p50_us", "threads_peak"}
+
+def test_simulated_day_runs_headless():
+    """Test that a simulated day completes with the fake backend."""
+    results = bench_simulated_day(hours=2)
+    assert results["sim_notifications"] >= 120
+    assert results["sim_wakeups"] > 0
+
+def test_calendar_year_of_lookups():
+    """Test that a year of work-hours reminders is walked one lookup per reminder."""
+    results = bench_calendar(lookups=100)
+    # About 250 working days of 7.5 hours at three reminders an hour
+    assert 5000 < results["calendar_year_fires"] < 6000
+    assert results["calendar_year_ms"] > 0
+
+def test_idle_sampler_over_a_workday():
+    """Test that adaptive idle sampling is cheap and keeps reminders off an empty desk."""
+    results = bench_idle()
+    # A one-second poll would sample 30600 times
+    assert results["idle_samples"] < 1000
+    assert results["idle_pauses"] == 3
+    assert results["idle_shown_away"] == 0
+    assert results["idle_shown_away_without"] > 0
@@ -0,0 +1,92 @@
+import datetime
+
+import pytest
+
+from eyes.core.calendar import Calendar, parse_schedule
+from eyes.core.clock import SimulatedClock
+from eyes.core.config import parse_config
+from eyes.core.profiles import parse_profiles
+
+from tests.test_reminder import make_reminder
+
+UTC = datetime.timezone.utc
+
+
+def at(*args, tz=UTC):
+    return datetime.datetime(*args, tzinfo=tz).timestamp()
+
+
+def test_windows_compile_to_sorted_disjoint_spans():
+    """Test that windows merge, exclusions cut holes and offsets start on Monday."""
+    calendar = Calendar(["mon-fri 09:00-12:30", "mon-fri 12:00-17:30"], ["12:00-13:00"])
+    assert calendar.starts[:2] == [9 * 3600, 13 * 3600]
+    assert calendar.ends[:2] == [12 * 3600, 17.5 * 3600]
+    assert len(calendar.starts) == 10
+
+def test_lookups_in_a_time_zone():
+    """Test active hours and next window across a weekend and a DST change."""
+    calendar = Calendar(["mon-fri 09:00-17:30"], ["12:00-13:00"], "Europe/Berlin")
+    # Friday 2026-03-27 10:00 CET is active; lunch is not
+    assert calendar.active(at(2026, 3, 27, 9)) is True
+    assert calendar.active(at(2026, 3, 27, 11, 30)) is False
+    assert calendar.next_active(at(2026, 3, 27, 11, 30)) == at(2026, 3, 27, 12)
+    # Clocks go forward on Sunday; Monday 09:00 is now 07:00 UTC
+    assert calendar.next_active(at(2026, 3, 27, 17)) == at(2026, 3, 30, 7)
+    assert calendar.fit(at(2026, 3, 27, 17), 1200) == at(2026, 3, 30, 7, 20)
+    assert calendar.fit(at(2026, 3, 27, 9), 1200) == at(2026, 3, 27, 9)
+
+def test_overnight_window_wraps_round_the_week():
+    """Test that a Sunday night window carries on into Monday morning."""
+    calendar = Calendar(["sun 22:00-02:00"], timezone="UTC")
+    assert calendar.active(at(2026, 10, 18, 23)) is True
+    assert calendar.active(at(2026, 10, 19, 1, 59)) is True
+    assert calendar.active(at(2026, 10, 19, 2)) is False
+    assert calendar.next_active(at(2026, 10, 19, 2)) == at(2026, 10, 25, 22)
+
+@pytest.mark.parametrize("table, error", [
+    ({"windows": ["mon-fri 9-17"]}, "bad time"),
+    ({"windows": ["funday 09:00-17:00"]}, "unknown day"),
+    ({"windows": ["09:00-09:00"]}, "empty window"),
+    ({"windows": ["09:00-17:00"], "exclude": ["00:00-24:00"]}, "no active hours"),
+    ({"windows": []}, "at least one window"),
+    ({"windows": ["09:00-17:00"], "timezone": "Mars/Olympus"}, "unknown time zone"),
+    ({"windows": ["09:00-17:00"], "days": "mon"}, "unknown keys days"),
+])
+def test_invalid_schedules_rejected(table, error):
+    """Test that bad schedules are caught when the config is read."""
+    with pytest.raises(ValueError, match=error):
+        parse_schedule(table)
+
+def test_reminder_sleeps_through_off_hours():
+    """Test that no interval wakeup happens between Friday evening and Monday morning."""
+    clock = SimulatedClock(epoch=at(2026, 10, 16, 16))  # a Friday
+    reminder = make_reminder(interval_minutes=20, clock=clock)
+    reminder.calendar = Calendar(["mon-fri 09:00-17:30"], ["12:00-13:00"], "UTC")
+    reminder.timer.resume_check = None
+    reminder._schedule_interval()
+    shown = []
+
+    def after_step():
+        if len(reminder.notifications) > len(shown):
+            shown.append(clock.wall())
+
+    clock.run(reminder.scheduler, at(2026, 10, 19, 10) - clock.epoch, after_step)
+    assert shown == [
+        at(2026, 10, 16, 16, 20), at(2026, 10, 16, 16, 40), at(2026, 10, 16, 17),
+        at(2026, 10, 16, 17, 20), at(2026, 10, 19, 9, 20), at(2026, 10, 19, 9, 40),
+        at(2026, 10, 19, 10),
+    ]
+    # Each show wakes the scheduler once, and once more to clear the active flag
+    assert reminder.scheduler.wakeups == 2 * len(shown) - 1
+    assert reminder.status()["schedule"] == "mon-fri 09:00-17:30 except 12:00-13:00 (UTC)"
+
+def test_schedule_from_config_and_profiles():
+    """Test that [schedule] tables are read from the config file and from profiles."""
+    config = parse_config({"schedule": {"windows": "weekdays 08:00-16:00"}})
+    assert config.calendar == Calendar(["weekdays 08:00-16:00"])
+    profiles = parse_profiles({"profiles": {"water": {
+        "interval": 60, "schedule": {"windows": ["sat-sun 10:00-18:00"], "timezone": "UTC"},
+    }}})
+    assert str(profiles[0].calendar) == "sat-sun 10:00-18:00 (UTC)"
+    with pytest.raises(ValueError, match="profile 'water': schedule"):
+        parse_profiles({"profiles": {"water": {"schedule": {"windows": ["x"]}}}})
@@ -1,7 +1,9 @@
 import pytest
+import subprocess
 import sys
 from unittest.mock import patch, MagicMock
 from eyes.cli import main
+from eyes.startup import parse_importtime
 
 def test_help_output():
     """Test that --help works without errors."""
@@ -29,4 +31,39 @@ def test_invalid_snooze():
     with patch.object(sys, 'argv', ['eyes', '-s', '0']):
         with pytest.raises(SystemExit) as exc_info:
             main()
-        assert exc_info.value.code == 1
\ No newline at end of file
+        assert exc_info.value.code == 1
+
+def test_cli_import_skips_backends():
+    """Test that importing the CLI does not load platform or backend modules."""
+    code = (
+        "import sys, eyes.cli; "
+        "heavy = [m for m in sys.modules if m.startswith(('eyes.reminders', 'eyes.platforms', "
+        "'eyes.core', 'asyncio', 'plyer', 'pync', 'winotify', 'win10toast'))]; "
+        "print(heavy)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.stdout.strip() == "[]"
+
+def test_parse_importtime():
+    """Test that the startup profile splits imports by phase and depth."""
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "eyes-startup-phase:cli",
+        "import time:       100 |        100 |   json.decoder",
+        "import time:       200 |        300 | json",
+        "eyes-startup-phase:backends",
+        "import time:      1000 |       5000 | plyer",
+    ])
+    phases = parse_importtime(output)
+    assert phases == {
+        "cli": [("json.decoder", 1, 100, 100), ("json", 0, 200, 300)],
+        "backends": [("plyer", 0, 1000, 5000)],
+    }
+
+def test_startup_profile_output(capsys):
+    """Test that --startup-profile reports every phase."""
+    with patch.object(sys, 'argv', ['eyes', '--startup-profile']):
+        main()
+    out = capsys.readouterr().out
+    for phase in ("cli", "control", "reminder", "platform", "backends", "total"):
+        assert phase in out
@@ -0,0 +1,78 @@
+import time
+
+from eyes.core.clock import SimulatedClock, SystemClock
+
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+DAY = 24 * 3600
+
+
+class ScriptedUser(FakeAdvancedReminder):
+    """Reminder whose user snoozes interval reminders and acknowledges the rest."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.log = []
+        self._response = "acknowledged"
+
+    def _on_interval(self):
+        self._response = "snooze"
+        super()._on_interval()
+
+    def show_reminder_with_actions(self, title, message, actions):
+        self.log.append(("shown", self.clock()))
+        response, self._response = self._response, "acknowledged"
+        self.scheduler.schedule(10, self.respond, response)
+
+    def respond(self, action):
+        self.log.append((action, self.clock()))
+        self.handle_reminder_action(action)
+
+
+def simulate_week():
+    clock = SimulatedClock()
+    reminder = make_reminder(ScriptedUser, interval_minutes=20, snooze_minutes=5, clock=clock)
+    reminder._schedule_interval()
+    for day in range(7):
+        # A SIGUSR1-style forced show at 09:10 every day
+        reminder.scheduler.schedule_at(day * DAY + 9 * 3600 + 600, reminder.force_show)
+    clock.run(reminder.scheduler, 7 * DAY - 1)
+    return reminder
+
+
+def test_simulated_week_of_reminders():
+    """Test a week of intervals, snoozes, acknowledgements and forced shows in well under a second."""
+    start = time.perf_counter()
+    reminder = simulate_week()
+    elapsed = time.perf_counter() - start
+
+    kinds = [kind for kind, _ in reminder.log]
+    assert kinds.count("shown") == 503 * 2 + 7
+    assert kinds.count("snooze") == 503
+    assert kinds.count("acknowledged") == 503 + 7
+    # Every snooze shows the reminder again exactly snooze_minutes later
+    shown_at = {at for kind, at in reminder.log if kind == "shown"}
+    for kind, at in reminder.log:
+        if kind == "snooze":
+            assert at + 300 in shown_at
+    assert reminder.timer.deadline == 504 * 1200
+    assert reminder.timer.jitter.max == 0
+    assert elapsed < 1.0
+
+def test_simulation_is_deterministic():
+    """Test that two simulated runs produce identical event logs."""
+    assert simulate_week().log == simulate_week().log
+
+def test_suspend_moves_only_wall_clock():
+    """Test that a simulated suspend leaves the monotonic clock alone."""
+    clock = SimulatedClock(start=10.0, epoch=1000.0)
+    clock.advance(5)
+    clock.suspend(60)
+    assert clock() == 15.0
+    assert clock.wall() == 1075.0
+
+def test_system_clock_reads_real_time():
+    """Test that the system clock follows the monotonic and epoch clocks."""
+    clock = SystemClock()
+    assert abs(clock() - time.monotonic()) < 1
+    assert abs(clock.wall() - time.time()) < 1
@@ -0,0 +1,178 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from eyes.cli import load_settings, parse_args
+from eyes.core.clock import SimulatedClock
+from eyes.core.config import Config, load_config, parse_config
+from eyes.core.watch import FileWatcher
+
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+
+def write_atomically(path, text):
+    """Save the way most editors do: write a temporary file, rename it over."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def configured_reminder(path, text):
+    path.write_text(text)
+    clock = SimulatedClock()
+    reminder = make_reminder(FakeAdvancedReminder, clock=clock)
+    reminder.config_path = str(path)
+    assert reminder.reload_config()
+    reminder._schedule_interval()
+    return reminder, clock
+
+
+def test_load_config_from_toml(tmp_path):
+    """Test that settings are read from TOML with defaults for the rest."""
+    path = tmp_path / "config.toml"
+    path.write_text('interval = 25\nmessage = "Blink"\non_resume = "skip"\n')
+    config = load_config(str(path))
+    assert (config.interval_minutes, config.snooze_minutes) == (25, 5)
+    assert (config.message, config.on_resume, config.mode) == ("Blink", "skip", "advanced")
+
+@pytest.mark.parametrize("data, error", [
+    ({"interval": 0}, "interval: minutes must be a positive"),
+    ({"snooze": "5"}, "snooze: minutes must be a positive"),
+    ({"mode": "loud"}, "mode must be"),
+    ({"on_resume": "later"}, "on_resume must be"),
+    ({"title": ""}, "non-empty"),
+    ({"intervall": 20}, "unknown keys intervall"),
+])
+def test_invalid_config_rejected(data, error):
+    """Test that bad settings are caught before anything is applied."""
+    with pytest.raises(ValueError, match=error):
+        parse_config(data)
+
+def test_reload_keeps_elapsed_time(tmp_path):
+    """Test that a new interval counts the time already spent in the current one."""
+    path = tmp_path / "config.toml"
+    reminder, clock = configured_reminder(path, "interval = 20\n")
+    clock.run(reminder.scheduler, 15 * 60)
+    write_atomically(path, "interval = 30\nsnooze = 10\n")
+    assert reminder.reload_config()
+    assert reminder.timer.deadline == 30 * 60
+    assert reminder.snooze_minutes == 10
+    # Already past a 10 minute interval, so the reminder is due straight away
+    write_atomically(path, "interval = 10\n")
+    reminder.reload_config()
+    clock.run(reminder.scheduler, 15 * 60)
+    assert len(reminder.notifications) == 1
+    assert reminder.timer.deadline == 25 * 60
+
+def test_bad_edit_keeps_running_settings(tmp_path):
+    """Test that an invalid edit is reported and the previous settings stay in force."""
+    path = tmp_path / "config.toml"
+    reminder, _ = configured_reminder(path, 'interval = 20\ntitle = "Rest"\n')
+    for bad in ("interval = 30\ntitle = \n", "interval = -5\n"):
+        write_atomically(path, bad)
+        assert reminder.reload_config() is False
+        assert reminder.config_error.startswith(str(path))
+        assert (reminder.interval_minutes, reminder.title) == (20, "Rest")
+        assert reminder.timer.deadline == 20 * 60
+    write_atomically(path, "interval = 30\n")
+    assert reminder.reload_config() is True
+    assert reminder.config_error is None
+    assert reminder.title == FakeAdvancedReminder.title
+    assert reminder.status()["config_error"] is None
+
+def test_failed_apply_rolls_back(tmp_path, monkeypatch):
+    """Test that an apply that fails part-way restores the previous settings."""
+    path = tmp_path / "config.toml"
+    reminder, _ = configured_reminder(path, "interval = 20\nsnooze = 5\n")
+
+    arm = reminder._arm_interval
+    calls = []
+
+    def fail_first_arm(now):
+        calls.append(now)
+        if len(calls) == 1:
+            raise RuntimeError("scheduler unavailable")
+        arm(now)
+
+    monkeypatch.setattr(reminder, "_arm_interval", fail_first_arm)
+    write_atomically(path, "interval = 40\nsnooze = 9\n")
+    assert reminder.reload_config() is False
+    assert "scheduler unavailable" in reminder.config_error
+    assert (reminder.interval_minutes, reminder.snooze_minutes) == (20, 5)
+    assert reminder.timer.period == 20 * 60
+    assert reminder.timer.deadline == 20 * 60
+
+def test_startup_only_settings_kept(tmp_path, caplog):
+    """Test that mode and backend edits wait for a restart."""
+    caplog.set_level(logging.INFO, logger="eyes")
+    path = tmp_path / "config.toml"
+    reminder, _ = configured_reminder(path, 'interval = 20\nmode = "advanced"\n')
+    write_atomically(path, 'interval = 25\nmode = "simple"\n')
+    assert reminder.reload_config()
+    assert reminder.config.mode == "advanced"
+    assert reminder.interval_minutes == 25
+    assert "mode change takes effect after a restart" in caplog.text
+
+def test_flags_override_config_file(tmp_path):
+    """Test that command-line flags win over the file at startup."""
+    path = tmp_path / "config.toml"
+    path.write_text('interval = 25\nsnooze = 7\nmode = "advanced"\n')
+    config, config_path = load_settings(parse_args(["--config", str(path), "-i", "45", "--simple"]))
+    assert config_path == str(path)
+    assert (config.interval_minutes, config.snooze_minutes, config.mode) == (45, 7, "simple")
+
+def test_watcher_reports_saves_without_polling(tmp_path):
+    """Test that in-place writes and atomic renames are both noticed, once each."""
+    path = tmp_path / "config.toml"
+    path.write_text("interval = 20\n")
+    changes = []
+    changed = threading.Event()
+
+    def on_change():
+        changes.append(path.read_text())
+        changed.set()
+
+    watcher = FileWatcher(str(path), on_change, debounce=0.02)
+    if sys.platform.startswith("linux"):
+        assert watcher.method == "inotify"
+    watcher.start()
+    try:
+        time.sleep(0.05)
+        assert changes == []
+        write_atomically(path, "interval = 25\n")
+        assert changed.wait(2)
+        changed.clear()
+        with open(path, "a") as f:
+            f.write("snooze = 3\n")
+        assert changed.wait(2)
+        time.sleep(0.1)
+    finally:
+        watcher.stop()
+    assert changes == ["interval = 25\n", "interval = 25\nsnooze = 3\n"]
+
+def test_running_daemon_reloads_on_save(tmp_path):
+    """Test that saving the file re-times the running reminder on its scheduler."""
+    path = tmp_path / "config.toml"
+    path.write_text("interval = 20\n")
+    reminder = make_reminder(FakeAdvancedReminder)
+    reminder.apply_config(Config())
+    reminder.watch_config(str(path))
+    reminder.scheduler.start()
+    reminder.config_watcher.start()
+    try:
+        reminder._schedule_interval()
+        deadline = reminder.timer.deadline
+        write_atomically(path, "interval = 50\n")
+        end = time.monotonic() + 2
+        while reminder.interval_minutes != 50 and time.monotonic() < end:
+            time.sleep(0.01)
+    finally:
+        reminder.config_watcher.stop()
+        reminder.scheduler.stop(timeout=1)
+    assert reminder.interval_minutes == 50
+    assert reminder.timer.deadline == pytest.approx(deadline + 30 * 60)
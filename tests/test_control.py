@@ -0,0 +1,190 @@
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import time
+
+import pytest
+from unittest.mock import patch
+
+from eyes.cli import main
+from eyes.core.control import (
+    AlreadyRunningError,
+    ControlClient,
+    ControlServer,
+    DaemonNotRunningError,
+    send_command,
+)
+from eyes.core.async_reminder import AsyncReminder
+from eyes.core.reminder import AdvancedReminder
+
+
+class FakeAdvancedReminder(AdvancedReminder):
+    """Advanced reminder that counts notifications instead of showing them."""
+
+    shown = 0
+
+    def show_notification(self, title, message, timeout=None):
+        self.shown += 1
+
+    def show_reminder_with_actions(self, title, message, actions):
+        self.shown += 1
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "eyes.sock")
+
+
+@pytest.fixture
+def daemon(socket_path):
+    reminder = FakeAdvancedReminder(interval_minutes=20, snooze_minutes=5)
+    reminder._schedule_interval()
+    server = ControlServer(reminder.handle_control, socket_path)
+    server.start()
+    yield reminder
+    server.close()
+
+
+def test_status_reply_is_structured(daemon, socket_path):
+    """Test that status returns the daemon state as JSON."""
+    reply = send_command("status", path=socket_path)
+    assert reply["ok"] is True
+    assert reply["pid"] == os.getpid()
+    assert reply["interval_minutes"] == 20
+    assert reply["next_fire_time"] == pytest.approx(time.time() + 20 * 60, abs=5)
+
+def test_show_snooze_and_stop(daemon, socket_path):
+    """Test that control commands reach the reminder."""
+    with ControlClient(socket_path) as client:
+        assert client.request("show")["ok"] is True
+        assert daemon.shown == 1
+        reply = client.request("snooze", minutes=2)
+        assert reply["next_fire_time"] == pytest.approx(time.time() + 120, abs=5)
+        assert reply["pending_events"] == 1
+        client.request("stop")
+    assert daemon.should_run is False
+
+def test_bad_requests_get_errors(daemon, socket_path):
+    """Test that malformed and unknown requests are rejected without closing the socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(2)
+        sock.connect(socket_path)
+        sock.sendall(b'not json\n{"cmd": "explode"}\n')
+        reader = sock.makefile()
+        replies = reader.readline(), reader.readline()
+    assert "bad request" in replies[0]
+    assert "unknown command" in replies[1]
+    assert send_command("explode", path=socket_path)["ok"] is False
+
+def test_round_trip_latency(daemon, socket_path):
+    """Test that control round-trips on a persistent connection are sub-millisecond."""
+    with ControlClient(socket_path) as client:
+        for _ in range(50):
+            client.request("status")
+        samples = []
+        for _ in range(500):
+            start = time.perf_counter()
+            client.request("next-fire-time")
+            samples.append(time.perf_counter() - start)
+    assert statistics.median(samples) < 0.001
+
+def test_socket_is_single_instance_lock(daemon, socket_path):
+    """Test that a second daemon cannot bind a live socket."""
+    with pytest.raises(AlreadyRunningError):
+        ControlServer(lambda request: {}, socket_path).bind()
+
+def test_stale_socket_is_replaced(socket_path):
+    """Test that a socket file left by a crashed daemon is reclaimed."""
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+    server = ControlServer(lambda request: {"stale": False}, socket_path)
+    server.start()
+    try:
+        assert send_command("status", path=socket_path)["stale"] is False
+    finally:
+        server.close()
+    assert not os.path.exists(socket_path)
+
+def test_ctl_without_daemon(socket_path):
+    """Test that eyes ctl exits non-zero when no daemon is running."""
+    with pytest.raises(DaemonNotRunningError):
+        send_command("status", path=socket_path)
+    with patch.object(sys, 'argv', ['eyes', 'ctl', 'status', '--socket', socket_path]):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 1
+
+def test_snooze_postpones_instead_of_adding_a_reminder(daemon, socket_path):
+    """Test that ctl snooze replaces a pending snooze and moves the interval."""
+    daemon.handle_reminder_action("snooze")
+    reply = send_command("snooze", path=socket_path, minutes=30)
+    assert daemon._snooze_event.cancelled is True
+    assert reply["pending_events"] == 1
+    assert reply["next_fire_time"] == pytest.approx(time.time() + 30 * 60, abs=5)
+
+def test_snooze_minutes_are_validated(daemon, socket_path):
+    """Test that zero, negative and non-numeric minutes are rejected."""
+    for minutes in (0, -5, "10", True):
+        reply = send_command("snooze", path=socket_path, minutes=minutes)
+        assert reply["ok"] is False
+    assert daemon.next_fire_time() == pytest.approx(time.time() + 20 * 60, abs=5)
+
+def test_signal_and_socket_show_behave_the_same(daemon, socket_path):
+    """Test that SIGUSR1 also clears an active advanced reminder."""
+    daemon.show_gate.window = 0.0
+    daemon.show_reminder()
+    daemon._signal_show_reminder(None, None)
+    send_command("show", path=socket_path)
+    assert daemon.shown == 3
+
+def test_lock_is_held_while_socket_file_is_missing(daemon, socket_path):
+    """Test that a second daemon cannot take over even if the socket file vanishes."""
+    os.unlink(socket_path)
+    with pytest.raises(AlreadyRunningError):
+        ControlServer(lambda request: {}, socket_path).bind()
+
+def test_slow_client_does_not_stall_others(daemon, socket_path):
+    """Test that a client that never reads its replies can't block other clients."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stuck:
+        stuck.connect(socket_path)
+        stuck.setblocking(False)
+        request = b'{"cmd": "status"}\n' * 2000
+        try:
+            stuck.send(request)
+        except BlockingIOError:
+            pass
+        start = time.perf_counter()
+        assert send_command("status", path=socket_path)["ok"] is True
+        assert time.perf_counter() - start < 0.5
+
+def test_asyncio_engine_serves_control_socket(socket_path):
+    """Test status and stop through the socket while the asyncio engine runs."""
+    reminder = FakeAdvancedReminder(interval_minutes=20, snooze_minutes=5)
+    engine = AsyncReminder(reminder, handle_signals=False, control_path=socket_path)
+
+    async def request(cmd):
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        writer.write(f'{{"cmd": "{cmd}"}}\n'.encode())
+        line = await reader.readline()
+        writer.close()
+        return line
+
+    async def scenario():
+        task = asyncio.ensure_future(engine.run())
+        async def wait_for_socket():
+            while not os.path.exists(socket_path):
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(wait_for_socket(), 2)
+        status = await asyncio.wait_for(request("status"), 2)
+        stop = await asyncio.wait_for(request("stop"), 2)
+        await asyncio.wait_for(task, 2)
+        return status, stop
+
+    status, stop = asyncio.run(scenario())
+    assert b'"interval_minutes":20' in status
+    assert b'"running":false' in stop
+    assert reminder.should_run is False
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,128 @@
+import threading
+import time
+
+from eyes.core.backends import Backend
+from eyes.core.dispatch import Dispatcher
+from eyes.core.scheduler import Scheduler
+
+
+class RecordingBackend(Backend):
+    """Backend that records notifications, optionally after a delay."""
+
+    supports_actions = False
+
+    def __init__(self, name, delay=0.0, action=None):
+        self.name = name
+        self.delay = delay
+        self.action = action
+        self.sent = []
+        self.release = threading.Event()
+        super().__init__()
+
+    def notify(self, title, message, timeout=None):
+        if self.delay:
+            self.release.wait(self.delay)
+        self.sent.append((title, message))
+
+    def notify_with_actions(self, title, message, actions):
+        self.notify(title, message)
+        return self.action
+
+
+def test_submit_delivers_in_background():
+    """Test that submit returns immediately and the worker delivers."""
+    backend = RecordingBackend("fast")
+    dispatcher = Dispatcher([backend])
+    try:
+        dispatcher.submit("Title", "Message")
+        assert dispatcher.join(2)
+        assert backend.sent == [("Title", "Message")]
+        assert dispatcher.stats["delivered"] == 1
+    finally:
+        dispatcher.stop(timeout=1)
+
+def test_slow_backend_times_out_and_falls_back():
+    """Test that a hung backend hits the deadline and the next one delivers."""
+    slow = RecordingBackend("slow", delay=30)
+    fast = RecordingBackend("fast")
+    dispatcher = Dispatcher([slow, fast], deadline=0.05)
+    try:
+        dispatcher.submit("Title", "one")
+        dispatcher.submit("Title", "two")
+        assert dispatcher.join(2)
+        assert fast.sent == [("Title", "one"), ("Title", "two")]
+        # The second notification skips the still-hung backend entirely
+        assert dispatcher.stats["timeouts"] == 1
+        assert dispatcher.stats["fallbacks"] == 2
+        assert "slow" in dispatcher.last_error
+    finally:
+        slow.release.set()
+        dispatcher.stop(timeout=1)
+
+def test_full_queue_drops_oldest():
+    """Test that a full queue drops the oldest notification instead of blocking."""
+    blocker = RecordingBackend("blocker", delay=30)
+    dispatcher = Dispatcher([blocker], deadline=5, maxsize=2)
+    try:
+        dispatcher.submit("Title", "first")
+        deadline = time.monotonic() + 2
+        while dispatcher._queue and time.monotonic() < deadline:
+            time.sleep(0.005)
+        start = time.perf_counter()
+        for i in range(5):
+            dispatcher.submit("Title", f"queued {i}")
+        assert time.perf_counter() - start < 0.05
+        assert dispatcher.stats["dropped"] == 3
+        assert [n.message for n in dispatcher._queue] == ["queued 3", "queued 4"]
+    finally:
+        blocker.release.set()
+        dispatcher.stop(timeout=1)
+
+def test_action_result_reported():
+    """Test that the chosen action is passed to on_result, or None if undelivered."""
+    backend = RecordingBackend("actions", action="Snooze 5min")
+    backend.supports_actions = True
+    broken = RecordingBackend("broken")
+    broken.notify = lambda *args: 1 / 0
+    results = []
+    dispatcher = Dispatcher([backend])
+    failing = Dispatcher([broken])
+    try:
+        dispatcher.submit("Title", "Message", actions=["Take Break"], on_result=results.append)
+        failing.submit("Title", "Message", on_result=results.append)
+        assert dispatcher.join(2) and failing.join(2)
+        assert sorted(results, key=str) == [None, "Snooze 5min"]
+        assert failing.stats["failures"] == 1
+        assert failing.stats["undelivered"] == 1
+    finally:
+        dispatcher.stop(timeout=1)
+        failing.stop(timeout=1)
+
+def test_slow_backend_does_not_disturb_schedule():
+    """Test that interval firings stay on time while the backend hangs."""
+    slow = RecordingBackend("slow", delay=30)
+    dispatcher = Dispatcher([slow], deadline=0.2)
+    scheduler = Scheduler()
+    period = 0.02
+    lateness = []
+    start = time.monotonic()
+
+    def fire(n):
+        lateness.append(time.monotonic() - (start + n * period))
+        dispatcher.submit("Title", f"tick {n}")
+
+    for n in range(1, 26):
+        scheduler.schedule_at(start + n * period, fire, n)
+    scheduler.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(lateness) < 25 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(lateness) == 25
+        # Every firing stays within a scheduling quantum despite the hung backend
+        assert max(lateness) < 0.05
+        assert threading.active_count() < 10
+    finally:
+        scheduler.stop(timeout=1)
+        slow.release.set()
+        dispatcher.stop(timeout=1)
@@ -0,0 +1,105 @@
+import sys
+import time
+from unittest.mock import patch
+
+from eyes.cli import main
+from eyes.core.history import EVENTS, HistoryStore, HistoryWriter
+
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+DAY = 24 * 3600
+
+
+class RecordingHistory:
+    """Stand-in writer that keeps events in a list."""
+
+    def __init__(self):
+        self.events = []
+
+    def record(self, kind, profile=None):
+        self.events.append((kind, profile))
+
+
+def test_writer_batches_events(tmp_path):
+    """Test that buffered events land in the log and the daily rollups."""
+    path = str(tmp_path / "history.db")
+    writer = HistoryWriter(path, batch_size=1000, flush_interval=60)
+    for _ in range(3):
+        writer.record("shown")
+    writer.record("snoozed", "water")
+    writer.record("acknowledged")
+    assert writer.flush(2)
+    writer.close()
+    assert writer.written == 5
+
+    store = HistoryStore(path)
+    (day, counts), = store.daily().items()
+    assert counts == {"shown": 3, "snoozed": 1, "acknowledged": 1, "missed": 0}
+    assert store.daily(profile="water")[day]["snoozed"] == 1
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert store.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 5
+    store.close()
+
+def test_record_does_not_wait_for_disk(tmp_path):
+    """Test that recording stays in memory while the writer fills a batch."""
+    writer = HistoryWriter(str(tmp_path / "history.db"), batch_size=100_000, flush_interval=60)
+    start = time.perf_counter()
+    for _ in range(10_000):
+        writer.record("shown")
+    elapsed = time.perf_counter() - start
+    assert writer.written == 0
+    assert elapsed < 0.5
+    writer.close()
+    assert writer.written == 10_000
+
+def test_aggregates_over_years_use_rollups(tmp_path):
+    """Test that weekly stats over five years come from rollups in milliseconds."""
+    store = HistoryStore(str(tmp_path / "history.db"))
+    start = time.time() - 5 * 365 * DAY
+    events = []
+    for day in range(5 * 365):
+        for n in range(24):
+            events.append((start + day * DAY + n * 600, EVENTS[n % 3], None))
+    store.append(events)
+
+    begin = time.perf_counter()
+    weeks = store.weekly()
+    elapsed = time.perf_counter() - begin
+    assert sum(week["shown"] for week in weeks.values()) == 5 * 365 * 8
+    assert elapsed < 0.05
+    plan = " ".join(
+        row[-1] for row in store.conn.execute(
+            "EXPLAIN QUERY PLAN SELECT day, kind, SUM(count) FROM daily "
+            "WHERE day >= ? GROUP BY day, kind", ("2020-01-01",)
+        )
+    )
+    assert "events" not in plan
+    store.close()
+
+def test_reminder_records_events():
+    """Test that shows, snoozes, acknowledgements and missed reminders are recorded."""
+    reminder = make_reminder(FakeAdvancedReminder)
+    reminder.history = RecordingHistory()
+    reminder.show_reminder()
+    reminder.show_reminder()
+    reminder.handle_reminder_action("snooze")
+    reminder.show_reminder()
+    reminder.handle_reminder_action("acknowledged")
+    kinds = [kind for kind, _ in reminder.history.events]
+    assert kinds == ["shown", "missed", "snoozed", "shown", "acknowledged"]
+
+def test_stats_command(tmp_path, capsys):
+    """Test that eyes stats prints per-day counts from the history database."""
+    path = str(tmp_path / "history.db")
+    store = HistoryStore(path)
+    now = time.time()
+    store.append([(now, "shown", None), (now, "acknowledged", None), (now, "snoozed", None)])
+    store.close()
+    with patch.object(sys, "argv", ["eyes", "stats", "--db", path]):
+        main()
+    out = capsys.readouterr().out
+    assert "Breaks" in out
+    assert time.strftime("%Y-%m-%d") in out
+    with patch.object(sys, "argv", ["eyes", "stats", "--db", path, "--weeks", "2", "--json"]):
+        main()
+    assert '"acknowledged": 1' in capsys.readouterr().out
@@ -0,0 +1,134 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from eyes.core.config import parse_config
+from eyes.core.hooks import Hook, HookRunner, parse_hooks
+
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="uses a POSIX shell")
+
+EVENTS = []
+RELEASE = threading.Event()
+
+
+def record_event(event):
+    """Python hook entry point used by the tests."""
+    EVENTS.append(event)
+
+
+def wedged(event):
+    """Python hook that hangs until the test lets it go."""
+    RELEASE.wait(5)
+
+
+def wait_for(predicate, timeout=2):
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.005)
+    return predicate()
+
+
+@pytest.mark.parametrize("items, error", [
+    ([{"event": "shown"}], "exactly one of command or python"),
+    ([{"event": "blinked", "command": "true"}], "event must be one or more"),
+    ([{"event": "shown", "command": []}], "command must be"),
+    ([{"event": "shown", "python": "no_colon"}], "python must look like"),
+    ([{"event": "shown", "command": "true", "timeout": 0}], "timeout must be"),
+    ([{"event": "shown", "command": "true", "concurrency": 0}], "concurrency must be"),
+    ([{"event": "shown", "command": "true", "retries": 3}], r"hooks\[0\]: unknown keys retries"),
+])
+def test_invalid_hooks_rejected(items, error):
+    """Test that bad [[hooks]] tables are caught when the config is read."""
+    with pytest.raises(ValueError, match=error):
+        parse_hooks(items)
+
+def test_python_hooks_follow_reminder_events():
+    """Test that shown, snoozed and acknowledged events reach a Python hook."""
+    EVENTS.clear()
+    config = parse_config({"hooks": [
+        {"event": ["shown", "snoozed", "acknowledged"], "python": "tests.test_hooks:record_event",
+         "concurrency": 4},
+    ]})
+    reminder = make_reminder(FakeAdvancedReminder)
+    reminder.name = "eyes"
+    reminder.apply_config(config)
+    reminder.show_reminder()
+    reminder.handle_reminder_action("snooze")
+    reminder.show_reminder()
+    reminder.handle_reminder_action("acknowledged")
+    reminder.hooks.stop(timeout=2)
+    assert sorted(event["event"] for event in EVENTS) == [
+        "acknowledged", "shown", "shown", "snoozed",
+    ]
+    assert all(event["profile"] == "eyes" for event in EVENTS)
+    assert reminder.status()["hooks"]["ok"] == 4
+
+@posix_only
+def test_command_hook_gets_event_in_environment(tmp_path):
+    """Test that shell hooks run with EYES_EVENT and EYES_PROFILE set."""
+    out = tmp_path / "events"
+    runner = HookRunner([Hook(["shown"], command=f'echo "$EYES_EVENT $EYES_PROFILE" >> {out}')])
+    runner.fire("shown", "water")
+    runner.fire("snoozed", "water")
+    runner.stop(timeout=2)
+    assert out.read_text() == "shown water\n"
+    assert runner.stats["ok"] == 1
+
+@posix_only
+def test_command_timeout_kills_process_group(tmp_path):
+    """Test that an overrunning command and its children are killed at the timeout."""
+    marker = tmp_path / "survived"
+    runner = HookRunner([Hook(["shown"], command=f"sleep 0.5 && touch {marker}", timeout=0.1)])
+    start = time.monotonic()
+    runner.fire("shown")
+    runner.stop(timeout=2)
+    assert time.monotonic() - start < 0.4
+    assert runner.stats["timeout"] == 1
+    time.sleep(0.6)
+    assert not marker.exists()
+
+def test_wedged_hook_never_delays_the_caller():
+    """Test that a hung hook is dropped past its concurrency and never blocks fire()."""
+    RELEASE.clear()
+    hook = Hook(["shown"], python="tests.test_hooks:wedged", timeout=0.05, concurrency=2)
+    runner = HookRunner([hook], max_workers=2)
+    threads = threading.active_count()
+    try:
+        start = time.perf_counter()
+        for _ in range(1000):
+            runner.fire("shown")
+        elapsed = time.perf_counter() - start
+        assert elapsed < 0.5
+        assert runner.stats["dropped"] == 998
+        assert wait_for(lambda: runner.stats["timeout"] == 2)
+        # Pool workers are free again; only the two hung calls remain
+        assert threading.active_count() - threads <= 4
+        runner.fire("shown")
+        assert runner.stats["dropped"] == 999
+    finally:
+        RELEASE.set()
+    assert wait_for(lambda: hook.slots.acquire(blocking=False))
+    runner.stop(timeout=2)
+
+def test_slow_hook_does_not_hold_up_the_scheduler():
+    """Test that reminders keep firing on time while a hook is stuck."""
+    RELEASE.clear()
+    reminder = make_reminder(FakeAdvancedReminder)
+    reminder.hooks.configure([Hook(["shown"], python="tests.test_hooks:wedged", timeout=5)])
+    reminder.scheduler.start()
+    try:
+        fired = threading.Event()
+        start = time.perf_counter()
+        reminder.scheduler.schedule(0, reminder.show_reminder)
+        reminder.scheduler.schedule(0.01, fired.set)
+        assert fired.wait(1)
+        assert time.perf_counter() - start < 0.5
+        assert len(reminder.notifications) == 1
+    finally:
+        RELEASE.set()
+        reminder.scheduler.stop(timeout=1)
+        reminder.hooks.stop(timeout=2)
@@ -0,0 +1,226 @@
+import pytest
+
+from eyes.core.clock import SimulatedClock
+from eyes.core.idle import (
+    DBusIdleProbe, IdleMonitor, IdleProbe, IdleUnavailableError, select_probe,
+)
+from eyes.core.scheduler import Scheduler
+from eyes.platforms.linux import dbus
+
+from tests.test_linux import FakeNotificationServer, wait_for
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+
+class FakeInput(IdleProbe):
+    """Stand-in input source: idle time is how long ago touch() was last called."""
+
+    name = "fake"
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.last_input = clock()
+        self.failing = False
+        super().__init__()
+
+    def touch(self):
+        self.last_input = self.clock()
+
+    def idle_seconds(self):
+        if self.failing:
+            raise IdleUnavailableError("probe went away")
+        return self.clock() - self.last_input
+
+
+class IdleBusServer(FakeNotificationServer):
+    """Stand-in session bus whose desktop reports an idle time, like GNOME or KDE."""
+
+    def __init__(self, path, interface="org.gnome.Mutter.IdleMonitor"):
+        super().__init__(path)
+        self.interface = interface
+        self.idle_ms = 0
+
+    def _handle(self, sock, message):
+        if message.member not in ("GetIdletime", "GetSessionIdleTime"):
+            return super()._handle(sock, message)
+        self.calls.append(message.member)
+        fields = {dbus.REPLY_SERIAL: message.serial, dbus.SENDER: ":1.7"}
+        if message.fields.get(dbus.INTERFACE) != self.interface:
+            fields.update({dbus.ERROR_NAME: "org.freedesktop.DBus.Error.ServiceUnknown",
+                           dbus.SIGNATURE: "s"})
+            reply = dbus.Message(dbus.ERROR, fields, ("not here",), serial=self._next_serial())
+        else:
+            fields[dbus.SIGNATURE] = "t" if message.member == "GetIdletime" else "u"
+            reply = dbus.Message(dbus.METHOD_RETURN, fields, (self.idle_ms,),
+                                 serial=self._next_serial())
+        sock.sendall(reply.encode())
+
+
+def watch(reminder=None, threshold=300.0):
+    clock = reminder.clock if reminder is not None else SimulatedClock()
+    scheduler = reminder.scheduler if reminder is not None else Scheduler(clock=clock)
+    probe = FakeInput(clock)
+    monitor = IdleMonitor(probe, threshold=threshold)
+    changes = []
+    monitor.subscribe(lambda away, since: changes.append((away, since)))
+    if reminder is not None:
+        reminder.idle = monitor
+        reminder._schedule_interval()
+        reminder._start_idle()
+    else:
+        monitor.start(scheduler)
+    return clock, scheduler, probe, monitor, changes
+
+
+def work(clock, scheduler, probe, until, every=10):
+    """Type something every few seconds until the given time."""
+    while clock() + every <= until:
+        clock.run(scheduler, clock() + every)
+        probe.touch()
+    clock.run(scheduler, until)
+
+
+def test_samples_rarely_while_someone_is_working():
+    """Test that steady input costs about one sample per threshold, not one per second."""
+    clock, scheduler, probe, monitor, changes = watch()
+    work(clock, scheduler, probe, 8 * 3600)
+    assert changes == []
+    # A fixed one-second poll would have taken 28800
+    assert monitor.samples <= 8 * 3600 / 300 * 1.2
+
+def test_leaving_is_noticed_as_the_threshold_passes():
+    """Test that sampling tightens near the threshold, so a departure is seen promptly."""
+    clock, scheduler, probe, monitor, changes = watch()
+    work(clock, scheduler, probe, 1000)
+    probe.touch()
+    clock.run(scheduler, 1000 + 300 + 1)
+    assert changes == [(True, 1000)]
+    assert monitor.away is True
+
+def test_sampling_backs_off_while_away_and_dates_the_return():
+    """Test that a long absence is sampled sparsely and the return time comes from the probe."""
+    clock, scheduler, probe, monitor, changes = watch()
+    clock.run(scheduler, 3 * 3600)
+    assert changes == [(True, 0)]
+    away_samples = monitor.samples
+    clock.run(scheduler, 3 * 3600 + 1800)
+    # About one a minute after the first few, not one a second
+    assert monitor.samples - away_samples <= 35
+    probe.touch()
+    returned = clock()
+    clock.run(scheduler, returned + 60)
+    assert changes[-1] == (False, returned)
+    assert monitor.away is False
+
+def test_failing_probe_means_someone_is_there():
+    """Test that a broken probe never pauses reminders and ends a pause in progress."""
+    clock, scheduler, probe, monitor, changes = watch()
+    clock.run(scheduler, 400)
+    assert monitor.away is True
+    probe.failing = True
+    clock.run(scheduler, 500)
+    assert monitor.away is False
+    assert changes[-1][0] is False and 400 < changes[-1][1] <= 500
+    errors = monitor.errors
+    clock.run(scheduler, 500 + 600)
+    assert monitor.away is False
+    # Retried at the slowest rate
+    assert monitor.errors - errors <= 11
+
+def test_countdown_pauses_while_away():
+    """Test that time away neither counts towards the interval nor piles up reminders."""
+    reminder = make_reminder(FakeAdvancedReminder, interval_minutes=20, handle_signals=False,
+                             clock=SimulatedClock())
+    clock, scheduler, probe, monitor, _ = watch(reminder)
+    # Ten minutes of work, then an hour away
+    work(clock, scheduler, probe, 600)
+    clock.run(scheduler, 4200)
+    assert reminder.notifications == []
+    assert reminder.next_fire_time() is None
+    assert reminder.status()["paused"] is True
+    # Back: the ten minutes that were left count from the latest input the
+    # noticing sample saw, at most one away sample after the return
+    clock.now = 4210
+    probe.touch()
+    work(clock, scheduler, probe, 4210 + 120)
+    assert reminder.timer.paused is None
+    assert 4210 + 600 <= reminder.timer.deadline <= 4210 + 600 + monitor.max_interval
+    work(clock, scheduler, probe, 4210 + 590)
+    assert reminder.notifications == []
+    work(clock, scheduler, probe, reminder.timer.deadline + 10)
+    assert len(reminder.notifications) == 1
+
+def test_snooze_is_held_while_away():
+    """Test that a snooze running out on an empty desk waits for the user to come back."""
+    reminder = make_reminder(FakeAdvancedReminder, interval_minutes=20, handle_signals=False,
+                             clock=SimulatedClock())
+    clock, scheduler, probe, monitor, _ = watch(reminder, threshold=120)
+    reminder.show_reminder()
+    reminder.handle_reminder_action("snooze")
+    clock.run(scheduler, 3600)
+    assert len(reminder.notifications) == 1
+    # Left the moment they snoozed, so the whole snooze is still owed
+    assert reminder.state_entry()["snooze"] == pytest.approx(clock.wall() + 300)
+    probe.touch()
+    work(clock, scheduler, probe, 3600 + 120)
+    snooze_at = reminder._snooze_event.deadline
+    assert 3600 + 300 <= snooze_at <= 3600 + 300 + monitor.max_interval
+    work(clock, scheduler, probe, snooze_at - 10)
+    assert len(reminder.notifications) == 1
+    work(clock, scheduler, probe, snooze_at + 10)
+    assert len(reminder.notifications) == 2
+
+def test_paused_schedule_is_saved():
+    """Test that a restart while nobody is there resumes with the time that was left."""
+    reminder = make_reminder(FakeAdvancedReminder, interval_minutes=20, handle_signals=False,
+                             clock=SimulatedClock())
+    clock, scheduler, probe, monitor, _ = watch(reminder)
+    work(clock, scheduler, probe, 500)
+    clock.run(scheduler, 2000)
+    assert reminder.state_entry()["next"] == pytest.approx(clock.wall() + 700, abs=10)
+
+def test_dbus_probe_reads_desktop_idle_time(tmp_path, monkeypatch):
+    """Test the Linux probe against a stand-in bus, falling back from GNOME to KDE."""
+    for interface, member in (("org.gnome.Mutter.IdleMonitor", "GetIdletime"),
+                              ("org.freedesktop.ScreenSaver", "GetSessionIdleTime")):
+        server = IdleBusServer(tmp_path / f"{member}.bus", interface)
+        monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", server.address)
+        try:
+            probe = DBusIdleProbe()
+            server.idle_ms = 42_500
+            assert probe.idle_seconds() == pytest.approx(42.5)
+            assert probe.source[2] == interface
+            # One connection, reused for every sample
+            probe.idle_seconds()
+            assert server.calls.count("Hello") == 1
+            assert server.calls.count(member) == 3
+            probe.close()
+        finally:
+            server.close()
+
+def test_dbus_probe_reconnects_after_bus_restart(tmp_path, monkeypatch):
+    """Test that a dropped bus connection is re-established on the next sample."""
+    server = IdleBusServer(tmp_path / "bus")
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", server.address)
+    try:
+        probe = DBusIdleProbe()
+        server.drop_clients()
+        server.idle_ms = 1000
+        assert wait_for(lambda: probe.connection.closed)
+        assert probe.idle_seconds() == pytest.approx(1.0)
+        assert server.calls.count("Hello") == 2
+        probe.close()
+    finally:
+        server.close()
+
+def test_no_idle_source_disables_detection(tmp_path, monkeypatch):
+    """Test that a bus without an idle service, or no bus at all, just turns detection off."""
+    server = IdleBusServer(tmp_path / "bus", interface="org.example.Nothing")
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", server.address)
+    try:
+        with pytest.raises(IdleUnavailableError):
+            DBusIdleProbe()
+        assert select_probe(["dbus"]) is None
+    finally:
+        server.close()
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", f"unix:path={tmp_path / 'missing'}")
+    assert select_probe(["dbus", "quartz", "win32"]) is None
@@ -0,0 +1,188 @@
+import socket
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from eyes.core.backends import BackendRegistry, BackendUnavailableError, DBusBackend
+from eyes.platforms.linux import dbus, reminder as linux_reminder
+
+
+class FakeNotificationServer:
+    """Stand-in session bus that is also the notification service."""
+
+    def __init__(self, path):
+        self.address = f"unix:path={path}"
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(str(path))
+        self.listener.listen()
+        self.connections = []
+        self.calls = []
+        self.notifications = {}
+        self._next_id = 0
+        self._serial = 1000
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except OSError:
+                return
+            self.connections.append(sock)
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock):
+        buf = b""
+        try:
+            while not buf.endswith(b"\r\n"):  # NUL byte and AUTH EXTERNAL
+                buf += sock.recv(4096)
+            sock.sendall(b"OK 0123456789abcdef\r\n")
+            while b"BEGIN\r\n" not in buf:
+                buf += sock.recv(4096)
+            buf = bytearray(buf.split(b"BEGIN\r\n", 1)[1])
+            while True:
+                length = dbus.message_length(buf)
+                if length is not None and len(buf) >= length:
+                    message = dbus.Message.decode(bytes(buf[:length]))
+                    del buf[:length]
+                    self._handle(sock, message)
+                    continue
+                chunk = sock.recv(4096)
+                if not chunk:
+                    return
+                buf.extend(chunk)
+        except OSError:
+            return
+
+    def _handle(self, sock, message):
+        self.calls.append(message.member)
+        signature, body = "", ()
+        if message.member == "Hello":
+            signature, body = "s", (":1.42",)
+        elif message.member == "Notify":
+            _, replaces, _, title, text, actions, _, expire = message.body
+            if replaces not in self.notifications:
+                self._next_id += 1
+                replaces = self._next_id
+            self.notifications[replaces] = (title, text, actions, expire)
+            signature, body = "u", (replaces,)
+        fields = {dbus.REPLY_SERIAL: message.serial, dbus.SENDER: "org.freedesktop.DBus"}
+        if signature:
+            fields[dbus.SIGNATURE] = signature
+        sock.sendall(dbus.Message(dbus.METHOD_RETURN, fields, body, serial=self._next_serial()).encode())
+
+    def _next_serial(self):
+        self._serial += 1
+        return self._serial
+
+    def emit(self, member, signature, *args):
+        """Send a notification-service signal to every client."""
+        fields = {
+            dbus.PATH: "/org/freedesktop/Notifications",
+            dbus.INTERFACE: "org.freedesktop.Notifications",
+            dbus.MEMBER: member,
+            dbus.SIGNATURE: signature,
+            dbus.SENDER: ":1.1",
+        }
+        data = dbus.Message(dbus.SIGNAL, fields, args, serial=self._next_serial()).encode()
+        for sock in self.connections:
+            sock.sendall(data)
+
+    def drop_clients(self):
+        for sock in self.connections:
+            sock.shutdown(socket.SHUT_RDWR)
+            sock.close()
+        self.connections = []
+
+    def close(self):
+        self.drop_clients()
+        self.listener.close()
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    server = FakeNotificationServer(tmp_path / "bus")
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", server.address)
+    yield server
+    server.close()
+
+
+def wait_for(predicate, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_message_roundtrip():
+    """Test that a Notify call survives encoding and decoding."""
+    args = ("Eyes", 7, "", "Title", "Body", ["snooze", "Snooze"], {"urgency": ("y", 1)}, -1)
+    message = dbus.Message(
+        dbus.METHOD_CALL,
+        {dbus.PATH: "/org/freedesktop/Notifications", dbus.MEMBER: "Notify",
+         dbus.SIGNATURE: "susssasa{sv}i"},
+        args, serial=3,
+    )
+    data = message.encode()
+    assert dbus.message_length(data) == len(data)
+    decoded = dbus.Message.decode(data)
+    assert decoded.serial == 3
+    assert decoded.body[:6] == args[:6]
+    assert decoded.body[6] == {"urgency": 1}
+
+def test_notifications_replace_over_one_connection(server):
+    """Test that repeated reminders reuse one connection and replace by ID, with no subprocess."""
+    with patch("subprocess.Popen") as popen:
+        backend = DBusBackend()
+        for _ in range(3):
+            backend.notify("Eye Break", "Look away", timeout=30)
+    popen.assert_not_called()
+    assert len(server.connections) == 1
+    assert server.calls.count("Hello") == 1
+    assert list(server.notifications) == [1]
+    assert server.notifications[1][3] == 30_000
+    backend.connection.close()
+
+def test_action_invoked_reaches_reminder(server, monkeypatch):
+    """Test that a Snooze click on the server snoozes the reminder."""
+    registry = BackendRegistry()
+    registry.register(DBusBackend)
+    monkeypatch.setattr(linux_reminder, "registry", registry)
+    reminder = linux_reminder.LinuxAdvancedReminder(snooze_minutes=5, backend="dbus")
+    try:
+        reminder.show_reminder()
+        assert reminder.dispatcher.join(2)
+        (title, _, actions, expire), = server.notifications.values()
+        assert actions == ["acknowledged", "Take Break", "snooze", "Snooze 5min"]
+        assert expire == 0
+        # No click yet: the reminder falls back to auto-acknowledging
+        assert reminder._acknowledge_event.cancelled is False
+        server.emit("ActionInvoked", "us", 1, "snooze")
+        assert wait_for(lambda: reminder._snooze_event is not None)
+        assert reminder._acknowledge_event.cancelled is True
+        assert reminder.is_reminder_active is False
+    finally:
+        reminder.dispatcher.stop(timeout=1)
+        reminder.backend.connection.close()
+
+def test_reconnects_after_bus_restart(server):
+    """Test that a dropped connection is re-established on the next notification."""
+    backend = DBusBackend()
+    backend.notify("Eye Break", "Look away")
+    server.drop_clients()
+    assert wait_for(lambda: backend.connection.closed)
+    backend.notify("Eye Break", "Look away")
+    assert server.calls.count("Hello") == 2
+    # The server kept the notification, so it is still replaced, not stacked
+    assert list(server.notifications) == [1]
+    backend.connection.close()
+
+def test_unavailable_without_notification_service(tmp_path, monkeypatch):
+    """Test that a missing bus makes the backend unavailable rather than crashing."""
+    monkeypatch.setenv("DBUS_SESSION_BUS_ADDRESS", f"unix:path={tmp_path / 'missing'}")
+    with pytest.raises(BackendUnavailableError):
+        DBusBackend()
@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from eyes.core.log import LogWriter, QueueHandler, parse_rotation, setup_logging
+from eyes.core.ratelimit import ShowGate
+
+from tests.test_reminder import FakeReminder, make_reminder
+
+
+@pytest.fixture
+def eyes_logger():
+    """The eyes logger, put back as it was after the test."""
+    logger = logging.getLogger("eyes")
+    saved = logger.handlers[:], logger.level, logger.propagate
+    yield logger
+    logger.handlers[:], logger.level, logger.propagate = saved
+
+
+class WedgedHandler(logging.Handler):
+    """Sink that blocks on every record until released, like a full launchd pipe."""
+
+    def __init__(self):
+        super().__init__()
+        self.unblock = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.unblock.wait(10)
+        self.records.append(record)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1M", ("size", 1024 ** 2)),
+    ("512k", ("size", 512 * 1024)),
+    ("4096", ("size", 4096)),
+    ("daily", ("time", "midnight")),
+    ("hourly", ("time", "H")),
+])
+def test_parse_rotation(text, expected):
+    """Test that sizes and hourly/daily are accepted for log rotation."""
+    assert parse_rotation(text) == expected
+
+@pytest.mark.parametrize("text", ["", "0M", "10X", "weekly"])
+def test_bad_rotation_rejected(text):
+    """Test that nonsense rotation settings are refused."""
+    with pytest.raises(ValueError, match="bad log rotation"):
+        parse_rotation(text)
+
+def test_json_lines_with_size_rotation(tmp_path, eyes_logger):
+    """Test that records are written as JSON lines with extra fields and rotated by size."""
+    path = tmp_path / "eyes.log"
+    writer = setup_logging(str(path), level="debug", rotate="2K", backups=2, console=False)
+    log = logging.getLogger("eyes.core.reminder")
+    for i in range(100):
+        log.info("Reminder %s", "shown", extra={"event": "shown", "seq": i})
+    log.warning("Could not write break history: disk full")
+    writer.stop()
+    assert sorted(os.listdir(tmp_path)) == ["eyes.log", "eyes.log.1", "eyes.log.2"]
+    assert all(f.stat().st_size <= 2048 for f in tmp_path.iterdir())
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    assert entries[-1]["level"] == "warning"
+    assert entries[-2]["message"] == "Reminder shown"
+    assert entries[-2]["logger"] == "eyes.core.reminder"
+    assert (entries[-2]["event"], entries[-2]["seq"]) == ("shown", 99)
+
+def test_wedged_sink_does_not_delay_scheduler_or_signals(eyes_logger):
+    """Test that reminders fire on time and SIGUSR1 returns at once while the sink is stuck."""
+    sink = WedgedHandler()
+    records = __import__("queue").SimpleQueue()
+    handler = QueueHandler(records, maxsize=100)
+    eyes_logger.handlers[:] = [handler]
+    eyes_logger.setLevel(logging.DEBUG)
+    eyes_logger.propagate = False
+    writer = LogWriter(records, sink)
+    writer.start()
+    previous = {signum: signal.getsignal(signum) for signum in (signal.SIGUSR1, signal.SIGTERM)}
+    try:
+        reminder = make_reminder(FakeReminder, handle_signals=True)
+        reminder.interval_minutes = 0.02 / 60
+        reminder.timer.resume_check = None
+        reminder.show_gate = ShowGate(window=0.0, rate=1000.0, burst=1000)
+        reminder.scheduler.start()
+        reminder._schedule_interval()
+        start = time.perf_counter()
+        for _ in range(1000):
+            os.kill(os.getpid(), signal.SIGUSR1)
+        signals = time.perf_counter() - start
+        end = time.monotonic() + 5
+        while reminder.timer.jitter.count < 20 and time.monotonic() < end:
+            time.sleep(0.01)
+        reminder.scheduler.stop(timeout=1)
+    finally:
+        for signum, handler_ in previous.items():
+            signal.signal(signum, handler_)
+        sink.unblock.set()
+        writer.stop()
+    assert signals < 1.0
+    assert reminder.timer.jitter.count >= 20
+    assert reminder.timer.jitter.max < 0.1
+    # The queue stayed bounded: what didn't fit was dropped, not buffered
+    assert handler.dropped > 0
+    assert len(sink.records) <= 100 + 1
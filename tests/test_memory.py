@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+import pytest
+
+from eyes.core.backends import Backend, BackendRegistry
+from eyes.core.metrics import rss_bytes
+from eyes.memory import RSS_BUDGET_BYTES, group_by_module
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A lean single-reminder daemon as `eyes --lean` sets it up, with a fake
+# backend so no notification library or desktop session is needed
+LEAN_DAEMON = """
+import json, sys
+import eyes.cli
+args = eyes.cli.parse_args(["--lean"])
+from eyes.core.backends import registry
+registry.limit = 1
+from benchmarks.fakes import HeadlessReminder
+from eyes.core.metrics import rss_bytes
+from eyes.memory import release_setup_modules
+app = HeadlessReminder()
+app.scheduler.start()
+app._schedule_interval()
+app.show_reminder()
+app.dispatcher.join(2)
+release_setup_modules()
+print(json.dumps({"rss": rss_bytes(), "argparse": "argparse" in sys.modules}))
+"""
+
+
+@pytest.mark.skipif(rss_bytes() == 0, reason="RSS is not measurable on this platform")
+def test_lean_daemon_within_rss_budget():
+    """Test that a running lean daemon stays within the documented RSS budget."""
+    result = subprocess.run(
+        [sys.executable, "-c", LEAN_DAEMON],
+        cwd=ROOT, env=dict(os.environ, PYTHONPATH=ROOT),
+        capture_output=True, text=True, timeout=60, check=True,
+    )
+    measured = json.loads(result.stdout.strip().splitlines()[-1])
+    assert measured["argparse"] is False
+    assert measured["rss"] < RSS_BUDGET_BYTES
+
+def test_limit_loads_only_the_selected_backend():
+    """Test that a limited registry never instantiates fallback backends."""
+    created = []
+
+    class First(Backend):
+        name = "first"
+
+        def load(self):
+            created.append(self.name)
+
+    class Second(First):
+        name = "second"
+
+    registry = BackendRegistry()
+    registry.register(First)
+    registry.register(Second)
+    registry.limit = 1
+    assert [b.name for b in registry.select(["first", "second"])] == ["first"]
+    assert created == ["first"]
+
+def test_report_groups_allocations_by_module():
+    """Test that the memory report attributes allocations to the allocating module."""
+    tracemalloc.start()
+    try:
+        blocks = [bytearray(1024) for _ in range(512)]
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    top = group_by_module(snapshot, limit=3)
+    assert top[0][0] == __name__
+    assert top[0][1] >= 512 * 1024
+    assert len(blocks) == 512
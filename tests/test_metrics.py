@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from eyes.core.clock import SimulatedClock
+from eyes.core.metrics import FileExporter, MetricsRegistry, registry
+from eyes.core.reminder import REMINDER_EVENTS, SIGNALS, TIMER_LATENESS
+from eyes.core.scheduler import Scheduler
+
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+
+def test_render_prometheus_text():
+    """Test counters, gauges and histograms in Prometheus text format."""
+    metrics = MetricsRegistry()
+    metrics.counter("jobs_total", "Jobs run", kind="a").inc(3)
+    metrics.gauge("temperature", "Current temperature", fn=lambda: 21.5)
+    latency = metrics.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        latency.observe(value)
+    text = metrics.render()
+    assert "# TYPE jobs_total counter\njobs_total{kind=\"a\"} 3\n" in text
+    assert "temperature 21.5\n" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'latency_seconds_bucket{le="1"} 2\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3\n' in text
+    assert "latency_seconds_count 3\n" in text
+
+def test_same_name_and_labels_share_a_metric():
+    """Test that asking twice returns the same metric and types can't change."""
+    metrics = MetricsRegistry()
+    assert metrics.counter("x_total", "x", backend="a") is metrics.counter("x_total", "x", backend="a")
+    assert metrics.counter("x_total", "x", backend="a") is not metrics.counter("x_total", "x", backend="b")
+    with pytest.raises(ValueError):
+        metrics.gauge("x_total", "x")
+
+def test_label_values_escaped():
+    """Test that quotes, backslashes and newlines in labels are escaped."""
+    metrics = MetricsRegistry()
+    metrics.counter("odd_total", "odd", profile='a"b\\c\nd').inc()
+    assert 'odd_total{profile="a\\"b\\\\c\\nd"} 1' in metrics.render()
+
+def test_recording_is_cheap():
+    """Test that counter and histogram updates cost around a microsecond."""
+    metrics = MetricsRegistry()
+    counter = metrics.counter("hot_total", "hot path")
+    histogram = metrics.histogram("hot_seconds", "hot path")
+    start = time.perf_counter()
+    for _ in range(100_000):
+        counter.inc()
+        histogram.observe(0.002)
+    assert (time.perf_counter() - start) / 100_000 < 5e-6
+    assert counter.value == histogram.count == 100_000
+
+def test_reminder_instrumentation():
+    """Test that shows, suppressed shows, signals and timer lateness are counted."""
+    shown, missed = REMINDER_EVENTS["shown"].value, REMINDER_EVENTS["missed"].value
+    usr1, fired = SIGNALS["SIGUSR1"].value, TIMER_LATENESS.count
+    clock = SimulatedClock()
+    reminder = make_reminder(FakeAdvancedReminder, clock=clock)
+    reminder._schedule_interval()
+    clock.now = reminder.timer.deadline + 0.25
+    reminder.scheduler.run_pending()
+    reminder.show_reminder()
+    clock.advance(reminder.show_gate.window)
+    reminder._signal_show_reminder(None, None)
+    assert REMINDER_EVENTS["shown"].value - shown == 2
+    assert REMINDER_EVENTS["missed"].value - missed == 1
+    assert SIGNALS["SIGUSR1"].value - usr1 == 1
+    assert TIMER_LATENESS.count - fired == 1
+    assert "eyes_threads" in reminder.handle_control({"cmd": "metrics"})["metrics"]
+
+def test_file_exporter_rewrites_on_schedule(tmp_path):
+    """Test that the exporter writes immediately, then every interval."""
+    clock = SimulatedClock()
+    scheduler = Scheduler(clock=clock)
+    metrics = MetricsRegistry()
+    counter = metrics.counter("ticks_total", "ticks")
+    path = tmp_path / "eyes.prom"
+    exporter = FileExporter(str(path), interval=15, metrics=metrics)
+    exporter.start(scheduler)
+    assert "ticks_total 0" in path.read_text()
+    counter.inc()
+    clock.now = 15
+    scheduler.run_pending()
+    assert "ticks_total 1" in path.read_text()
+    exporter.stop()
+    assert len(scheduler) == 0
+    assert [p.name for p in tmp_path.iterdir()] == ["eyes.prom"]
+
+def test_default_registry_has_process_gauges():
+    """Test that thread count and RSS are exported."""
+    text = registry.render()
+    assert "eyes_threads " in text
+    rss = [line for line in text.splitlines() if line.startswith("eyes_resident_memory_bytes ")]
+    assert int(rss[0].split()[1]) > 0
@@ -0,0 +1,100 @@
+import pytest
+
+from eyes.core.backends import Backend
+from eyes.core.clock import SimulatedClock
+from eyes.core.profiles import Profile, ProfileDaemon, load_profiles, parse_profiles
+
+
+class NullBackend(Backend):
+    """Backend that drops notifications."""
+
+    name = "null"
+
+    def notify(self, title, message, timeout=None):
+        pass
+
+
+def make_daemon(profiles, clock=None):
+    selected = []
+
+    def select_backends(backend):
+        selected.append(backend)
+        return [NullBackend()]
+
+    daemon = ProfileDaemon(profiles, select_backends, clock=clock or SimulatedClock())
+    daemon.selected = selected
+    return daemon
+
+
+def simulate(daemon, clock, hours):
+    """Jump from deadline to deadline for hours of simulated time."""
+    for reminder in daemon.reminders.values():
+        reminder._schedule_interval()
+
+    def drain():
+        for dispatcher in daemon.dispatchers.values():
+            dispatcher.join(2)
+
+    clock.run(daemon.scheduler, hours * 3600, after_step=drain)
+    for dispatcher in daemon.dispatchers.values():
+        dispatcher.stop(timeout=1)
+
+
+def test_load_profiles_from_toml(tmp_path):
+    """Test that profiles are read from TOML with defaults filled in."""
+    path = tmp_path / "profiles.toml"
+    path.write_text(
+        '[profiles.eyes]\ninterval = 20\n\n'
+        '[profiles.water]\ninterval = 45\nsnooze = 10\nmessage = "Drink some water"\n'
+    )
+    eyes, water = load_profiles(str(path))
+    assert (eyes.name, eyes.interval_minutes, eyes.snooze_minutes) == ("eyes", 20, 5)
+    assert water.message == "Drink some water"
+    assert water.snooze_minutes == 10
+
+@pytest.mark.parametrize("data, error", [
+    ({}, "no \\[profiles"),
+    ({"profiles": {"a": {"interval": 0}}}, "positive"),
+    ({"profiles": {"a": {"every": 5}}}, "unknown keys every"),
+])
+def test_invalid_profiles_rejected(data, error):
+    """Test that bad profile definitions raise ValueError."""
+    with pytest.raises(ValueError, match=error):
+        parse_profiles(data)
+
+def test_profiles_share_scheduler_and_dispatcher():
+    """Test that profiles on one backend share the scheduler and one dispatcher."""
+    daemon = make_daemon([
+        Profile("eyes"), Profile("posture", 45), Profile("water", 60, backend="plyer"),
+    ])
+    reminders = list(daemon.reminders.values())
+    assert all(r.scheduler is daemon.scheduler for r in reminders)
+    assert daemon.selected == [None, "plyer"]
+    assert reminders[0].dispatcher is reminders[1].dispatcher
+
+def test_control_scoped_to_profile():
+    """Test that control commands target one profile or all of them."""
+    clock = SimulatedClock()
+    daemon = make_daemon([Profile("eyes", 20), Profile("water", 60)], clock)
+    for reminder in daemon.reminders.values():
+        reminder._schedule_interval()
+    daemon.handle_control({"cmd": "snooze", "profile": "water", "minutes": 90})
+    assert daemon.reminders["water"].timer.deadline == 90 * 60
+    assert daemon.reminders["eyes"].timer.deadline == 20 * 60
+    status = daemon.handle_control({"cmd": "status"})
+    assert set(status["profiles"]) == {"eyes", "water"}
+    with pytest.raises(ValueError, match="unknown profile"):
+        daemon.handle_control({"cmd": "show", "profile": "nope"})
+    daemon.handle_control({"cmd": "stop"})
+    assert daemon.should_run is False
+
+def test_wakeups_do_not_grow_with_profiles():
+    """Test that 200 profiles cost about as many scheduler wakeups as one."""
+    counts = {}
+    for count in (1, 200):
+        clock = SimulatedClock()
+        profiles = [Profile(f"p{i}", interval_minutes=(20, 30)[i % 2]) for i in range(count)]
+        daemon = make_daemon(profiles, clock)
+        simulate(daemon, clock, hours=2)
+        counts[count] = daemon.scheduler.wakeups
+    assert counts[200] <= counts[1] * 1.2
@@ -0,0 +1,109 @@
+import os
+import signal
+import threading
+import time
+import tracemalloc
+
+from eyes.core.clock import SimulatedClock
+from eyes.core.ratelimit import DROPPED, ShowGate, TokenBucket
+from eyes.core.reminder import SIGNALS
+
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+
+def test_token_bucket_refills_up_to_burst():
+    """Test that tokens are spent, refill at the rate and never exceed the burst."""
+    bucket = TokenBucket(rate=0.5, burst=2)
+    assert [bucket.take(0) for _ in range(3)] == [True, True, False]
+    assert bucket.take(1) is False
+    assert bucket.take(2) is True
+    assert bucket.take(100) is True
+    assert bucket.take(100) is True
+    assert bucket.take(100) is False
+
+def test_burst_inside_window_shows_once():
+    """Test that N forced shows inside the coalescing window produce one notification."""
+    clock = SimulatedClock()
+    reminder = make_reminder(FakeAdvancedReminder, clock=clock)
+    coalesced = DROPPED["coalesced"].value
+    for _ in range(50):
+        reminder.force_show()
+        clock.advance(0.01)
+    assert len(reminder.notifications) == 1
+    assert reminder.status()["shows"] == {"admitted": 1, "coalesced": 49, "rate_limited": 0}
+    assert DROPPED["coalesced"].value - coalesced == 49
+    clock.advance(reminder.show_gate.window)
+    assert reminder.force_show() is True
+    assert len(reminder.notifications) == 2
+
+def test_scheduled_shows_share_the_gate():
+    """Test that an interval falling just after a forced show is merged into it."""
+    clock = SimulatedClock()
+    reminder = make_reminder(FakeAdvancedReminder, clock=clock)
+    reminder._schedule_interval()
+    clock.run(reminder.scheduler, reminder.timer.deadline - 1)
+    reminder.force_show()
+    reminder.handle_reminder_action("snooze")
+    clock.run(reminder.scheduler, reminder.timer.deadline)
+    assert len(reminder.notifications) == 1
+    assert reminder.show_gate.stats["coalesced"] == 1
+    # The snooze comes due well outside the window and is shown
+    clock.run(reminder.scheduler, clock() + reminder.snooze_minutes * 60)
+    assert len(reminder.notifications) == 2
+
+def test_sustained_requests_are_rate_limited():
+    """Test that a steady stream of requests is capped by the token bucket."""
+    clock = SimulatedClock()
+    reminder = make_reminder(FakeAdvancedReminder, clock=clock)
+    reminder.show_gate = ShowGate(window=2.0, rate=1 / 60, burst=5)
+    for _ in range(3600):
+        reminder.force_show()
+        clock.advance(1.0)
+    stats = reminder.show_gate.stats
+    assert len(reminder.notifications) == stats["admitted"]
+    assert 60 <= stats["admitted"] <= 5 + 60
+    assert stats["rate_limited"] > 0 and stats["coalesced"] > 0
+    assert sum(stats.values()) == 3600
+
+def test_signal_storm_is_bounded():
+    """Test thousands of SIGUSR1s per second: one notification, no growth in work or memory."""
+    previous = {signum: signal.getsignal(signum) for signum in (signal.SIGUSR1, signal.SIGTERM)}
+    clock = SimulatedClock()
+    try:
+        reminder = make_reminder(FakeAdvancedReminder, clock=clock, handle_signals=True)
+        received = SIGNALS["SIGUSR1"].value
+        # Control-socket shows racing the signals from other threads
+        stop = threading.Event()
+
+        def hammer():
+            while not stop.is_set():
+                reminder.force_show()
+
+        threads = [threading.Thread(target=hammer) for _ in range(4)]
+        tracemalloc.start()
+        try:
+            for thread in threads:
+                thread.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            for _ in range(5000):
+                os.kill(os.getpid(), signal.SIGUSR1)
+            elapsed = time.perf_counter() - start
+            growth = tracemalloc.get_traced_memory()[0] - baseline
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            tracemalloc.stop()
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    handled = SIGNALS["SIGUSR1"].value - received
+    stats = reminder.show_gate.stats
+    assert 5000 / elapsed > 1000
+    assert handled > 0
+    assert len(reminder.notifications) == stats["admitted"] == 1
+    assert stats["coalesced"] >= handled - 1
+    assert stats["rate_limited"] == 0
+    assert len(reminder.scheduler) == 0
+    assert growth < 64 * 1024
@@ -1,53 +1,111 @@
 import pytest
-import platform
 from unittest.mock import patch, MagicMock
 
+from eyes.core.clock import SimulatedClock
+from eyes.core.ratelimit import ShowGate
+from eyes.core.reminder import BaseReminder, AdvancedReminder
+
+
+class FakeReminder(BaseReminder):
+    """Simple reminder that records notifications instead of showing them."""
+
+    def show_notification(self, title, message, timeout=None):
+        self.notifications.append((title, message, timeout))
+
+
+class FakeAdvancedReminder(AdvancedReminder):
+    """Advanced reminder that records notifications instead of showing them."""
+
+    def show_notification(self, title, message, timeout=None):
+        self.notifications.append((title, message, timeout))
+
+    def show_reminder_with_actions(self, title, message, actions):
+        self.notifications.append((title, message, actions))
+
+
+def make_reminder(cls=FakeReminder, **kwargs):
+    reminder = cls(**kwargs)
+    reminder.notifications = []
+    return reminder
+
+
 def test_simple_reminder_init():
-    """Test SimpleEyeBreakReminder initialization."""
-    with patch('plyer.notification'):
-        from eyes.reminder import SimpleEyeBreakReminder
-        reminder = SimpleEyeBreakReminder(interval_minutes=30)
-        assert reminder.interval_minutes == 30
-        assert reminder.is_active is False
-        assert reminder.should_run is True
+    """Test BaseReminder initialization."""
+    reminder = make_reminder(interval_minutes=30)
+    assert reminder.interval_minutes == 30
+    assert reminder.is_active is False
+    assert reminder.should_run is True
+    assert len(reminder.scheduler) == 0
 
 def test_reminder_reset():
     """Test that reminder resets properly."""
-    with patch('plyer.notification'):
-        from eyes.reminder import SimpleEyeBreakReminder
-        reminder = SimpleEyeBreakReminder()
-        reminder.is_active = True
-        reminder._reset()
-        assert reminder.is_active is False
-
-@patch('threading.Timer')
-@patch('plyer.notification')
-def test_show_reminder(mock_plyer, mock_timer):
-    """Test show_reminder functionality."""
-    from eyes.reminder import SimpleEyeBreakReminder
-    
-    reminder = SimpleEyeBreakReminder()
-    
-    # Mock the notification
-    mock_plyer.notify = MagicMock()
-    
-    reminder.show_reminder()
-    
-    # Check notification was called
-    mock_plyer.notify.assert_called_once()
+    reminder = make_reminder()
+    reminder.is_active = True
+    reminder._reset_active()
+    assert reminder.is_active is False
+
+def test_show_reminder():
+    """Test show_reminder notifies and schedules a reset instead of a Timer."""
+    reminder = make_reminder()
+
+    with patch('threading.Timer') as mock_timer:
+        reminder.show_reminder()
+        mock_timer.assert_not_called()
+
+    assert len(reminder.notifications) == 1
     assert reminder.is_active is True
-    
-    # Check timer was started
-    mock_timer.assert_called_once_with(30.0, reminder._reset)
+    assert reminder._reset_event.callback == reminder._reset_active
+    assert len(reminder.scheduler) == 1
 
 def test_show_reminder_when_active():
     """Test that show_reminder returns early when already active."""
-    with patch('plyer.notification'):
-        from eyes.reminder import SimpleEyeBreakReminder
-        reminder = SimpleEyeBreakReminder()
-        reminder.is_active = True
-        
-        with patch('threading.Timer') as mock_timer:
-            reminder.show_reminder()
-            # Timer should not be called if already active
-            mock_timer.assert_not_called()
\ No newline at end of file
+    reminder = make_reminder()
+    reminder.is_active = True
+    reminder.show_reminder()
+    assert reminder.notifications == []
+    assert len(reminder.scheduler) == 0
+
+def test_forced_reminders_do_not_pile_up_resets():
+    """Test that repeated SIGUSR1 shows keep a single pending reset."""
+    reminder = make_reminder()
+    reminder.show_gate = ShowGate(window=0.0, burst=100)
+    for _ in range(100):
+        reminder._signal_show_reminder(None, None)
+    assert len(reminder.notifications) == 100
+    assert len(reminder.scheduler) == 1
+
+def test_interval_rearms_itself():
+    """Test that the interval deadline re-arms before showing a reminder."""
+    clock = SimulatedClock()
+    reminder = make_reminder(clock=clock)
+    reminder._schedule_interval()
+    first = reminder._interval_event
+    clock.run(reminder.scheduler, reminder.timer.deadline)
+    assert reminder._interval_event is not first
+    assert reminder._interval_event.name == "interval"
+    assert len(reminder.notifications) == 1
+
+def test_snooze_replaces_pending_snooze():
+    """Test that snoozing twice leaves only one pending snooze."""
+    reminder = make_reminder(FakeAdvancedReminder, snooze_minutes=5)
+    reminder.handle_reminder_action("snooze")
+    first = reminder._snooze_event
+    reminder.handle_reminder_action("snooze")
+    assert first.cancelled is True
+    assert len(reminder.scheduler) == 1
+
+def test_acknowledge_cancels_auto_acknowledge():
+    """Test that a real action cancels the pending auto-acknowledge."""
+    reminder = make_reminder(FakeAdvancedReminder)
+    reminder.show_reminder()
+    reminder.schedule_auto_acknowledge(30.0)
+    reminder.handle_reminder_action("acknowledged")
+    assert reminder.is_reminder_active is False
+    assert len(reminder.scheduler) == 0
+
+def test_interval_skips_while_advanced_reminder_active():
+    """Test that an interval does not stack a reminder over an active one."""
+    reminder = make_reminder(FakeAdvancedReminder)
+    reminder.show_reminder()
+    reminder._on_interval()
+    assert len(reminder.notifications) == 1
@@ -0,0 +1,103 @@
+import threading
+import time
+import tracemalloc
+
+from eyes.core.clock import SimulatedClock
+from eyes.core.scheduler import Scheduler
+
+
+def test_events_run_in_deadline_order():
+    """Test that due events run earliest first."""
+    clock = SimulatedClock()
+    scheduler = Scheduler(clock=clock)
+    ran = []
+    scheduler.schedule(3, ran.append, "c")
+    scheduler.schedule(1, ran.append, "a")
+    scheduler.schedule(2, ran.append, "b")
+    clock.now = 2.5
+    assert scheduler.run_pending() == 2
+    assert ran == ["a", "b"]
+    assert scheduler.next_deadline() == 3
+
+def test_cancel_and_reschedule():
+    """Test that cancelled events never run and reschedule moves the deadline."""
+    clock = SimulatedClock()
+    scheduler = Scheduler(clock=clock)
+    ran = []
+    event = scheduler.schedule(1, ran.append, "x")
+    assert scheduler.cancel(event) is True
+    assert scheduler.cancel(event) is False
+    moved = scheduler.reschedule(scheduler.schedule(1, ran.append, "y"), 10)
+    clock.now = 5
+    scheduler.run_pending()
+    assert ran == []
+    clock.now = 10
+    scheduler.run_pending()
+    assert ran == ["y"]
+    assert scheduler.cancel(moved) is False
+
+def test_worker_thread_fires_events():
+    """Test that the worker thread wakes for a newly scheduled earlier event."""
+    scheduler = Scheduler()
+    fired = threading.Event()
+    scheduler.start()
+    try:
+        scheduler.schedule(3600, lambda: None)
+        scheduler.schedule(0.01, fired.set)
+        assert fired.wait(2)
+    finally:
+        scheduler.stop(timeout=2)
+
+def test_stress_thread_count_and_memory_stay_flat():
+    """Test that thousands of scheduled and cancelled events use no extra threads or memory."""
+    scheduler = Scheduler()
+    scheduler.start()
+    baseline_threads = threading.active_count()
+    fired = [0]
+
+    def fire():
+        fired[0] += 1
+
+    def churn():
+        # Snooze/poke pattern: schedule, then cancel and replace
+        pending = None
+        for i in range(5000):
+            scheduler.cancel(pending)
+            pending = scheduler.schedule(60 + i, lambda: None)
+            if i % 10 == 0:
+                scheduler.schedule(0, fire)
+        scheduler.cancel(pending)
+
+    try:
+        churn()
+        tracemalloc.start()
+        churn()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(5):
+            churn()
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        deadline = time.monotonic() + 5
+        while fired[0] < 3500 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert threading.active_count() == baseline_threads
+        assert fired[0] == 3500
+        assert len(scheduler) == 0
+        assert len(scheduler._heap) < 200
+        assert after - before < 64 * 1024
+    finally:
+        scheduler.stop(timeout=2)
+
+def test_slack_batches_nearby_deadlines():
+    """Test that deadlines within the slack window run in one wakeup."""
+    clock = SimulatedClock()
+    scheduler = Scheduler(clock=clock, slack=1.0)
+    ran = []
+    for offset in (0.1, 0.4, 0.9):
+        scheduler.schedule(10 + offset, ran.append, offset)
+    assert scheduler.next_deadline() == 11
+    clock.now = 11
+    assert scheduler.run_pending() == 3
+    assert scheduler.wakeups == 1
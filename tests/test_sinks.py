@@ -0,0 +1,196 @@
+import json
+import os
+import selectors
+import socket
+import sys
+import threading
+import time
+
+import pytest
+
+from eyes.core.sinks import Broadcaster, default_events_path, parse_sink
+
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+unix_only = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+def wait_for(predicate, timeout=2):
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.005)
+    return predicate()
+
+
+def connect(path, subscribe=None):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+    if subscribe is not None:
+        sock.sendall(json.dumps({"events": subscribe}).encode() + b"\n")
+    return sock
+
+
+def read_lines(sock, count, timeout=2):
+    sock.settimeout(timeout)
+    data = b""
+    while data.count(b"\n") < count:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return [json.loads(line) for line in data.splitlines()]
+
+
+@pytest.fixture
+def events_path(tmp_path):
+    return str(tmp_path / "events.sock")
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("stdout", ("stdout", None)),
+    ("fifo:/tmp/eyes.fifo", ("fifo", "/tmp/eyes.fifo")),
+    ("socket:/tmp/ev.sock", ("socket", "/tmp/ev.sock")),
+])
+def test_parse_sink(spec, expected):
+    """Test that sink specs name a kind and path."""
+    assert parse_sink(spec) == expected
+
+def test_bad_sinks_rejected(monkeypatch):
+    """Test that unknown kinds and missing paths are refused."""
+    for spec, error in [("syslog", "unknown sink"), ("fifo", "needs a path"),
+                        ("stdout:/x", "takes no path")]:
+        with pytest.raises(ValueError, match=error):
+            parse_sink(spec)
+    monkeypatch.setenv("EYES_SOCKET", "/run/user/1/eyes.sock")
+    assert parse_sink("socket") == ("socket", default_events_path())
+    assert default_events_path() == "/run/user/1/eyes-events.sock"
+
+@unix_only
+def test_socket_subscribers_get_reminder_events(events_path):
+    """Test that every connected client receives shown/snoozed events, filtered if asked."""
+    reminder = make_reminder(FakeAdvancedReminder)
+    reminder.name = "eyes"
+    reminder.sinks = Broadcaster().add("socket", events_path)
+    reminder._start_sinks()
+    try:
+        everything = connect(events_path)
+        snoozes = connect(events_path, subscribe=["snoozed"])
+        assert wait_for(lambda: len(reminder.sinks.clients) == 2)
+        assert wait_for(lambda: any(s.events for s in reminder.sinks.clients.values()))
+        reminder.show_reminder()
+        reminder.handle_reminder_action("snooze")
+        got = read_lines(everything, 2)
+        assert [(e["event"], e["profile"]) for e in got] == [("shown", "eyes"), ("snoozed", "eyes")]
+        assert got[0]["time"] == pytest.approx(time.time(), abs=5)
+        assert [e["event"] for e in read_lines(snoozes, 1)] == ["snoozed"]
+        assert reminder.status()["sinks"] == {"published": 2, "subscribers": 2, "dropped": 0}
+    finally:
+        reminder.sinks.close()
+        everything.close()
+        snoozes.close()
+    assert not os.path.exists(events_path)
+
+@unix_only
+def test_fifo_without_reader_drops_and_with_reader_delivers(tmp_path):
+    """Test that events for an unread FIFO are dropped, and a reader sees new ones."""
+    path = str(tmp_path / "eyes.fifo")
+    sinks = Broadcaster().add("fifo", path)
+    sinks.start()
+    try:
+        start = time.perf_counter()
+        sinks.publish("shown", at=1.0)
+        assert time.perf_counter() - start < 0.1
+        fifo = sinks.fifos[0]
+        assert wait_for(lambda: fifo.dropped == 1)
+        reader = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+        try:
+            sinks.publish("snoozed", at=2.0)
+            assert wait_for(lambda: fifo.fd is not None and not fifo.pending and not fifo.queue)
+            line = os.read(reader, 4096)
+        finally:
+            os.close(reader)
+        assert json.loads(line) == {"event": "snoozed", "profile": None, "time": 2.0}
+    finally:
+        sinks.close()
+
+def test_stdout_sink_writes_json_lines(capsys):
+    """Test that the stdout sink prints one JSON object per event."""
+    sinks = Broadcaster().add("stdout")
+    sinks.start()
+    sinks.publish("shown", "water", 5.0)
+    sinks.publish("shutdown", at=6.0)
+    sinks.close()
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"event": "shown", "profile": "water", "time": 5.0},
+        {"event": "shutdown", "profile": None, "time": 6.0},
+    ]
+
+@unix_only
+def test_hundreds_of_subscribers_with_stuck_readers(events_path):
+    """Test that 200 subscribers, 50 never reading, don't slow publishing or the others."""
+    maxlen = 256
+    sinks = Broadcaster(maxlen=maxlen).add("socket", events_path)
+    sinks.start()
+    active = [connect(events_path) for _ in range(150)]
+    stuck = [connect(events_path) for _ in range(50)]
+    received = {sock: [] for sock in active}
+    done = threading.Event()
+
+    def read_all():
+        selector = selectors.DefaultSelector()
+        buffers = {}
+        for sock in active:
+            sock.setblocking(False)
+            selector.register(sock, selectors.EVENT_READ)
+            buffers[sock] = b""
+        finished = set()
+        while len(finished) < len(active):
+            for key, _ in selector.select(5):
+                sock = key.fileobj
+                data = sock.recv(1 << 20)
+                if not data:
+                    finished.add(sock)
+                    selector.unregister(sock)
+                    continue
+                buffers[sock] += data
+                *lines, buffers[sock] = buffers[sock].split(b"\n")
+                for line in lines:
+                    # Cheaper than json.loads, so this thread keeps up with 150 sockets
+                    received[sock].append(int(line.split(b'"seq":')[1].split(b",")[0]))
+                    if line.startswith(b'{"event":"shutdown"'):
+                        finished.add(sock)
+                        selector.unregister(sock)
+        done.set()
+
+    reader = threading.Thread(target=read_all)
+    reader.start()
+    padding = "x" * 1024
+    publish = []
+    try:
+        assert wait_for(lambda: len(sinks.clients) == 200)
+        for seq in range(1000):
+            start = time.perf_counter()
+            sinks.publish("shown", at=time.time(), seq=seq, padding=padding)
+            publish.append(time.perf_counter() - start)
+            if seq % 20 == 19:
+                time.sleep(0.02)
+        sinks.publish("shutdown", seq=1000, padding="")
+        assert done.wait(10)
+        # Only the stuck readers lost events, and they hold a bounded backlog:
+        # the queue plus one batch in flight
+        backlog = [s for s in sinks.clients.values() if s.dropped]
+        assert len(backlog) == 50
+        assert all(len(s.queue) <= maxlen for s in backlog)
+        assert all(len(s.pending) <= (maxlen + 1) * 1200 for s in backlog)
+        assert all(s.dropped > 0 for s in backlog)
+    finally:
+        sinks.close()
+        reader.join(5)
+        for sock in active + stuck:
+            sock.close()
+    assert all(seqs == list(range(1001)) for seqs in received.values())
+    # Publishing is queue appends only; stragglers are GIL switches, not I/O
+    publish.sort()
+    assert publish[len(publish) // 2] < 0.001
+    assert publish[-1] < 0.1
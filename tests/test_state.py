@@ -0,0 +1,182 @@
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from eyes.core.clock import SimulatedClock
+from eyes.core.state import StateFile
+
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A daemon with a saved schedule: argv is the state file, then what to do
+# before serving (nothing, snooze, or churn to keep rewriting the state)
+DAEMON = """
+import random, sys
+from eyes.core.state import StateFile
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+reminder = make_reminder(FakeAdvancedReminder, interval_minutes=10, handle_signals=False)
+reminder.state = StateFile(sys.argv[1]).load()
+if sys.argv[2] == "snooze":
+    reminder.show_reminder()
+    reminder.handle_reminder_action("snooze")
+elif sys.argv[2] == "churn":
+    reminder.state.start()
+    while True:
+        reminder.postpone(random.uniform(1, 10))
+reminder.run()
+"""
+
+
+def start_daemon(tmp_path, action="run"):
+    path = str(tmp_path / "state.json")
+    env = dict(os.environ, PYTHONPATH=ROOT, EYES_SOCKET=str(tmp_path / "eyes.sock"))
+    process = subprocess.Popen(
+        [sys.executable, "-c", DAEMON, path, action], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return process, path
+
+
+def wait_for(predicate, timeout=10):
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.01)
+    return predicate()
+
+
+def saved(path):
+    with open(path) as f:
+        return json.load(f)["profiles"][""]
+
+
+def restarted(path, **kwargs):
+    reminder = make_reminder(FakeAdvancedReminder, interval_minutes=10, handle_signals=False,
+                             **kwargs)
+    reminder.state = StateFile(path).load()
+    reminder._resume()
+    return reminder
+
+
+def test_killed_daemon_resumes_mid_interval(tmp_path):
+    """Test that a SIGKILLed daemon's successor keeps the old deadline instead of resetting."""
+    process, path = start_daemon(tmp_path)
+    try:
+        assert wait_for(lambda: os.path.exists(path))
+        time.sleep(1.0)
+    finally:
+        process.send_signal(signal.SIGKILL)
+        process.wait()
+    entry = saved(path)
+    reminder = restarted(path)
+    assert reminder.next_fire_time() == pytest.approx(entry["next"], abs=0.2)
+    # A fresh start would have put it a full interval out
+    assert reminder.next_fire_time() < time.time() + 600 - 0.8
+
+def test_killed_daemon_keeps_pending_snooze(tmp_path):
+    """Test that a snooze taken before a crash still fires after the restart."""
+    process, path = start_daemon(tmp_path, "snooze")
+    try:
+        assert wait_for(lambda: os.path.exists(path) and saved(path).get("snooze"))
+    finally:
+        process.send_signal(signal.SIGKILL)
+        process.wait()
+    entry = saved(path)
+    reminder = restarted(path)
+    assert reminder._snooze_event is not None
+    snooze_at = time.time() + reminder._snooze_event.deadline - reminder.scheduler.clock()
+    assert snooze_at == pytest.approx(entry["snooze"], abs=0.2)
+    assert reminder.is_reminder_active is False
+
+def test_state_file_survives_kills_mid_write(tmp_path):
+    """Test that killing a daemon while it rewrites its state never leaves a torn file."""
+    rng = random.Random(23)
+    for _ in range(8):
+        process, path = start_daemon(tmp_path, "churn")
+        try:
+            assert wait_for(lambda: os.path.exists(path))
+            time.sleep(rng.uniform(0, 0.05))
+        finally:
+            process.send_signal(signal.SIGKILL)
+            process.wait()
+        assert saved(path)["next"] > time.time()
+
+@pytest.mark.parametrize("policy, overdue, expected_delay, shows", [
+    ("fire", 300, 0, 1),        # Missed while stopped: show straight away
+    ("restart", 300, 1200, 0),  # Downtime counts as the break
+    ("skip", 300, 900, 0),      # Keep the original cadence
+    ("fire", -300, 300, 0),     # Not yet due: carry on counting down
+    ("fire", -5000, 1200, 0),   # Further out than an interval: clamped
+])
+def test_stale_deadlines(tmp_path, policy, overdue, expected_delay, shows):
+    """Test how deadlines that passed (or jumped) while stopped are restored."""
+    path = str(tmp_path / "state.json")
+    clock = SimulatedClock()
+    state = StateFile(path)
+    state.save(None, {"next": clock.wall() - overdue, "active": False, "shown_at": None,
+                      "snooze": None})
+    state.flush()
+    reminder = make_reminder(FakeAdvancedReminder, interval_minutes=20, clock=clock)
+    reminder.timer.suspend_policy = policy
+    reminder.timer.resume_check = None
+    reminder.state = StateFile(path).load()
+    reminder._resume()
+    assert reminder.timer.deadline == pytest.approx(expected_delay)
+    clock.run(reminder.scheduler, 1)
+    assert len(reminder.notifications) == shows
+
+def test_on_screen_reminder_and_stale_snooze(tmp_path):
+    """Test that a reminder shown just before a restart still blocks repeats; old snoozes go."""
+    clock = SimulatedClock()
+    state = StateFile(str(tmp_path / "state.json"))
+    wall = clock.wall()
+    state.save("eyes", {"next": wall + 600, "active": True, "shown_at": wall - 10,
+                        "snooze": wall - 3600})
+    reminder = make_reminder(FakeAdvancedReminder, interval_minutes=20, clock=clock)
+    reminder.name = "eyes"
+    reminder.timer.resume_check = None
+    reminder.state = state
+    reminder._resume()
+    assert reminder.is_reminder_active is True
+    assert reminder._snooze_event is None
+    # The lost notification is acknowledged when its 30 seconds are up
+    clock.run(reminder.scheduler, 20)
+    assert reminder.is_reminder_active is False
+
+def test_unreadable_state_starts_fresh(tmp_path, caplog):
+    """Test that a corrupt state file or a leftover temp file doesn't stop the daemon."""
+    path = tmp_path / "state.json"
+    path.write_text('{"version": 1, "profiles": {"": {"next": 17')
+    (tmp_path / "state.json.tmp").write_text("partial")
+    state = StateFile(str(path)).load()
+    assert state.entries == {}
+    assert "Ignoring saved state" in caplog.text
+    reminder = make_reminder(FakeAdvancedReminder, interval_minutes=20, clock=SimulatedClock())
+    state.save(None, {"next": "soon"})
+    reminder.state = state
+    reminder._resume()
+    assert reminder.timer.deadline == pytest.approx(1200)
+
+def test_writes_only_on_change(tmp_path):
+    """Test that re-arming for resume checks doesn't rewrite an unchanged schedule."""
+    clock = SimulatedClock()
+    reminder = make_reminder(FakeAdvancedReminder, interval_minutes=20, clock=clock)
+    reminder.state = StateFile(str(tmp_path / "state.json"))
+    reminder._resume()
+    reminder.state.flush()
+    # Nineteen resume checks re-arm the timer for the same deadline
+    clock.run(reminder.scheduler, 1190)
+    reminder.state.flush()
+    assert reminder.scheduler.wakeups >= 19
+    assert reminder.state.writes == 1
+    # Showing the reminder is a real change
+    clock.run(reminder.scheduler, 1210)
+    reminder.state.flush()
+    assert reminder.state.writes == 2
+    assert saved(reminder.state.path)["active"] is True
@@ -0,0 +1,131 @@
+import os
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+from eyes.core.control import DaemonNotRunningError, send_command
+from eyes.supervisor import SUPPORTED, Supervisor
+
+pytestmark = pytest.mark.skipif(not SUPPORTED, reason="supervise needs a POSIX platform")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A daemon child as `eyes supervise` runs them: set up, wait as a standby,
+# then take over with the saved schedule. argv: state file, then a mode
+CHILD = """
+import sys
+from eyes.core.state import StateFile
+from eyes.supervisor import await_promotion, follow_supervisor
+from tests.test_reminder import FakeAdvancedReminder, make_reminder
+fd = int(sys.argv[sys.argv.index("--standby") + 1])
+if sys.argv[2] == "broken":
+    sys.exit(2)
+reminder = make_reminder(FakeAdvancedReminder, interval_minutes=10)
+stats = await_promotion(fd)
+reminder.state = StateFile(sys.argv[1]).load()
+follow_supervisor(fd, reminder, stats)
+if sys.argv[2] == "crashing":
+    import os
+    os._exit(3)
+reminder.run()
+"""
+
+
+@pytest.fixture
+def supervise(tmp_path, monkeypatch):
+    """Start a supervisor on a thread; yields a function taking the child mode."""
+    socket_path = str(tmp_path / "eyes.sock")
+    monkeypatch.setenv("EYES_SOCKET", socket_path)
+    monkeypatch.setenv("PYTHONPATH", ROOT)
+    started = []
+
+    def start(mode="run", **kwargs):
+        command = [sys.executable, "-c", CHILD, str(tmp_path / "state.json"), mode]
+        supervisor = Supervisor(command, **kwargs)
+        result = []
+        thread = threading.Thread(target=lambda: result.append(supervisor.run(False)))
+        thread.start()
+        started.append((supervisor, thread))
+        supervisor.result = result
+        supervisor.thread = thread
+        return supervisor
+
+    yield start
+    for supervisor, thread in started:
+        supervisor.stop()
+        thread.join(15)
+
+
+def query(cmd="status"):
+    try:
+        return send_command(cmd, timeout=1)
+    except (DaemonNotRunningError, OSError):
+        return None
+
+
+def wait_for(predicate, timeout=10):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(0.005)
+    return None
+
+
+def test_standby_takes_over_with_the_schedule(supervise):
+    """Test that killing the active daemon hands its countdown to the warm standby at once."""
+    supervisor = supervise()
+    first = wait_for(lambda: supervisor.standby and supervisor.standby.ready and query())
+    assert first is not None
+    old_pid, next_fire = first["pid"], first["next_fire_time"]
+    assert supervisor.active.pid == old_pid
+
+    killed = time.monotonic()
+    os.kill(old_pid, signal.SIGKILL)
+
+    def taken_over():
+        reply = query()
+        return reply if reply and reply["pid"] != old_pid else None
+
+    reply = wait_for(taken_over)
+    recovered = time.monotonic() - killed
+    assert reply is not None
+    # The countdown carried on rather than restarting ten minutes from now
+    assert reply["next_fire_time"] == pytest.approx(next_fire, abs=0.5)
+    assert reply["supervisor"]["crashes"] == 1
+    # Warm: no interpreter start or imports on the way, unlike a cold restart
+    assert recovered < 2.0
+    assert supervisor.failovers[0] < 0.5
+    assert wait_for(lambda: supervisor.stats()["standby_ready"])
+
+def test_crash_loop_backs_off(supervise):
+    """Test that a daemon crashing right after each takeover waits longer every time."""
+    supervisor = supervise("crashing", stable=30.0, backoff=0.05, max_backoff=0.2)
+    assert wait_for(lambda: supervisor.crashes >= 5, timeout=20)
+    supervisor.stop()
+    supervisor.thread.join(15)
+    # Each child reported taking over before dying, so none of this is a failed start
+    assert supervisor.delays[:5] == [0.0, 0.05, 0.1, 0.2, 0.2]
+    assert supervisor.result == [0]
+
+def test_failed_start_is_not_retried(supervise):
+    """Test that a daemon that can't start at all ends supervision with its exit status."""
+    supervisor = supervise("broken")
+    supervisor.thread.join(15)
+    assert supervisor.result == [2]
+    assert supervisor.crashes == 0
+
+def test_clean_stop_ends_supervision(supervise, tmp_path):
+    """Test that a stop request reaches the daemon, takes the standby down and keeps the state."""
+    supervisor = supervise()
+    assert wait_for(lambda: supervisor.standby and supervisor.standby.ready and query())
+    standby = supervisor.standby.process
+    assert query("stop") is not None
+    supervisor.thread.join(15)
+    assert supervisor.result == [0]
+    assert standby.wait(5) == 0
+    assert (tmp_path / "state.json").exists()
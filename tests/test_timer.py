@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from eyes.core.scheduler import Scheduler
+from eyes.core.timer import IntervalTimer
+
+from eyes.core.clock import SimulatedClock
+
+from tests.test_reminder import make_reminder
+
+
+def test_no_drift_over_ten_thousand_intervals():
+    """Test that late wakeups and slow reminders never push later deadlines back."""
+    clock = SimulatedClock()
+    reminder = make_reminder(interval_minutes=20, clock=clock)
+    fired = []
+    rng = random.Random(7)
+
+    def slow_show():
+        fired.append(clock.now)
+        clock.now += rng.uniform(0, 5)  # time spent inside show_reminder
+
+    reminder.show_reminder = slow_show
+    reminder._schedule_interval()
+    period = reminder.interval_minutes * 60
+
+    while len(fired) < 10_000:
+        deadline = reminder.scheduler.next_deadline()
+        # Wake up a little late, as a real scheduler thread does
+        clock.now = max(clock.now, deadline + rng.uniform(0, 0.5))
+        reminder.scheduler.run_pending()
+
+    assert reminder.timer.deadline == 10_001 * period
+    for n, fired_at in enumerate(fired, start=1):
+        assert n * period <= fired_at < n * period + 0.5
+    assert reminder.timer.jitter.count == 10_000
+    assert reminder.timer.jitter.max < 0.5
+    assert reminder.timer.skipped == 0
+
+@pytest.mark.parametrize("policy, fires, deadline", [
+    ("fire", 2, 1260 + 1200),
+    ("restart", 1, 1260 + 1200),
+    # Back on the pre-suspend cadence: wall-clock 3600 is monotonic 1900
+    ("skip", 1, 3600 - 1700),
+])
+def test_suspend_policies(policy, fires, deadline):
+    """Test each policy when the machine sleeps through an interval."""
+    clock = SimulatedClock()
+    timer = IntervalTimer(1200, suspend_policy=policy, wall_clock=clock.wall)
+    scheduler = Scheduler(clock=clock)
+    fired = []
+
+    def wake():
+        now = clock()
+        if timer.check(now):
+            fired.append(now)
+        scheduler.schedule_at(timer.wake_at(now), wake)
+
+    timer.reset(clock())
+    scheduler.schedule_at(timer.wake_at(clock()), wake)
+    clock.run(scheduler, 1200)
+    assert len(fired) == 1
+    # Asleep for 1700s of wall time; the monotonic clock stands still
+    clock.now = 1250
+    clock.suspend(1700)
+    clock.run(scheduler, 1290)
+    assert timer.suspends == 1
+    assert len(fired) == fires
+    # The resume is noticed at the first check after waking (t=1260)
+    assert timer.deadline == pytest.approx(deadline)
+    assert timer.deadline > clock.now
+
+def test_skip_policy_keeps_cadence_for_short_suspend():
+    """Test that a suspend shorter than the remaining interval just brings it forward."""
+    clock = SimulatedClock()
+    timer = IntervalTimer(1200, suspend_policy="skip", wall_clock=clock.wall)
+    timer.reset(0.0)
+    clock.now = 60
+    clock.suspend(300)
+    assert timer.check(clock()) is False
+    assert timer.deadline == 900
+    assert timer.skipped == 0
+
+def test_stalled_timer_does_not_burst():
+    """Test that a stall longer than a period fires once, not once per missed interval."""
+    timer = IntervalTimer(60, resume_check=None, wall_clock=lambda: 0.0)
+    timer.reset(0.0)
+    timer._wall_ref = -250.0  # keep the stall from looking like a suspend
+    assert timer.check(250.0) is True
+    assert timer.deadline == 300
+    assert timer.skipped == 3
+
+def test_unknown_policy_rejected():
+    """Test that an unknown suspend policy is refused."""
+    with pytest.raises(ValueError):
+        IntervalTimer(60, suspend_policy="later")
@@ -0,0 +1,116 @@
+import json
+import os
+import signal
+import time
+
+import pytest
+
+from eyes.core.control import handle_line
+from eyes.core.dispatch import Dispatcher
+from eyes.core.profiles import Profile, ProfileReminder
+from eyes.core.scheduler import Scheduler
+from eyes.core.trace import NULL_SPAN, Tracer, tracer
+
+from tests.test_dispatch import RecordingBackend
+from tests.test_reminder import FakeReminder, make_reminder
+
+
+@pytest.fixture
+def tracing():
+    tracer.enable(1000)
+    yield tracer
+    tracer.disable()
+
+
+def wait_for(predicate, timeout=2):
+    end = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < end:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_disabled_tracing_costs_almost_nothing():
+    """Test that spans are a shared no-op while tracing is off."""
+    quiet = Tracer()
+    assert quiet.span("timer.wake") is NULL_SPAN
+    start = time.perf_counter()
+    for _ in range(100000):
+        with quiet.span("timer.wake") as span:
+            span.set(due=True)
+    per_span = (time.perf_counter() - start) / 100000
+    assert per_span < 2e-6
+    assert quiet.events() == []
+
+def test_ring_keeps_the_newest_spans():
+    """Test that a full ring overwrites its oldest spans and says how many."""
+    ring = Tracer()
+    ring.enable(capacity=10)
+    for i in range(25):
+        with ring.span(f"span-{i}"):
+            pass
+    assert [event[1] for event in ring.events()] == [f"span-{i}" for i in range(15, 25)]
+    assert ring.chrome()["otherData"] == {"recorded": 25, "overwritten": 15}
+
+def test_reminder_lifecycle_across_threads(tracing):
+    """Test that timer wake, guards, dispatch, backend call, action and reset are traced."""
+    backend = RecordingBackend("fake", action="snooze")
+    backend.supports_actions = True
+    scheduler = Scheduler()
+    dispatcher = Dispatcher([backend])
+    reminder = ProfileReminder(Profile("eyes"), scheduler, dispatcher)
+    reminder.timer.resume_check = None
+    scheduler.start()
+    try:
+        reminder._schedule_interval(0.01)
+        assert wait_for(lambda: reminder.status()["active"] is False and backend.sent)
+        assert wait_for(lambda: any(e[1] == "action" for e in tracing.events()))
+        reminder.show_reminder()
+        reminder.show_reminder()
+        reminder._reset_active()
+    finally:
+        scheduler.stop(timeout=1)
+        dispatcher.stop(timeout=1)
+    trace = json.loads(json.dumps(tracing.chrome()))
+    spans = {}
+    for event in trace["traceEvents"]:
+        spans.setdefault(event["name"], []).append(event)
+    for name in ("interval", "timer.wake", "show_gate", "show_reminder", "dispatch.submit",
+                 "dispatch.deliver", "backend.call", "action", "reset"):
+        assert name in spans, name
+    wake = spans["timer.wake"][0]
+    assert wake["ph"] == "X" and wake["dur"] >= 0
+    assert wake["args"]["due"] is True and wake["args"]["profile"] == "eyes"
+    assert spans["show_reminder"][0]["args"]["outcome"] == "shown"
+    assert spans["show_reminder"][-1]["args"]["outcome"] == "missed"
+    assert spans["backend.call"][0]["args"]["backend"] == "fake"
+    assert spans["action"][0]["args"]["action"] == "snooze"
+    # Scheduler, dispatch worker and backend runner each get a named track
+    threads = {event["args"]["name"] for event in spans["thread_name"]}
+    assert {"eyes-scheduler", "eyes-dispatch"} <= threads
+    assert any(name.startswith("eyes-backend-fake") for name in threads)
+    # The wake happened inside the scheduler's interval callback
+    interval = spans["interval"][0]
+    assert interval["tid"] == wake["tid"]
+    assert interval["ts"] <= wake["ts"] <= wake["ts"] + wake["dur"] <= interval["ts"] + interval["dur"]
+
+def test_dump_over_control_and_sigusr2(tracing, tmp_path, monkeypatch):
+    """Test that the ring is written on a control request and on SIGUSR2."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    previous = {s: signal.getsignal(s) for s in (signal.SIGUSR1, signal.SIGUSR2, signal.SIGTERM)}
+    try:
+        reminder = make_reminder(FakeReminder)
+        os.kill(os.getpid(), signal.SIGUSR1)
+        path = str(tmp_path / "requested.json")
+        assert reminder.handle_control({"cmd": "trace", "path": path}) == {"path": path}
+        names = [e["name"] for e in json.load(open(path))["traceEvents"]]
+        assert "SIGUSR1" in names and "show_reminder" in names
+        os.kill(os.getpid(), signal.SIGUSR2)
+        dumped = tmp_path / f"eyes-trace-{os.getpid()}.json"
+        assert wait_for(dumped.exists)
+        assert json.loads(dumped.read_text())["displayTimeUnit"] == "ms"
+        tracing.disable()
+        reply = json.loads(handle_line(reminder.handle_control, b'{"cmd": "trace"}'))
+        assert reply == {"ok": False, "error": "tracing is off; start the daemon with --trace"}
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
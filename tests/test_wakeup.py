@@ -0,0 +1,120 @@
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from eyes.core.clock import SYSTEM_CLOCK
+from eyes.core.control import send_command
+from eyes.core.profiles import Profile
+from eyes.core.wakeup import Wakeup
+
+from tests.test_profiles import make_daemon
+from tests.test_reminder import FakeAdvancedReminder, FakeReminder, make_reminder
+
+posix_only = pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="needs SIGUSR1")
+
+
+class TimedReminder(FakeReminder):
+    """Records when each notification was shown."""
+
+    def show_notification(self, title, message, timeout=None):
+        self.notifications.append(time.perf_counter())
+
+
+def idle_wakeups(reminder, seconds):
+    """Main loop and scheduler wakeups over seconds of idling, once startup has settled."""
+    time.sleep(0.05)
+    before = reminder._stopping.wakeups + reminder.scheduler.wakeups
+    time.sleep(seconds)
+    return reminder._stopping.wakeups + reminder.scheduler.wakeups - before
+
+
+@pytest.fixture(autouse=True)
+def socket_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "eyes.sock")
+    monkeypatch.setenv("EYES_SOCKET", path)
+    return path
+
+
+def test_set_from_another_thread_ends_wait():
+    """Test that wait() returns as soon as another thread sets the flag, without polling."""
+    wakeup = Wakeup()
+    threading.Timer(0.05, wakeup.set).start()
+    start = time.perf_counter()
+    wakeup.wait()
+    assert time.perf_counter() - start < 0.5
+    assert wakeup.wakeups == 1
+    wakeup.clear()
+    assert not wakeup.is_set()
+
+def test_stop_command_ends_run_within_milliseconds(socket_path):
+    """Test that an idle daemon never wakes, and stop over the socket ends run() at once."""
+    reminder = make_reminder(FakeAdvancedReminder, handle_signals=False)
+    reminder.timer.resume_check = None
+    thread = threading.Thread(target=reminder.run)
+    thread.start()
+    end = time.monotonic() + 2
+    while not os.path.exists(socket_path) and time.monotonic() < end:
+        time.sleep(0.005)
+    try:
+        assert idle_wakeups(reminder, 0.3) == 0
+        start = time.perf_counter()
+        send_command("stop", path=socket_path)
+        thread.join(2)
+    finally:
+        reminder.should_run = False
+    assert not thread.is_alive()
+    assert time.perf_counter() - start < 0.1
+    assert reminder._stopping.wakeups == 1
+
+@posix_only
+def test_signals_take_effect_within_milliseconds():
+    """Test that SIGUSR1 shows and SIGTERM stops the main loop at once, wherever delivered."""
+    previous = {signum: signal.getsignal(signum) for signum in (signal.SIGUSR1, signal.SIGTERM)}
+    reminder = make_reminder(TimedReminder)
+    reminder.timer.resume_check = None
+    sent = {}
+
+    def send():
+        sent["idle_wakeups"] = idle_wakeups(reminder, 0.2)
+        sent["show"] = time.perf_counter()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        time.sleep(0.1)
+        sent["stop"] = time.perf_counter()
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    sender = threading.Thread(target=send)
+    sender.start()
+    try:
+        reminder.run()
+        stopped = time.perf_counter()
+    finally:
+        sender.join()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    assert sent["idle_wakeups"] == 0
+    assert reminder.notifications[0] - sent["show"] < 0.05
+    assert stopped - sent["stop"] < 0.1
+
+def test_profile_daemon_stops_without_polling():
+    """Test that the multi-profile daemon blocks until stop rather than sleeping in a loop."""
+    previous = {signum: signal.getsignal(signum) for signum in (signal.SIGUSR1, signal.SIGTERM)}
+    daemon = make_daemon([Profile("eyes"), Profile("water", 45)], SYSTEM_CLOCK)
+    sent = []
+
+    def stop():
+        time.sleep(0.2)
+        sent.append(time.perf_counter())
+        daemon.handle_control({"cmd": "stop"})
+
+    threading.Thread(target=stop).start()
+    try:
+        daemon.run()
+        stopped = time.perf_counter()
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+    assert stopped - sent[0] < 0.1
+    assert daemon._stopping.wakeups == 1